@@ -0,0 +1,61 @@
+from __future__ import annotations
+import base64
+import binascii
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(sort: str, keys: List[Any]) -> str:
+    """Opaque cursor holding the sort mode and the sort key of the last row served."""
+    raw = json.dumps({"s": sort, "k": keys}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        keys = data["k"]
+        if not isinstance(keys, list):
+            raise ValueError("cursor keys must be a list")
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if data.get("s") != sort:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor does not match the requested sort")
+    return keys
+
+
+def estimate_count(db: Session, stmt: Select) -> int:
+    """Planner's row estimate for `stmt` (EXPLAIN, nothing is executed); cheap at any table size."""
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return max(int(plan[0]["Plan"]["Plan Rows"]), 0)
+
+
+def table_estimate(db: Session, table: str) -> Optional[int]:
+    """pg_class.reltuples for an unfiltered listing; None when the table has never been analyzed."""
+    estimate = db.scalar(text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"), {"t": table})
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+def count_rows(db: Session, stmt: Select, mode: str, table: str) -> Tuple[Optional[int], bool]:
+    """(total, is_estimate) for a listing query; mode is exact, estimate or none."""
+    if mode == "none":
+        return None, False
+    if mode == "estimate":
+        try:
+            estimate = None if stmt.whereclause is not None else table_estimate(db, table)
+            return (estimate if estimate is not None else estimate_count(db, stmt)), True
+        except Exception as e:
+            logger.warning(f"Pagination: Row estimate failed, counting exactly: {e}")
+            db.rollback()
+    return db.scalar(select(func.count()).select_from(stmt.subquery())) or 0, False
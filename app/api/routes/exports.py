@@ -1,23 +1,34 @@
+from datetime import datetime
 from io import StringIO
+from typing import Iterator, Optional
 import csv
+import json
+import logging
 from fastapi import APIRouter, Depends, Query
-from fastapi.responses import PlainTextResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func, or_
-from app.api.deps import get_db, get_role, Role
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select, func, or_
+from app.api.deps import get_role, Role
 from app.api.schemas import ExportType
+from app.db.database import SessionLocal
 from app.db.models import Opportunity
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/exports", tags=["exports"])
 
-@router.get("/grants.csv", response_class=PlainTextResponse)
-def export_grants_csv(
-    type: ExportType = Query(..., description="all|viewed|approved|disapproved|llm_not_relevant|approved_no_email_or_no_url"),
-    db: Session = Depends(get_db),
-    role: Role = Depends(get_role),
-):
-   
-    stmt = select(Opportunity)
+# Rows fetched per round trip from the server-side cursor; memory stays flat regardless of table size.
+EXPORT_YIELD_PER = 1000
+
+EXPORT_COLUMNS = [
+    "id","title","url","source","scraped_at",
+    "is_relevant","grant_amount","deadline","tags",
+    "user_feedback","user_feedback_info","email"
+]
+
+
+def _export_query(type: ExportType, since: Optional[datetime], until: Optional[datetime]) -> Select:
+    # Only the exported columns: no ORM objects, no description/llm_info/minhash payloads.
+    stmt = select(*(getattr(Opportunity, c) for c in EXPORT_COLUMNS))
 
     if type == ExportType.viewed:
         stmt = stmt.where(Opportunity.is_viewed.is_(True))
@@ -46,19 +57,40 @@ def export_grants_csv(
                 )
         )
 
-    stmt = stmt.order_by(Opportunity.scraped_at.desc())
+    if since is not None:
+        stmt = stmt.where(Opportunity.scraped_at >= since)
+    if until is not None:
+        stmt = stmt.where(Opportunity.scraped_at < until)
+
+    return stmt.order_by(Opportunity.scraped_at.desc(), Opportunity.id.desc())
+
+
+def _stream_rows(stmt: Select) -> Iterator:
+    """
+    Rows from a server-side cursor (stream_results + yield_per). The session is opened here rather than
+    taken from get_db: request dependencies are closed before a streaming body is sent.
+    """
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_YIELD_PER))
+        yielded = 0
+        for row in result:
+            yielded += 1
+            yield row
+        logger.info(f"Export: Streamed {yielded} rows")
 
-    rows = db.execute(stmt).scalars().all()
 
+def _csv_lines(stmt: Select) -> Iterator[str]:
     buf = StringIO()
     writer = csv.writer(buf)
-    header = [
-        "id","title","url","source","scraped_at",
-        "is_relevant","grant_amount","deadline","tags",
-        "user_feedback","user_feedback_info","email"
-    ]
-    writer.writerow(header)
-    for o in rows:
+
+    def flush() -> str:
+        chunk = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return chunk
+
+    writer.writerow(EXPORT_COLUMNS)
+    for i, o in enumerate(_stream_rows(stmt), start=1):
         writer.writerow([
             o.id,
             o.title or "",
@@ -73,11 +105,43 @@ def export_grants_csv(
             (str(o.user_feedback_info) if o.user_feedback_info else ""),
             o.email or "",
         ])
+        if i % 100 == 0:
+            yield flush()
+    yield flush()
+
 
-    content = buf.getvalue()
+def _ndjson_lines(stmt: Select) -> Iterator[str]:
+    for o in _stream_rows(stmt):
+        record = dict(o._mapping)
+        record["scraped_at"] = o.scraped_at.isoformat() if o.scraped_at else None
+        yield json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+
+@router.get("/grants.csv")
+def export_grants_csv(
+    type: ExportType = Query(..., description="all|viewed|approved|disapproved|llm_not_relevant|approved_no_email_or_no_url"),
+    since: Optional[datetime] = Query(None, description="Only grants scraped at or after this time."),
+    until: Optional[datetime] = Query(None, description="Only grants scraped before this time."),
+    role: Role = Depends(get_role),
+):
     filename = f"grants_{type.value}.csv"
-    return PlainTextResponse(
-        content=content,
+    return StreamingResponse(
+        _csv_lines(_export_query(type, since, until)),
         media_type="text/csv; charset=utf-8",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
+
+
+@router.get("/grants.ndjson")
+def export_grants_ndjson(
+    type: ExportType = Query(..., description="all|viewed|approved|disapproved|llm_not_relevant|approved_no_email_or_no_url"),
+    since: Optional[datetime] = Query(None, description="Only grants scraped at or after this time."),
+    until: Optional[datetime] = Query(None, description="Only grants scraped before this time."),
+    role: Role = Depends(get_role),
+):
+    filename = f"grants_{type.value}.ndjson"
+    return StreamingResponse(
+        _ndjson_lines(_export_query(type, since, until)),
+        media_type="application/x-ndjson; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,11 +1,13 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import BigInteger, case, cast, or_, select, func , Text, Numeric
+from sqlalchemy import and_, or_, select, func, tuple_
 from app.api.deps import get_db, get_role, Role
+from app.api.pagination import count_rows, decode_cursor, encode_cursor
 from app.api.schemas import GrantDetail, ListResponse, FeedbackPayload, FeedbackDryRun
 from app.db.models import Opportunity
+from app.db.opportunity_stats import get_review_counts
 from app.feedback.save_feedback import save_feedback
 
 router = APIRouter(prefix="/api/grants", tags=["grants"])
@@ -20,6 +22,7 @@ def _to_detail(o: Opportunity) -> GrantDetail:
         grant_amount=o.grant_amount,
         tags=o.tags,
         deadline=o.deadline,
+        deadline_date=o.deadline_date.isoformat() if o.deadline_date else None,
         email=o.email,
         source=o.source,
         scraped_at=o.scraped_at.isoformat() if o.scraped_at else "",
@@ -37,9 +40,29 @@ def list_grants(
     relevance: Optional[str] = Query(None, pattern="^(relevant|not_relevant)$"),
     feedback: Optional[str] = Query(None, pattern="^(has_feedback|no_feedback)$"),
     source: Optional[str] = Query(None),
+    sort: Optional[str] = Query(
+        None, pattern="^(rank|newest|deadline)$",
+        description="rank (default when q is set): best full-text match first; newest: most recently scraped first; "
+                    "deadline: soonest parsed deadline first, unknown deadlines last."
+    ),
+    closing_within_days: Optional[int] = Query(
+        None, ge=0, le=366,
+        description="Only grants whose parsed deadline falls between today and today + this many days."
+    ),
     min_amount: Optional[int] = Query(
         None, ge=0,
-        description="Exclude only rows confidently <= this when a single numeric amount is present; keep ranges/unknown/ambiguous."
+        description="Exclude rows whose parsed award range is entirely <= this; keep rows with unknown amounts."
+    ),
+    max_amount: Optional[int] = Query(
+        None, ge=0,
+        description="Exclude rows whose parsed award range starts above this; keep rows with unknown amounts."
+    ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous response; keyset pagination, takes precedence over page."
+    ),
+    count: str = Query(
+        "estimate", pattern="^(exact|estimate|none)$",
+        description="Total to return: planner estimate (default), exact count(*), or none."
     ),
     page: int = Query(1, ge=1),
     per_page: int = Query(25, ge=1, le=100),
@@ -49,14 +72,17 @@ def list_grants(
     
     stmt = select(Opportunity)
 
+    # Full-text search over the GIN-indexed search_vector, plus trigram title matches (pg_trgm) for typos.
+    rank = None
+    q = (q or "").strip()
     if q:
-        like = f"%{q}%"
+        tsquery = func.websearch_to_tsquery('english', q)
+        title_fuzzy = Opportunity.title.op('%')(q)
         stmt = stmt.where(or_(
-            Opportunity.title.ilike(like),
-            Opportunity.url.ilike(like),
-            Opportunity.description.ilike(like),
-            Opportunity.source.ilike(like),
+            Opportunity.search_vector.op('@@')(tsquery),
+            title_fuzzy,
         ))
+        rank = func.ts_rank_cd(Opportunity.search_vector, tsquery, 32) + func.similarity(Opportunity.title, q)
 
     if reviewed == "reviewed":
         stmt = stmt.where(Opportunity.is_viewed.is_(True))
@@ -82,84 +108,89 @@ def list_grants(
 
     
     
-    # Filter by minimum amount if specified - based on concrete numeric values, does not apply to ranges, multiple numbers or unknowns.
+    # Amount filters use the parsed amount_min/amount_max columns (indexed). Rows with no parsed
+    # amount are kept; a row is only excluded when its known range lies entirely outside the filter.
     if min_amount is not None:
-        range_regex = r'\d\s*[-–]\s*\d'
-        multi_numbers_regex = r'(\d[\d,\.]*)\D+(\d[\d,\.]*)' 
+        stmt = stmt.where(or_(Opportunity.amount_max.is_(None), Opportunity.amount_max > min_amount))
+
+    if max_amount is not None:
+        stmt = stmt.where(or_(Opportunity.amount_min.is_(None), Opportunity.amount_min <= max_amount))
+
+    if closing_within_days is not None:
+        today = datetime.now(timezone.utc).date()
+        stmt = stmt.where(Opportunity.deadline_date.between(today, today + timedelta(days=closing_within_days)))
+
+    total, total_is_estimate = count_rows(db, stmt, count, Opportunity.__tablename__)
+
+    # Every ordering ends in id so rows are totally ordered and a cursor resumes exactly after the last row.
+    mode = sort or ("rank" if rank is not None else "newest")
+    if mode == "rank" and rank is None:
+        mode = "newest"
+
+    if mode == "rank":
+        stmt = stmt.add_columns(rank.label("rank")).order_by(rank.desc(), Opportunity.id.desc())
+    elif mode == "deadline":
+        stmt = stmt.order_by(Opportunity.deadline_date.asc().nulls_last(), Opportunity.id.desc())
+    else:
+        stmt = stmt.order_by(Opportunity.scraped_at.desc(), Opportunity.id.desc())
+
+    if cursor:
+        stmt = stmt.where(_after_cursor(mode, decode_cursor(cursor, mode), rank))
+    else:
+        stmt = stmt.offset((page - 1) * per_page)
+
+    rows = db.execute(stmt.limit(per_page + 1)).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor(mode, _cursor_keys(mode, rows[-1]))
+
+    return ListResponse(
+        items=[_to_detail(row[0]) for row in rows],
+        total=total,
+        total_is_estimate=total_is_estimate,
+        next_cursor=next_cursor,
+    )
 
-        gm = Opportunity.grant_amount
-        aw = cast(Opportunity.llm_info['award_amount'], Text)
 
-    
-        gm_multi = gm.op('~*')(multi_numbers_regex)
-        aw_multi = aw.op('~*')(multi_numbers_regex)
-
-       
-        gm_unknown = or_(
-            gm.is_(None),
-            func.length(func.trim(gm)) == 0,
-            func.lower(gm) == 'not available',
-            gm.op('~*')(range_regex),
-            gm_multi,
-        )
-        aw_unknown = or_(
-            aw.is_(None),
-            func.length(func.trim(aw)) == 0,
-            func.lower(aw) == 'not available',
-            aw.op('~*')(range_regex),
-            aw_multi,
-        )
-
-        gm_has_k = func.strpos(func.lower(gm), 'k') > 0
-        aw_has_k = func.strpos(func.lower(aw), 'k') > 0
-        
-        gm_digits = func.regexp_replace(func.lower(gm), '[^0-9]', '', 'g')
-        aw_digits = func.regexp_replace(func.lower(aw), '[^0-9]', '', 'g')
-
-
-        gm_value = case(
-            (gm.op('~*')(range_regex), None),
-            (gm.op('~*')(multi_numbers_regex), None),
-            (func.length(gm_digits) > 0,
-                case(
-                    (gm_has_k, cast(gm_digits, Numeric) * 1000),
-                    else_=cast(gm_digits, Numeric),
-                )
-            ),
-            else_=None,
-        )
-
-        aw_value = case(
-            (aw.op('~*')(range_regex), None),
-            (aw.op('~*')(multi_numbers_regex), None),
-            (func.length(aw_digits) > 0,
-                case(
-                    (aw_has_k, cast(aw_digits, Numeric) * 1000),
-                    else_=cast(aw_digits, Numeric),
-                )
-            ),
-            else_=None,
-        )
-
-        stmt = stmt.where(
-            or_(
-                gm_value > min_amount,
-                aw_value > min_amount,
-                gm_unknown,
-                aw_unknown,
-            )
-        )
-
-    
-    total = db.scalar(select(func.count()).select_from(stmt.subquery()))
+def _cursor_keys(mode: str, row) -> list:
+    o = row[0]
+    if mode == "rank":
+        return [float(row[1]), o.id]
+    if mode == "deadline":
+        return [o.deadline_date.isoformat() if o.deadline_date else None, o.id]
+    return [o.scraped_at.isoformat(), o.id]
 
-    stmt_paged = stmt.order_by(Opportunity.scraped_at.desc()) \
-                     .offset((page - 1) * per_page) \
-                     .limit(per_page)
 
-    rows = db.execute(stmt_paged).scalars().all()
+def _after_cursor(mode: str, keys: list, rank):
+    """Keyset predicate: rows strictly after the cursor's row in the listing order."""
+    try:
+        value, last_id = keys
+        last_id = int(last_id)
+        if mode == "rank":
+            return tuple_(rank, Opportunity.id) < tuple_(float(value), last_id)
+        if mode == "deadline":
+            if value is None:
+                return and_(Opportunity.deadline_date.is_(None), Opportunity.id < last_id)
+            value = date.fromisoformat(value)
+            return or_(
+                Opportunity.deadline_date > value,
+                and_(Opportunity.deadline_date == value, Opportunity.id < last_id),
+                Opportunity.deadline_date.is_(None),
+            )
+        return tuple_(Opportunity.scraped_at, Opportunity.id) < tuple_(datetime.fromisoformat(value), last_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
 
-    return ListResponse(items=[_to_detail(o) for o in rows], total=total or 0)
+@router.get("/counts")
+def review_counts(
+    live: bool = Query(False, description="Count the table now (one count(*) FILTER query) instead of reading the stats row."),
+    db: Session = Depends(get_db),
+    role: Role = Depends(get_role),
+):
+    return get_review_counts(db, live=live)
 
 @router.get("/{unique_key}", response_model=GrantDetail)
 def get_grant(
@@ -271,11 +302,8 @@ def count_unviewed(
     db: Session = Depends(get_db),
     role: Role = Depends(get_role),
 ):
-    total = db.scalar(select(func.count()).select_from(Opportunity)) or 0
-    unviewed = db.scalar(
-        select(func.count()).where(Opportunity.is_viewed.is_(False))
-    ) or 0
-    return {"unviewed": unviewed, "total": total}
+    counts = get_review_counts(db)
+    return {"unviewed": counts["unviewed"], "total": counts["total"]}
 
 
 @router.get("/counts/feedback")
@@ -283,9 +311,5 @@ def count_with_feedback(
     db: Session = Depends(get_db),
     role: Role = Depends(get_role),
 ):
-    total = db.scalar(select(func.count()).select_from(Opportunity)) or 0
-    with_feedback = db.scalar(
-        select(func.count()).where(Opportunity.user_feedback.is_(True))
-    ) or 0
-    return {"with_feedback": with_feedback, "total": total}
-
+    counts = get_review_counts(db)
+    return {"with_feedback": counts["with_feedback"], "total": counts["total"]}
@@ -13,6 +13,7 @@ class GrantDetail(BaseModel):
     grant_amount: Optional[str] = None
     tags: Optional[str] = None
     deadline: Optional[str] = None
+    deadline_date: Optional[str] = None
     email: Optional[str] = None
     source: str
     scraped_at: str
@@ -34,7 +35,9 @@ class FeedbackDryRun(BaseModel):
 
 class ListResponse(BaseModel):
     items: List[GrantDetail]
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
 
 class ExportType(str, Enum):
     all = "all"
@@ -1,7 +1,65 @@
 import hashlib
+import re
+import struct
 
 def compute_opportunity_hash(title: str, description: str, url: str) -> str:
     snippet = description.strip().lower()[:100]
     combined = (title + snippet + url).strip().lower()
     return hashlib.sha256(combined.encode('utf-8')).hexdigest()
 
+
+
+
+MINHASH_PERMUTATIONS = 64
+SHINGLE_SIZE = 3
+# Texts with fewer words than this are too short for a meaningful near-duplicate signature.
+MINHASH_MIN_TOKENS = 8
+
+_TOKEN = re.compile(r"[a-z0-9$]+")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _stable_int(label: str) -> int:
+    return int.from_bytes(hashlib.blake2b(label.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+# Fixed (a, b) pairs for the universal hashes (a * x + b) mod p; must never change once signatures are stored.
+_PERMUTATIONS = [
+    (_stable_int(f"minhash-a-{i}") % (_MERSENNE_PRIME - 1) + 1, _stable_int(f"minhash-b-{i}") % _MERSENNE_PRIME)
+    for i in range(MINHASH_PERMUTATIONS)
+]
+
+
+def _shingles(text: str) -> set[str]:
+    tokens = _TOKEN.findall((text or "").lower())
+    if len(tokens) < MINHASH_MIN_TOKENS:
+        return set()
+    return {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+
+def compute_minhash(title: str, description: str) -> bytes | None:
+    """
+    MinHash signature (64 x 32-bit, packed) over word 3-gram shingles of title + description.
+    The share of equal positions between two signatures estimates the Jaccard similarity of
+    their shingle sets, so the same grant reposted elsewhere scores high despite small edits.
+    """
+    shingles = _shingles(f"{title or ''} {description or ''}")
+    if not shingles:
+        return None
+
+    hashes = [_stable_int(shingle) for shingle in shingles]
+    signature = [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+    return struct.pack(f"<{MINHASH_PERMUTATIONS}I", *signature)
+
+
+def unpack_minhash(signature: bytes) -> tuple[int, ...]:
+    return struct.unpack(f"<{MINHASH_PERMUTATIONS}I", signature)
+
+
+def minhash_similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of the two signatures' shingle sets."""
+    return sum(x == y for x, y in zip(unpack_minhash(a), unpack_minhash(b))) / MINHASH_PERMUTATIONS
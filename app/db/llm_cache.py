@@ -0,0 +1,119 @@
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.database import SessionLocal
+from app.db.models import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in {"1", "true", "yes"}
+LLM_CACHE_RETENTION_DAYS = int(os.getenv("LLM_CACHE_RETENTION_DAYS", "90"))
+
+
+def prompt_fingerprint(model: str, prompt_version: str, prompt: str) -> str:
+    digest = hashlib.sha256()
+    for part in (model, prompt_version, prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent cache of parsed LLM results in the llm_cache table. Keys fingerprint the exact prompt,
+    so any change to the grant text, retrieved context, template or model is a miss. Hit/miss counters
+    cover the current run (reset_stats at the start of one).
+    """
+
+    def __init__(self, enabled: bool = LLM_CACHE_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        try:
+            with SessionLocal() as db:
+                row = db.execute(
+                    select(LLMCacheEntry.result, LLMCacheEntry.duration_ms).where(LLMCacheEntry.key == key)
+                ).one_or_none()
+                if row is not None:
+                    db.execute(
+                        update(LLMCacheEntry).where(LLMCacheEntry.key == key)
+                        .values(hits=LLMCacheEntry.hits + 1, last_hit_at=datetime.now(timezone.utc))
+                    )
+                    db.commit()
+        except Exception as e:
+            logger.warning(f"LLM Cache: Lookup failed, calling the model: {e}")
+            return None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_ms += row.duration_ms or 0
+        return dict(row.result)
+
+    def put(self, key: str, model: str, prompt_version: str, result: dict, stats: Optional[dict] = None):
+        if not self.enabled:
+            return
+        stats = stats or {}
+        try:
+            with SessionLocal() as db:
+                db.execute(
+                    pg_insert(LLMCacheEntry)
+                    .values(
+                        key=key,
+                        model=model,
+                        prompt_version=prompt_version,
+                        result=result,
+                        prompt_tokens=stats.get("prompt_tokens"),
+                        completion_tokens=stats.get("completion_tokens"),
+                        duration_ms=stats.get("duration_ms"),
+                    )
+                    .on_conflict_do_nothing(index_elements=[LLMCacheEntry.key])
+                )
+                db.commit()
+        except Exception as e:
+            logger.warning(f"LLM Cache: Store failed for {key[:12]}: {e}")
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.saved_ms = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "saved_s": round(self.saved_ms / 1000, 1),
+            }
+
+
+def prune_llm_cache(days: int = LLM_CACHE_RETENTION_DAYS) -> int:
+    """Delete entries not created or hit within `days`."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    with SessionLocal() as db:
+        deleted = db.execute(
+            delete(LLMCacheEntry).where(
+                LLMCacheEntry.created_at < cutoff,
+                (LLMCacheEntry.last_hit_at.is_(None)) | (LLMCacheEntry.last_hit_at < cutoff),
+            )
+        ).rowcount
+        db.commit()
+    logger.info(f"LLM Cache: Pruned {deleted} entries older than {days} days")
+    return deleted
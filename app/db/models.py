@@ -1,7 +1,16 @@
-from sqlalchemy import Column, DateTime, String, Text, Integer, Boolean, func
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import BigInteger, Column, Computed, Date, DateTime, Float, ForeignKey, Index, LargeBinary, String, Text, Integer, Boolean, func
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from app.db.database import Base
 
+# Weighted full-text document: title (A) > tags (B) > description (C) > source (D).
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(tags, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(source, '')), 'D')"
+)
+
 class Opportunity(Base):
     __tablename__ = "opportunities"
 
@@ -28,3 +37,54 @@ class Opportunity(Base):
     
     user_feedback = Column(Boolean, nullable=True)  
     user_feedback_info = Column(JSONB, nullable=True) 
+
+    # Near-duplicate detection: MinHash signature of title + description, and the earliest row of the same grant.
+    minhash = deferred(Column(LargeBinary, nullable=True))
+    canonical_id = Column(Integer, ForeignKey("opportunities.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    # Award range parsed from grant_amount / llm_info.award_amount at write time (app/utils/amounts.py).
+    amount_min = Column(BigInteger, nullable=True, index=True)
+    amount_max = Column(BigInteger, nullable=True, index=True)
+    amount_confidence = Column(Float, nullable=True)
+
+    # Deadline parsed from deadline / llm_info.deadline at write time (app/utils/deadlines.py).
+    deadline_date = Column(Date, nullable=True, index=True)
+
+    # Generated by Postgres; deferred so listing rows does not pull the whole vector over the wire.
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
+    __table_args__ = (
+        Index("ix_opportunities_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination of the default listing order (scraped_at DESC, id DESC).
+        Index("ix_opportunities_scraped_at_id", "scraped_at", "id"),
+    )
+
+
+class OpportunityStats(Base):
+    """Single row (id=1) of review counters, kept current by statement-level triggers on opportunities."""
+    __tablename__ = "opportunity_stats"
+
+    id = Column(Integer, primary_key=True)
+    total = Column(BigInteger, nullable=False, default=0)
+    unviewed = Column(BigInteger, nullable=False, default=0)
+    with_feedback = Column(BigInteger, nullable=False, default=0)
+    relevant = Column(BigInteger, nullable=False, default=0)
+    not_relevant = Column(BigInteger, nullable=False, default=0)
+    unscored = Column(BigInteger, nullable=False, default=0)
+    relevant_unviewed = Column(BigInteger, nullable=False, default=0)
+
+
+class LLMCacheEntry(Base):
+    """Parsed LLM analysis keyed by sha256(model, prompt config version, final prompt)."""
+    __tablename__ = "llm_cache"
+
+    key = Column(String(64), primary_key=True)
+    model = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    result = Column(JSONB, nullable=False)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
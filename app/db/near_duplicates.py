@@ -0,0 +1,104 @@
+from __future__ import annotations
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.deduplication import MINHASH_PERMUTATIONS, minhash_similarity, unpack_minhash
+from app.db.models import Opportunity
+
+logger = logging.getLogger(__name__)
+
+# Estimated Jaccard similarity (of title + description shingles) at which two rows are the same grant.
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.6"))
+# LSH banding: 16 bands x 4 rows puts the candidate S-curve's midpoint near Jaccard 0.5,
+# just under the threshold, so true matches are almost always looked at.
+NEAR_DUP_BANDS = 16
+
+_index: Optional["NearDuplicateIndex"] = None
+_index_lock = threading.Lock()
+
+
+class NearDuplicateIndex:
+    """
+    In-memory MinHash LSH index over stored opportunities. Rows sharing any band are candidates;
+    candidates at or above the similarity threshold are near-duplicates. Each row maps to its
+    canonical row (the earliest one of its group).
+    """
+
+    def __init__(self, threshold: float = NEAR_DUP_THRESHOLD, bands: int = NEAR_DUP_BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self._rows = MINHASH_PERMUTATIONS // bands
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[int, bytes] = {}
+        self._canonical: Dict[int, int] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, signature: bytes):
+        values = unpack_minhash(signature)
+        for band in range(self.bands):
+            yield band, values[band * self._rows:(band + 1) * self._rows]
+
+    def add(self, row_id: int, signature: bytes, canonical_id: Optional[int] = None):
+        self._signatures[row_id] = signature
+        self._canonical[row_id] = canonical_id or row_id
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(row_id)
+
+    def find_canonical(self, signature: bytes, exclude: Optional[int] = None) -> Optional[Tuple[int, float]]:
+        """(canonical_id, similarity) of the most similar stored near-duplicate, or None."""
+        best: Optional[Tuple[int, float]] = None
+        seen = set()
+        for band, key in self._band_keys(signature):
+            for row_id in self._buckets[band].get(key, ()):
+                if row_id in seen or row_id == exclude:
+                    continue
+                seen.add(row_id)
+                similarity = minhash_similarity(signature, self._signatures[row_id])
+                if similarity >= self.threshold:
+                    canonical = self._canonical[row_id]
+                    if best is None or (similarity, -canonical) > (best[1], -best[0]):
+                        best = (canonical, similarity)
+        return best
+
+    def link(self, row_id: int, signature: bytes) -> Optional[int]:
+        """Add a new row and return the canonical id it should point to (None if it is canonical itself)."""
+        match = self.find_canonical(signature, exclude=row_id)
+        canonical = match[0] if match else None
+        self.add(row_id, signature, canonical)
+        return canonical
+
+
+def load_near_duplicate_index(db: Session) -> NearDuplicateIndex:
+    index = NearDuplicateIndex()
+    rows = db.execute(
+        select(Opportunity.id, Opportunity.minhash, Opportunity.canonical_id)
+        .where(Opportunity.minhash.isnot(None))
+        .order_by(Opportunity.id)
+    ).all()
+    for row_id, signature, canonical_id in rows:
+        index.add(row_id, bytes(signature), canonical_id)
+    logger.info(f"NearDup: Loaded {len(index)} signatures (threshold {index.threshold}, {index.bands} bands)")
+    return index
+
+
+def get_near_duplicate_index(db: Session) -> NearDuplicateIndex:
+    """Process-wide index, loaded from the database on first use and kept current by ingest."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = load_near_duplicate_index(db)
+        return _index
+
+
+def reset_near_duplicate_index():
+    global _index
+    with _index_lock:
+        _index = None
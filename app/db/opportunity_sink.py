@@ -0,0 +1,81 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from app.db.database import SessionLocal
+from app.db.save_opportunities import bulk_ingest_opportunities
+
+logger = logging.getLogger(__name__)
+
+# A micro-batch is flushed when it reaches this many items or has been open this long,
+# whichever comes first (slow scrapers such as OCR-heavy feeds hit the time limit).
+SINK_BATCH_SIZE = int(os.getenv("SCRAPER_FLUSH_BATCH_SIZE", "25"))
+SINK_FLUSH_SECONDS = float(os.getenv("SCRAPER_FLUSH_SECONDS", "30"))
+BACKUP_DIR = "backups"
+
+
+class OpportunitySink:
+    """
+    Persistence stage for streamed scraper output: buffers opportunities and flushes each
+    micro-batch to the backup file (JSON Lines) and then to Postgres while scraping continues.
+    Only the current batch is held in memory.
+    """
+
+    def __init__(self, site_name: str, source: str, batch_size: int = SINK_BATCH_SIZE,
+                 flush_seconds: float = SINK_FLUSH_SECONDS):
+        self.site_name = site_name
+        self.source = source
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.scraped = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.batches = 0
+        self._buffer: list[dict] = []
+        self._opened_at: Optional[float] = None
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        self.backup_path = os.path.join(BACKUP_DIR, f"{site_name}_{timestamp}.jsonl")
+
+    def add(self, opportunity: dict):
+        if self._opened_at is None:
+            self._opened_at = time.monotonic()
+        self._buffer.append(opportunity)
+        self.scraped += 1
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._opened_at >= self.flush_seconds:
+            self.flush()
+
+    def consume(self, opportunities: Iterable[dict]):
+        for opportunity in opportunities:
+            self.add(opportunity)
+
+    def flush(self):
+        batch, self._buffer, self._opened_at = self._buffer, [], None
+        if not batch:
+            return
+        self._write_backup(batch)
+        with SessionLocal() as db:
+            result = bulk_ingest_opportunities(batch, db, source=self.source)
+        self.inserted += result.inserted
+        self.duplicates += result.duplicates
+        self.batches += 1
+        logger.info(f"Sink: '{self.site_name}' batch {self.batches}: {result.inserted} new, {result.duplicates} duplicates ({self.scraped} scraped so far)")
+
+    def close(self):
+        """Flush whatever is still buffered; called even when the scraper failed part-way."""
+        self.flush()
+
+    def stats(self) -> dict:
+        return {"scraped": self.scraped, "saved": self.inserted, "duplicates": self.duplicates, "batches": self.batches}
+
+    def _write_backup(self, batch: list[dict]):
+        try:
+            os.makedirs(BACKUP_DIR, exist_ok=True)
+            with open(self.backup_path, "a", encoding="utf-8") as f:
+                for opportunity in batch:
+                    f.write(json.dumps(opportunity, ensure_ascii=False, default=str) + "\n")
+        except Exception as e:
+            logger.error(f"Sink: Failed to write backup for {self.site_name}: {e}")
@@ -0,0 +1,64 @@
+from __future__ import annotations
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Opportunity, OpportunityStats
+
+logger = logging.getLogger(__name__)
+
+STATS_ROW_ID = 1
+
+# Review counters. The opportunity_stats triggers (migration 0b7d2f6e8a41) use the same predicates.
+REVIEW_COUNTERS = {
+    "total": None,
+    "unviewed": Opportunity.is_viewed.is_(False),
+    "with_feedback": Opportunity.user_feedback.is_(True),
+    "relevant": Opportunity.is_relevant.is_(True),
+    "not_relevant": Opportunity.is_relevant.is_(False),
+    "unscored": Opportunity.is_relevant.is_(None),
+    "relevant_unviewed": and_(Opportunity.is_relevant.is_(True), Opportunity.is_viewed.is_(False)),
+}
+
+
+def live_counts(db: Session) -> Dict[str, int]:
+    """All review counters in one scan: count(*) FILTER (WHERE ...) per counter."""
+    columns = [
+        (func.count() if predicate is None else func.count().filter(predicate)).label(name)
+        for name, predicate in REVIEW_COUNTERS.items()
+    ]
+    row = db.execute(select(*columns).select_from(Opportunity)).one()
+    return {name: int(row._mapping[name] or 0) for name in REVIEW_COUNTERS}
+
+
+def stored_counts(db: Session) -> Optional[Dict[str, int]]:
+    """Counters from the trigger-maintained stats row (primary key lookup); None if the row is missing."""
+    stats = db.get(OpportunityStats, STATS_ROW_ID)
+    if stats is None:
+        return None
+    return {name: int(getattr(stats, name) or 0) for name in REVIEW_COUNTERS}
+
+
+def refresh_stats(db: Session) -> Dict[str, int]:
+    """Recompute the stats row from the table, e.g. after a TRUNCATE or a restore (triggers don't see those)."""
+    counts = live_counts(db)
+    stats = db.get(OpportunityStats, STATS_ROW_ID, with_for_update=True)
+    if stats is None:
+        stats = OpportunityStats(id=STATS_ROW_ID)
+        db.add(stats)
+    for name, value in counts.items():
+        setattr(stats, name, value)
+    db.commit()
+    logger.info(f"Stats: Refreshed review counters {counts}")
+    return counts
+
+
+def get_review_counts(db: Session, live: bool = False) -> Dict[str, int]:
+    if not live:
+        counts = stored_counts(db)
+        if counts is not None:
+            return counts
+        logger.warning("Stats: opportunity_stats row missing, counting live")
+    return live_counts(db)
@@ -1,45 +1,132 @@
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.db.models import Opportunity
-from app.db.deduplication import compute_opportunity_hash
+from app.db.deduplication import compute_opportunity_hash, compute_minhash
+from app.db.near_duplicates import NearDuplicateIndex, get_near_duplicate_index
+from app.utils.amounts import amount_columns
+from app.utils.deadlines import deadline_columns
 import logging
 
 logger = logging.getLogger(__name__)
 
-def save_opportunities(opportunities: list[dict], db: Session, source: str) -> int:
-    new_count = 0
+# Rows per INSERT statement; keeps each statement well under PostgreSQL's 65535 bind parameter limit.
+INGEST_BATCH_SIZE = 500
+
+
+@dataclass
+class IngestResult:
+    inserted: int = 0
+    duplicates: int = 0
+    # Inserted rows linked to an existing canonical row of the same grant (near-duplicates).
+    near_duplicates: int = 0
+    inserted_keys: list[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.duplicates
+
+
+def build_opportunity_row(opp: dict, source: str, scraped_at: datetime) -> dict:
+    title = opp.get("title", "").strip()
+    url = opp.get("url", "").strip()
+    description = opp.get("description", "")
+    normalized_description = description.strip().lower()[:100]
+
+    row = {
+        "unique_key": compute_opportunity_hash(title, normalized_description, url),
+        "title": title or "Not Available",
+        "url": url or "Not Available",
+        "description": description or "Not Available",
+        "grant_amount": opp.get("grant_amount") or "Not Available",
+        "tags": opp.get("tags") or "Not Available",
+        "deadline": opp.get("deadline") or "Not Available",
+        "email": opp.get("email") or "Not Available",
+        "source": source,
+        "scraped_at": scraped_at,
+        "is_relevant": None,
+        "is_viewed": False,
+        "minhash": compute_minhash(title, description),
+    }
+    row.update(amount_columns(opp.get("grant_amount")))
+    row.update(deadline_columns(opp.get("deadline")))
+    return row
+
 
+def bulk_ingest_opportunities(opportunities: list[dict], db: Session, source: str,
+                              batch_size: int = INGEST_BATCH_SIZE) -> IngestResult:
+    """
+    Insert a whole batch with INSERT ... ON CONFLICT (unique_key) DO NOTHING RETURNING id, unique_key,
+    committed once. Rows that come back were inserted; everything else (already stored, or repeated
+    within the batch) is counted as a duplicate. Inserted rows are then linked to the canonical row
+    of any near-duplicate (same grant from another page or source) through canonical_id.
+    """
+    result = IngestResult()
+    scraped_at = datetime.now(timezone.utc)
+
+    rows = {}
     for opp in opportunities:
-        title = opp.get("title", "").strip()
-        url = opp.get("url", "").strip()
-        description = opp.get("description", "")
-        normalized_description = description.strip().lower()[:100]
-
-        unique_key = compute_opportunity_hash(title, normalized_description, url)
-
-        record = Opportunity(
-            unique_key=unique_key,
-            title=title or "Not Available",
-            url=url or "Not Available",
-            description=description or "Not Available",
-            grant_amount=opp.get("grant_amount") or "Not Available",
-            tags=opp.get("tags") or "Not Available",
-            deadline=opp.get("deadline") or "Not Available",
-            email=opp.get("email") or "Not Available",
-            source=source,
-            scraped_at=datetime.now(timezone.utc),
-            is_relevant=None,
-            is_viewed=False
-        )
-
-        try:
-            db.add(record)
-            db.commit()
-            new_count += 1
-        except IntegrityError as e:
-            db.rollback()
-            logger.info(f"Skipped duplicate: '{title}' from '{source}' due to integrity error.")
+        row = build_opportunity_row(opp, source, scraped_at)
+        if row["unique_key"] in rows:
+            result.duplicates += 1
             continue
+        rows[row["unique_key"]] = row
+
+    pending = list(rows.values())
+    index = get_near_duplicate_index(db) if pending else None
+    # Rows of this transaction are matched against the shared index plus each other, and only added to
+    # the shared index after commit: a concurrent flush must never link to a row that may still roll back
+    # (its canonical_id update would fail the foreign key). Two flushes inserting the same grant at the
+    # same moment therefore both stay canonical.
+    batch_index = NearDuplicateIndex(index.threshold, index.bands) if index is not None else None
+    new_rows = []
+    try:
+        links = []
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            stmt = (
+                pg_insert(Opportunity)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[Opportunity.unique_key])
+                .returning(Opportunity.id, Opportunity.unique_key)
+            )
+            inserted = db.execute(stmt).all()
+            result.inserted_keys.extend(key for _, key in inserted)
+            result.inserted += len(inserted)
+            result.duplicates += len(chunk) - len(inserted)
+
+            for row_id, key in sorted(inserted):
+                signature = rows[key]["minhash"]
+                if signature is None:
+                    continue
+                with index.lock:
+                    stored = index.find_canonical(signature)
+                earlier = batch_index.find_canonical(signature)
+                matches = [m for m in (stored, earlier) if m is not None]
+                canonical_id = max(matches, key=lambda m: (m[1], -m[0]))[0] if matches else None
+                batch_index.add(row_id, signature, canonical_id)
+                new_rows.append((row_id, signature, canonical_id))
+                if canonical_id is not None:
+                    links.append({"id": row_id, "canonical_id": canonical_id})
+
+        if links:
+            db.execute(update(Opportunity), links)
+            result.near_duplicates = len(links)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
 
-    return new_count
+    if new_rows:
+        with index.lock:
+            for row_id, signature, canonical_id in new_rows:
+                index.add(row_id, signature, canonical_id)
+
+    logger.info(f"Ingest: {result.inserted} inserted ({result.near_duplicates} near-duplicates), {result.duplicates} duplicates from '{source}'")
+    return result
+
+
+def save_opportunities(opportunities: list[dict], db: Session, source: str) -> int:
+    return bulk_ingest_opportunities(opportunities, db, source).inserted
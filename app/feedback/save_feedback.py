@@ -4,6 +4,8 @@ from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.db.models import Opportunity
+from app.utils.amounts import amount_columns
+from app.utils.deadlines import deadline_columns
 import logging
 
 logger = logging.getLogger(__name__)
@@ -121,6 +123,15 @@ def save_feedback(
         if explicit_relevance is not None:
             o.is_relevant = explicit_relevance
 
+        if "grant_amount" in corr:
+            # A reviewer's amount outranks the scraped and LLM values.
+            for col, val in amount_columns(o.grant_amount).items():
+                setattr(o, col, val)
+
+        if "deadline" in corr:
+            for col, val in deadline_columns(o.deadline).items():
+                setattr(o, col, val)
+
         db.commit()      
         db.refresh(o)    
         return o
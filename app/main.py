@@ -3,15 +3,19 @@ import time
 import os
 import yaml
 import logging
-import threading
 import importlib
-from datetime import datetime, timezone
-import json
 
-from app.utils.driver_pool import check_driver_pool_integrity, init_driver_pool, get_driver_pool
-from app.db import init_db, SessionLocal
-from app.db.save_opportunities import save_opportunities
+from app.utils.driver_pool import check_driver_pool_integrity, init_driver_pool, get_driver_pool, close_driver_pool
+from app.db import init_db
+from app.db.opportunity_sink import OpportunitySink
+from app.scrapers.base_scraper import NeedsBrowser
 from app.utils.driver_pool import borrow_driver
+from app.utils.browser_profiles import resolve_browser_profile
+from app.utils.http_fetcher import render_mode
+from app.utils.site_scheduler import SiteScheduler
+from app.utils.page_cache import get_page_cache
+from app.utils.high_water_mark import HighWaterMark
+from app.utils.known_urls import get_known_urls
 from app.utils.rag.keyword_matcher import validate_synonyms
 from app.utils.rag.config import load_system_prompt
 from app.utils.rag.config import get_keywords
@@ -23,10 +27,15 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
-MAX_THREADS = 6
+# Ceiling only: actual concurrency follows the driver pool, which is sized from the grid's capacity.
+MAX_THREADS = int(os.getenv("SCRAPER_MAX_THREADS", "6"))
 
 
-def run_all_scrapers(config_path: str | None = None) -> dict:
+def run_all_scrapers(config_path: str | None = None, full: bool = False) -> dict:
+    """
+    Scrape every configured site. `full=True` (or SCRAPER_FULL_RECRAWL=1, or `full: true`
+    on a site) ignores incremental state (page cache, high-water marks) and recrawls everything.
+    """
     setup_logging()
     logger = logging.getLogger(__name__)
     try:
@@ -35,10 +44,9 @@ def run_all_scrapers(config_path: str | None = None) -> dict:
         logger.error("Startup checks failed: %s", e, exc_info=True)
         raise
 
-    time.sleep(10)
-
     init_db()
-    init_driver_pool()
+    # Sessions open in parallel in the background; the first scraper starts as soon as one is ready.
+    init_driver_pool(warm_in_background=True)
 
     try:
         if config_path:
@@ -48,13 +56,17 @@ def run_all_scrapers(config_path: str | None = None) -> dict:
             config_data = load_config()
 
         config_map = build_config_map(config_data)
-        scrape_and_store_all_sites_concurrently(config_map)
+        if full or os.getenv("SCRAPER_FULL_RECRAWL", "false").lower() in {"1", "true", "yes"}:
+            logger.info("Runner: Full recrawl requested; ignoring incremental state.")
+            for site_config in config_map.values():
+                site_config["full"] = True
+        site_results = scrape_and_store_all_sites_concurrently(config_map)
 
-        return {"status": "ok", "sites": len(config_map)}
+        return {"status": "ok", "sites": len(config_map), "site_results": site_results}
     finally:
         try:
             check_driver_pool_integrity(get_driver_pool())
-            get_driver_pool().close()
+            close_driver_pool()
         except Exception:
             logger.warning("Driver pool close encountered an issue.", exc_info=True)
         logger.info("Runner: Scraping job complete, all resources shut down.")
@@ -85,18 +97,10 @@ def load_config():
         return yaml.safe_load(f)
 
 def build_config_map(configs):
-    return {site["name"]: site for site in configs["sites"]}
-
-def write_backup(site_name: str, data: list[dict]):
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    os.makedirs("backups", exist_ok=True)
-    filename = f"backups/{site_name}_{timestamp}.json"
-    try:
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        logger.info(f"Runner: Backup written: {filename}")
-    except Exception as e:
-        logger.error(f"Runner: Failed to write backup for {site_name}: {e}")
+    config_map = {site["name"]: site for site in configs["sites"]}
+    for site in config_map.values():
+        site["browser_profile"] = resolve_browser_profile(site, configs.get("browser_profiles"))
+    return config_map
 
 def get_scraper_instance(class_name: str, config: dict):
     try:
@@ -112,47 +116,99 @@ def get_scraper_instance(class_name: str, config: dict):
             logger.error(f"Runner: GenericScraper fallback also failed: {ge}")
             return None
 
-def scrape_site(site_name: str, site_config: dict):
+def scrape_site(site_name: str, site_config: dict, deadline: float | None = None) -> dict:
     logger.info(f"Runner: Thread started for site: {site_name}")
+    mode = render_mode(site_config)
     for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            with borrow_driver() as driver:
-                class_name = site_config.get("scraper_class", "GenericOpportunityScraper")
-                scraper = get_scraper_instance(class_name, site_config)
-            
-                
-                opportunities = scraper.scrape(driver)
-                logger.info(f"Runner: Scraped {len(opportunities)} opportunities from '{site_name}'")
-                
-                with SessionLocal() as db:
-                    saved = save_opportunities(opportunities, db, source=site_config["url"])
-                    logger.info(f"Runner: Saved {saved} new unique entries from '{site_name}'")
-
-                write_backup(site_name, opportunities)
+        if attempt > 1 and deadline is not None and time.monotonic() >= deadline:
+            logger.error(f"Runner: Time budget exhausted for '{site_name}'; not retrying")
             break
+        try:
+            class_name = site_config.get("scraper_class", "GenericOpportunityScraper")
+            scraper = get_scraper_instance(class_name, site_config)
+            scraper.deadline = deadline
+            page_cache = get_page_cache(site_name, site_config)
+            scraper.page_cache = page_cache
+            high_water = HighWaterMark(site_name, full=bool(site_config.get("full")))
+            scraper.high_water = high_water
+            known_urls = get_known_urls(site_name, site_config)
+            scraper.known_urls = known_urls
+
+            sink = OpportunitySink(site_name, source=site_config["url"])
+            try:
+                use_browser = mode == "browser"
+                if not use_browser:
+                    try:
+                        sink.consume(scraper.iter_scrape_static())
+                    except NeedsBrowser:
+                        if mode == "static":
+                            # Nothing was crawled: report the failure and leave high-water/page-cache/known-URL state as is.
+                            logger.error(f"Runner: Static fetch failed for '{site_name}' (render: static, no browser fallback)")
+                            return {"ok": False, "attempts": attempt}
+                        else:
+                            logger.info(f"Runner: '{site_name}' needs a browser; falling back to the driver pool")
+                            use_browser = True
+
+                if use_browser:
+                    with borrow_driver(profile=site_config.get("browser_profile")) as driver:
+                        sink.consume(scraper.iter_scrape(driver))
+            finally:
+                # Persist the tail of the stream even when the scraper failed part-way.
+                sink.close()
+
+            logger.info(f"Runner: Scraped {sink.scraped} opportunities from '{site_name}'")
+            logger.info(f"Runner: Saved {sink.inserted} new unique entries from '{site_name}' ({sink.duplicates} duplicates, {sink.batches} batches)")
+
+            result = {"ok": True, **sink.stats(), "attempts": attempt, "waits": scraper.waits.summary()}
+            if scraper.waits.calls:
+                waits = result["waits"]
+                logger.info(f"Runner: '{site_name}' spent {waits['waited']}s in {waits['calls']} waits (fixed sleeps: {waits['baseline']}s, saved {waits['saved']}s)")
+            high_water.commit()
+            if known_urls is not None:
+                known_urls.commit()
+                result["known_url_skips"] = known_urls.skipped
+                logger.info(f"Runner: Skipped {known_urls.skipped} already-ingested detail pages for '{site_name}'")
+            if page_cache is not None:
+                # Only remember fingerprints once the pages' results are safely stored.
+                page_cache.commit()
+                result["page_cache"] = page_cache.stats()
+                logger.info(f"Runner: Page cache for '{site_name}': {page_cache.hits} hits, {page_cache.misses} misses")
+            return result
         except Exception as e:
             logger.warning(f"Runner: Attempt {attempt}/{MAX_RETRIES} failed for '{site_name}': {e}")
             if attempt == MAX_RETRIES:
                 logger.error(f"Runner: All retries failed for '{site_name}'", exc_info=True)
             else:
                 time.sleep(min(3, attempt))
+
+    return {"ok": False, "attempts": attempt}
         
 
-def scrape_and_store_all_sites_concurrently(config_map: dict):
-    threads = []
-    semaphore = threading.Semaphore(MAX_THREADS)
+def scrape_and_store_all_sites_concurrently(config_map: dict) -> dict:
+    pool = get_driver_pool()
+    concurrency = max(1, min(MAX_THREADS, pool.max_drivers))
+
+    def on_dispatch(site_name: str, site_config: dict, remaining: int):
+        # Top up idle sessions ahead of the sites about to borrow one.
+        if render_mode(site_config) == "browser":
+            pool.prewarm(min(remaining, scheduler.max_workers), profile=site_config.get("browser_profile"))
 
-    def thread_wrapper(site_name, site_config):
-        with semaphore:
-            scrape_site(site_name, site_config)
+    scheduler = SiteScheduler(config_map, run_site=scrape_site, max_workers=concurrency, on_dispatch=on_dispatch)
 
-    for site_name, site_config in config_map.items():
-        t = threading.Thread(target=thread_wrapper, args=(site_name, site_config), daemon=True)
-        threads.append(t)
-        t.start()
+    def on_capacity_change(capacity: int):
+        # Nodes joined mid-run: let more sites start. Shrinking is enforced by the pool itself.
+        target = max(1, min(MAX_THREADS, capacity))
+        if target > scheduler.max_workers:
+            logger.info(f"Runner: Scraper concurrency raised {scheduler.max_workers} -> {target}")
+            scheduler.add_workers(target)
 
-    for t in threads:
-        t.join()
+    if pool.capacity_monitor is not None:
+        pool.capacity_monitor.add_listener(on_capacity_change)
+    try:
+        return scheduler.run()
+    finally:
+        if pool.capacity_monitor is not None:
+            pool.capacity_monitor.remove_listener(on_capacity_change)
 
 if __name__ == "__main__":
     try:
@@ -161,9 +217,8 @@ if __name__ == "__main__":
         logger.error("Startup checks failed: %s", e, exc_info=True)
         raise
     
-    time.sleep(10)
     init_db()
-    init_driver_pool()
+    init_driver_pool(warm_in_background=True)
 
     config_data = load_config()
     config_map = build_config_map(config_data)
@@ -171,5 +226,5 @@ if __name__ == "__main__":
     scrape_and_store_all_sites_concurrently(config_map)
 
     check_driver_pool_integrity(get_driver_pool())
-    get_driver_pool().close()
+    close_driver_pool()
     logger.info("Runner: Scraping job complete, all resources shut down.")
@@ -1,9 +1,88 @@
+import logging
+import time
 from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+
+from app.utils.dom_snapshot import page_snapshot, parse_mode
+from app.utils.waits import WaitStats
+
+logger = logging.getLogger(__name__)
+
+
+class NeedsBrowser(Exception):
+    """Raised by iter_scrape_static() when the page can only be scraped with a real browser."""
+
 
 class BaseScraper(ABC):
     def __init__(self, config):
         self.config = config
+        # Monotonic deadline set by the site scheduler; scrapers stop early and return partial results past it.
+        self.deadline: Optional[float] = None
+        # Set by the runner; lets scrapers skip pages whose content has not changed since the last run.
+        self.page_cache = None
+        # Set by the runner; newest-first feeds stop once they reach the last ingested post.
+        self.high_water = None
+        # Set by the runner; URLs this source already produced, checked before opening detail pages.
+        self.known_urls = None
+        # Time spent in condition-based waits (app/utils/waits.py) vs. the fixed sleeps they replaced.
+        self.waits = WaitStats(type(self).__name__)
 
     @abstractmethod
     def scrape(self, driver):
         pass
+
+    def scrape_static(self):
+        """
+        Scrape over plain HTTP (render: static|auto in sites_config.yml).
+        Return None when the page needs a real browser; the runner then falls back to scrape(driver).
+        """
+        return None
+
+    # Streaming protocol: the runner consumes these generators and persists micro-batches as
+    # items arrive. Scrapers that stream override them; list-returning scrapers are adapted here.
+
+    def iter_scrape(self, driver) -> Iterator[dict]:
+        yield from self.scrape(driver) or []
+
+    def iter_scrape_static(self) -> Iterator[dict]:
+        opportunities = self.scrape_static()
+        if opportunities is None:
+            raise NeedsBrowser(type(self).__name__)
+        yield from opportunities
+
+    @property
+    def snapshot_mode(self) -> bool:
+        """True when pages should be parsed from one page_source snapshot (`parse: snapshot`, the default)."""
+        return parse_mode(self.config) == "snapshot"
+
+    def snapshot(self, driver):
+        return page_snapshot(driver)
+
+    def out_of_time(self) -> bool:
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            logger.warning(f"{type(self).__name__}: Time budget exhausted for '{self.config.get('name')}'; returning partial results.")
+            return True
+        return False
+
+    def unchanged_since_last_run(self, key: str, content: str) -> bool:
+        return self.page_cache is not None and self.page_cache.is_unchanged(key, content)
+
+    def remember_content(self, key: str, content: Optional[str] = None):
+        """Record `content` (and validators fetched for `key`) as handled, after its opportunities have been collected."""
+        if self.page_cache is not None:
+            self.page_cache.mark_seen(key, content)
+
+    def already_ingested(self, url: str) -> bool:
+        return self.known_urls is not None and self.known_urls.seen(url)
+
+    def remember_detail(self, url: str):
+        """Record a detail page whose result may be stored under another URL (apply link, image link)."""
+        if self.known_urls is not None:
+            self.known_urls.add(url)
+
+    def selector_text(self, driver, selector: str) -> str:
+        """Visible text of every element matching `selector`, in one WebDriver round trip."""
+        return driver.execute_script(
+            "return Array.from(document.querySelectorAll(arguments[0])).map(e => e.innerText).join('\\n');",
+            selector,
+        ) or ""
@@ -1,11 +1,13 @@
 import logging
-import time
+from urllib.parse import urljoin
 from app.scrapers.base_scraper import BaseScraper
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from app.utils.extractors import extract_amount, extract_emails
+from app.utils.dom_snapshot import select_text
+from app.utils.waits import wait_for_content_change, wait_for_count_stable, wait_for_dom_quiescence, wait_for_network_idle
 
 logger = logging.getLogger(__name__)
 
@@ -40,9 +42,8 @@ class CreativeCapitalScraper(BaseScraper):
                     if "show" not in section.get_attribute("class"):
                         toggle_btn = driver.find_element(By.CSS_SELECTOR, f"[data-bs-target='{acc_id}']")
                         driver.execute_script("arguments[0].scrollIntoView(true);", toggle_btn)
-                        time.sleep(0.3)
                         driver.execute_script("arguments[0].click();", toggle_btn)
-                        time.sleep(0.5)
+                        wait_for_dom_quiescence(driver, quiet=0.2, timeout=2, stats=self.waits, baseline=0.8)
                         logger.info(f"CreativeCapital: Expanded accordion: {acc_id}")
                 except Exception as e:
                     logger.warning(f"CreativeCapital: Failed to expand accordion '{acc_id}': {e}")
@@ -56,7 +57,6 @@ class CreativeCapitalScraper(BaseScraper):
 
                 if not checkbox.is_displayed():
                     driver.execute_script("arguments[0].scrollIntoView(true);", checkbox)
-                    time.sleep(0.5)
 
                 if not checkbox.is_selected():
                     driver.execute_script("arguments[0].click();", checkbox)
@@ -68,15 +68,40 @@ class CreativeCapitalScraper(BaseScraper):
 
 
         logger.info("CreativeCapital: Filters applied, waiting for page to load...")
-        time.sleep(2)
+        wait_for_network_idle(driver, idle=0.5, timeout=10, stats=self.waits, baseline=2.0)
+        wait_for_count_stable(driver, config["opportunity_selector"], stable_for=0.3, timeout=5, stats=self.waits)
 
         logger.info("CreativeCapital: Starting to scrape opportunities")
-        while True:
+        page_no = 1
+        while not self.out_of_time():
             WebDriverWait(driver, 10).until(
                 EC.presence_of_all_elements_located((By.CSS_SELECTOR, config["opportunity_selector"]))
             )
-            items = driver.find_elements(By.CSS_SELECTOR, config["opportunity_selector"])
-            logger.info(f"CreativeCapital: Found {len(items)} opportunities on current page")
+            if self.snapshot_mode:
+                cards = self.snapshot(driver).select(config["opportunity_selector"])
+                logger.info(f"CreativeCapital: Found {len(cards)} opportunities on current page (snapshot)")
+                page_text = "\n".join(card.get_text("\n", strip=True) for card in cards)
+                page_changed = not self.unchanged_since_last_run(f"{config['url']}#page={page_no}", page_text)
+                if not page_changed:
+                    logger.info(f"CreativeCapital: Page {page_no} unchanged since last run; skipping extraction.")
+                    cards = []
+                for card in cards:
+                    all_opportunities.append(self._build_opportunity(
+                        select_text(card, config["title_selector"]),
+                        select_text(card, config["description_selector"]),
+                        select_text(card, config["deadline_selector"]),
+                        urljoin(config["url"], card.get("href") or ""),
+                    ))
+                items = []
+            else:
+                items = driver.find_elements(By.CSS_SELECTOR, config["opportunity_selector"])
+                logger.info(f"CreativeCapital: Found {len(items)} opportunities on current page")
+
+                page_text = self.selector_text(driver, config["opportunity_selector"])
+                page_changed = not self.unchanged_since_last_run(f"{config['url']}#page={page_no}", page_text)
+                if not page_changed:
+                    logger.info(f"CreativeCapital: Page {page_no} unchanged since last run; skipping extraction.")
+                    items = []
 
             for item in items:
                 try:
@@ -96,30 +121,22 @@ class CreativeCapitalScraper(BaseScraper):
                         url = item.get_attribute("href")
                     except:
                         url = ""
-                    
-                    full_text = f"{title} {description}"
-                    amounts_found = extract_amount(full_text)
-                    emails_found = extract_emails(full_text)
-
-                    opp = {
-                        "title": title,
-                        "url": url,
-                        "description": description,
-                        "grant_amount": ", ".join(amounts_found) if amounts_found else "",
-                        "deadline": deadline.replace("DEADLINE:", "").strip(),
-                        "email": ", ".join(emails_found) if emails_found else "",
-                    }
-                    all_opportunities.append(opp)
+
+                    all_opportunities.append(self._build_opportunity(title, description, deadline, url))
                 except Exception as e:
                     logger.warning(f"CreativeCapital:  Error parsing opportunity: {e}")
+            if page_changed:
+                self.remember_content(f"{config['url']}#page={page_no}", page_text)
 
             try:
                 next_btn = driver.find_element(By.CSS_SELECTOR, config["next_button_selector"])
                 next_page = next_btn.get_attribute("data-page")
                 if "disabled" in next_btn.get_attribute("class") or not next_page:
                     break
+                before = self.selector_text(driver, config["opportunity_selector"])
                 driver.execute_script("arguments[0].click();", next_btn)
-                time.sleep(2)
+                page_no += 1
+                wait_for_content_change(driver, config["opportunity_selector"], before, timeout=10, stats=self.waits, baseline=2.0)
             except Exception:
                 logger.info("CreativeCapital: No pagination or next page found.")
                 break
@@ -127,3 +144,17 @@ class CreativeCapitalScraper(BaseScraper):
 
         logger.info(f"CreativeCapital: Total scraped: {len(all_opportunities)}")
         return all_opportunities
+
+    def _build_opportunity(self, title: str, description: str, deadline: str, url: str) -> dict:
+        full_text = f"{title} {description}"
+        amounts_found = extract_amount(full_text)
+        emails_found = extract_emails(full_text)
+
+        return {
+            "title": title,
+            "url": url,
+            "description": description,
+            "grant_amount": ", ".join(amounts_found) if amounts_found else "",
+            "deadline": deadline.replace("DEADLINE:", "").strip(),
+            "email": ", ".join(emails_found) if emails_found else "",
+        }
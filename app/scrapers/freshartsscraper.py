@@ -1,5 +1,4 @@
 import logging
-import time
 from urllib.parse import urljoin
 from app.scrapers.base_scraper import BaseScraper
 from selenium.webdriver.common.by import By
@@ -8,6 +7,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException 
 from app.utils.extractors import extract_amount
 from app.utils.extractors import extract_emails
+from app.utils.dom_snapshot import select_attr, select_text, visible_text
+from app.utils.waits import scroll_until_exhausted, wait_for_count_stable, wait_for_dom_quiescence
 from dateutil.parser import parse
 import re
 
@@ -38,11 +39,9 @@ class FreshArtsScraper(BaseScraper):
 
         
         if self.config.get("scroll", False):
-            for y in range(0, 10000, 1000):
-                driver.execute_script(f"window.scrollTo(0, {y});")
-                time.sleep(0.5)
+            scroll_until_exhausted(driver, self.config["opportunity_selector"], settle=1.0, stats=self.waits, baseline=5.0)
             driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
+            wait_for_dom_quiescence(driver, quiet=0.2, timeout=1, stats=self.waits, baseline=1.0)
 
         
         def click_tab_and_extract(label):
@@ -51,11 +50,11 @@ class FreshArtsScraper(BaseScraper):
                     EC.element_to_be_clickable((By.XPATH, f'//p[contains(text(), "{label}")]/parent::div'))
                 )
                 driver.execute_script("arguments[0].scrollIntoView(true);", tab)
-                time.sleep(1)
+                wait_for_dom_quiescence(driver, quiet=0.2, timeout=1, stats=self.waits, baseline=1.0)
                 tab.click()
                 logger.info(f"FreshArts: Clicked '{label}' tab.")
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+                wait_for_dom_quiescence(driver, quiet=0.3, timeout=3, stats=self.waits, baseline=2.0)
             except TimeoutException:
                 driver.save_screenshot(f"/tmp/{label.lower().replace(' ', '_')}_click_fail.png")
                 logger.error(f"FreshArts: Could not find '{label}' tab — screenshot saved.")
@@ -65,98 +64,68 @@ class FreshArtsScraper(BaseScraper):
             WebDriverWait(driver, 20).until(
                 EC.presence_of_all_elements_located((By.CSS_SELECTOR, self.config["opportunity_selector"]))
             )
-            time.sleep(2)
+            wait_for_count_stable(driver, self.config["opportunity_selector"], timeout=5, stats=self.waits, baseline=2.0)
 
-            items = driver.find_elements(By.CSS_SELECTOR, self.config["opportunity_selector"])
+            if self.snapshot_mode:
+                items = self.snapshot(driver).select(self.config["opportunity_selector"])
+            else:
+                items = driver.find_elements(By.CSS_SELECTOR, self.config["opportunity_selector"])
             logger.info(f"FreshArts: Found {len(items)} items under '{label}'.")
 
             opportunities = []
             for item in items:
+                if self.out_of_time():
+                    break
                 try:
-                    if not item.find_elements(By.CLASS_NAME, self.config["card_class"]):
+                    card = self._card_fields_soup(item) if self.snapshot_mode else self._card_fields_live(item)
+                    if card is None:
                         continue
+                    full_url = card["url"]
+                    title = card["title"]
+                    description = card["description"]
+                    tags = card["tags"]
+                    deadline = card["deadline"]
+                    email = card["email"]
 
-                    card = item.find_element(By.CLASS_NAME, self.config["card_class"])
-                    partial_url = card.get_attribute("href") or ""
-                    full_url =  urljoin(self.config['opportunity_base_url'], partial_url)
-
-                    title = card.find_element(By.CLASS_NAME, self.config["title_class"]).text.strip()
-                    description = card.find_element(By.CLASS_NAME, self.config["description_class"]).text.strip()
-                    tags = card.find_element(By.CSS_SELECTOR, self.config["tags_selector"]).text.strip()
-                    
                     amounts_found = extract_amount(f"{title} {description} {tags}")
 
-                    deadline = ""
-                    email = ""
-                    apply_link = "" 
+                    final_email = ""
+                    apply_link = ""
+                    description_html = description or ""
+
+                    if self.already_ingested(full_url):
+                        logger.info(f"FreshArts: Already ingested, skipping details: {full_url}")
+                        continue
+
+                    if self.unchanged_since_last_run(f"card:{full_url}", card["text"]):
+                        logger.info(f"FreshArts: Card unchanged since last run, skipping details: {full_url}")
+                        continue
 
-                    
-                    for p in card.find_elements(By.TAG_NAME, "p"):
-                        if "Closing on" in p.text:
-                            deadline = p.text.strip()
-                        if "@" in p.text:
-                            email = p.text.strip()
-                    
                     driver.execute_script("window.open(arguments[0]);", full_url)  
                     driver.switch_to.window(driver.window_handles[-1])  
                     
+                    details_ok = False
                     try:
                         
                         WebDriverWait(driver, 10).until(
                             EC.presence_of_element_located((By.CLASS_NAME, "event-info")) 
                         )
-                        container = driver.find_element(By.CLASS_NAME, "event-info")
-                        blocks = container.find_elements(By.CLASS_NAME, "border")
-                        
-                        final_email = ""
-                        raw_date = ""
-                        email_text = ""
-                        for block in blocks:
-                            label_text = block.find_element(By.TAG_NAME, "span").text.strip().lower()
-                            content_div = block.find_element(By.TAG_NAME, "div")
-
-                            if "when" in label_text:
-                                try:
-                                    raw_date = content_div.find_element(By.TAG_NAME, "p").text.strip()
-                                    parsed = parse(raw_date, fuzzy=True, ignoretz=True)
-                                    deadline = parsed.strftime("%Y-%m-%d")
-                                except:
-                                    logger.warning(f"FreshArts: Failed to parse date from '{raw_date}' for {full_url}")
-
-                
-                            elif "contact" in label_text:
-                                try:
-                                    email_text = content_div.find_element(By.TAG_NAME, "p").text.strip()
-                                    emails = extract_emails(email_text)
-                                    final_email = emails[0] if emails else email
-                                except:
-                                    logger.warning(f"FreshArts: Failed to extract email from '{email_text}' for {full_url}")
-
-                            elif "apply" in label_text:
-                                try:
-                                    apply_link = content_div.find_element(By.TAG_NAME, "a").get_attribute("href")
-                                except:
-                                    logger.warning(f"FreshArts: Failed to extract apply link for {full_url}")
-                        
-                        description_html = description or ""
-                        try:
-                            desc_container = WebDriverWait(driver, 10).until(
-                                        EC.presence_of_element_located((By.CLASS_NAME, "description"))
-                                    )
-                            paragraphs = desc_container.find_elements(By.TAG_NAME, "p")
-
-                            clean_paragraphs = []
-                            for p in paragraphs:
-                                raw = p.text.strip()
-                                if raw:
-                                    clean = re.sub(r"\s+", " ", raw).strip()
-                                    clean_paragraphs.append(clean)
-
-                            description_html = "\n".join(clean_paragraphs)
-
-                        except Exception as e:
-                            logger.warning(f"FreshArts: Could not extract full description from {full_url}: {e}")
-                            
+                        if self.snapshot_mode:
+                            # The description renders after .event-info; snapshot once it is there (or give up after 10s like the live path).
+                            try:
+                                WebDriverWait(driver, 10).until(
+                                    EC.presence_of_element_located((By.CLASS_NAME, "description"))
+                                )
+                            except TimeoutException:
+                                logger.warning(f"FreshArts: Description did not appear on {full_url}; using the card text")
+                            details = self._detail_fields_soup(self.snapshot(driver), full_url, email)
+                        else:
+                            details = self._detail_fields_live(driver, full_url, email)
+                        deadline = details.get("deadline") or deadline
+                        final_email = details.get("email", "")
+                        apply_link = details.get("apply_link", "")
+                        description_html = details.get("description") or description_html
+                        details_ok = True
 
                     except Exception as e:
                         logger.warning(f"FreshArts: Failed to extract detail page for {full_url}: {e}")
@@ -172,11 +141,11 @@ class FreshArtsScraper(BaseScraper):
                                 driver.save_screenshot("/tmp/iframe_not_found.png")
                                 logger.error("FreshArts: Could not find or switch to iframe after coming back from details - screenshot saved.")
                                 continue
-                    
-                    
-
-
 
+                    if details_ok:
+                        # A card-only row (detail page failed) is stored but retried next run.
+                        self.remember_detail(full_url)
+                        self.remember_content(f"card:{full_url}", card["text"])
                     opportunities.append({
                         "title": title,
                         "url": apply_link if apply_link else full_url,
@@ -195,9 +164,135 @@ class FreshArtsScraper(BaseScraper):
 
         
         for tab in self.config.get("tabs", []):
+            if self.out_of_time():
+                break
             label = tab["label"]
             all_opportunities.extend(click_tab_and_extract(label))
 
         logger.info(f"FreshArts: Total opportunities scraped: {len(all_opportunities)}")
         return all_opportunities
-    
\ No newline at end of file
+    
+
+    def _card_fields_live(self, item) -> dict | None:
+        if not item.find_elements(By.CLASS_NAME, self.config["card_class"]):
+            return None
+
+        card = item.find_element(By.CLASS_NAME, self.config["card_class"])
+        fields = {
+            "url": urljoin(self.config['opportunity_base_url'], card.get_attribute("href") or ""),
+            "title": card.find_element(By.CLASS_NAME, self.config["title_class"]).text.strip(),
+            "description": card.find_element(By.CLASS_NAME, self.config["description_class"]).text.strip(),
+            "tags": card.find_element(By.CSS_SELECTOR, self.config["tags_selector"]).text.strip(),
+            "deadline": "",
+            "email": "",
+            "text": card.text,
+        }
+        for p in card.find_elements(By.TAG_NAME, "p"):
+            if "Closing on" in p.text:
+                fields["deadline"] = p.text.strip()
+            if "@" in p.text:
+                fields["email"] = p.text.strip()
+        return fields
+
+    def _card_fields_soup(self, item) -> dict | None:
+        card = item.find(class_=self.config["card_class"])
+        if card is None:
+            return None
+
+        fields = {
+            "url": urljoin(self.config['opportunity_base_url'], card.get("href") or ""),
+            "title": select_text(card, f".{self.config['title_class']}"),
+            "description": select_text(card, f".{self.config['description_class']}"),
+            "tags": select_text(card, self.config["tags_selector"]),
+            "deadline": "",
+            "email": "",
+            "text": visible_text(card),
+        }
+        for p in card.find_all("p"):
+            text = p.get_text(" ", strip=True)
+            if "Closing on" in text:
+                fields["deadline"] = text
+            if "@" in text:
+                fields["email"] = text
+        return fields
+
+    def _detail_fields_live(self, driver, full_url: str, card_email: str) -> dict:
+        details = {}
+        container = driver.find_element(By.CLASS_NAME, "event-info")
+        for block in container.find_elements(By.CLASS_NAME, "border"):
+            label_text = block.find_element(By.TAG_NAME, "span").text.strip().lower()
+            content_div = block.find_element(By.TAG_NAME, "div")
+
+            if "when" in label_text:
+                raw_date = ""
+                try:
+                    raw_date = content_div.find_element(By.TAG_NAME, "p").text.strip()
+                    details["deadline"] = parse(raw_date, fuzzy=True, ignoretz=True).strftime("%Y-%m-%d")
+                except:
+                    logger.warning(f"FreshArts: Failed to parse date from '{raw_date}' for {full_url}")
+
+            elif "contact" in label_text:
+                email_text = ""
+                try:
+                    email_text = content_div.find_element(By.TAG_NAME, "p").text.strip()
+                    emails = extract_emails(email_text)
+                    details["email"] = emails[0] if emails else card_email
+                except:
+                    logger.warning(f"FreshArts: Failed to extract email from '{email_text}' for {full_url}")
+
+            elif "apply" in label_text:
+                try:
+                    details["apply_link"] = content_div.find_element(By.TAG_NAME, "a").get_attribute("href")
+                except:
+                    logger.warning(f"FreshArts: Failed to extract apply link for {full_url}")
+
+        try:
+            desc_container = WebDriverWait(driver, 10).until(
+                        EC.presence_of_element_located((By.CLASS_NAME, "description"))
+                    )
+            paragraphs = [p.text for p in desc_container.find_elements(By.TAG_NAME, "p")]
+            details["description"] = self._clean_paragraphs(paragraphs)
+        except Exception as e:
+            logger.warning(f"FreshArts: Could not extract full description from {full_url}: {e}")
+        return details
+
+    def _detail_fields_soup(self, soup, full_url: str, card_email: str) -> dict:
+        details = {}
+        container = soup.find(class_="event-info")
+        for block in container.find_all(class_="border") if container is not None else []:
+            label_text = select_text(block, "span").lower()
+            content_div = block.find("div")
+
+            if "when" in label_text:
+                raw_date = select_text(content_div, "p")
+                try:
+                    details["deadline"] = parse(raw_date, fuzzy=True, ignoretz=True).strftime("%Y-%m-%d")
+                except Exception:
+                    logger.warning(f"FreshArts: Failed to parse date from '{raw_date}' for {full_url}")
+
+            elif "contact" in label_text:
+                emails = extract_emails(select_text(content_div, "p"))
+                details["email"] = emails[0] if emails else card_email
+
+            elif "apply" in label_text:
+                href = select_attr(content_div, "a", "href")
+                if href:
+                    details["apply_link"] = urljoin(full_url, href)
+                else:
+                    logger.warning(f"FreshArts: Failed to extract apply link for {full_url}")
+
+        desc_container = soup.find(class_="description")
+        if desc_container is not None:
+            details["description"] = self._clean_paragraphs(p.get_text(" ") for p in desc_container.find_all("p"))
+        else:
+            logger.warning(f"FreshArts: Could not extract full description from {full_url}")
+        return details
+
+    @staticmethod
+    def _clean_paragraphs(paragraphs) -> str:
+        clean_paragraphs = []
+        for raw in paragraphs:
+            raw = (raw or "").strip()
+            if raw:
+                clean_paragraphs.append(re.sub(r"\s+", " ", raw).strip())
+        return "\n".join(clean_paragraphs)
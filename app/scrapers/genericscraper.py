@@ -7,6 +7,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from app.scrapers.base_scraper import BaseScraper
 from app.utils.extractors import extract_emails, extract_amount
+from app.utils.dom_snapshot import visible_text
 
 logger = logging.getLogger(__name__)
 
@@ -30,33 +31,65 @@ class GenericScraper(BaseScraper):
         ])
 
         
-        xpath_conditions = " or ".join([
-            f"contains(translate(string(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{term.lower()}')"
-            for term in match_terms
-        ])
-
-        candidates = driver.find_elements(
-            By.XPATH,
-            f"//a[{xpath_conditions}]"
-        )
+        if self.snapshot_mode:
+            # (href, title) pairs parsed from one page_source snapshot.
+            terms = [term.lower() for term in match_terms]
+            candidates = []
+            for a in self.snapshot(driver).find_all("a"):
+                text = a.get_text(" ", strip=True)
+                if any(term in text.lower() for term in terms):
+                    candidates.append((a.get("href"), text or a.get("title")))
+            listing_text = "\n".join(f"{urljoin(url, href or '')} {text or ''}" for href, text in candidates)
+        else:
+            xpath_conditions = " or ".join([
+                f"contains(translate(string(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{term.lower()}')"
+                for term in match_terms
+            ])
+
+            candidates = driver.find_elements(
+                By.XPATH,
+                f"//a[{xpath_conditions}]"
+            )
+            listing_text = driver.execute_script(
+                "return arguments[0].map(a => (a.href || '') + ' ' + (a.innerText || '')).join('\\n');",
+                candidates,
+            ) or ""
         logger.info(f"GenericScraper: Found {len(candidates)} candidate links matching keywords.")
 
+        if self.unchanged_since_last_run(url, listing_text):
+            logger.info("GenericScraper: Candidate links unchanged since last run; skipping detail pages.")
+            return []
+
         
         parent = driver.current_window_handle
 
+        # The listing is only recorded once every candidate has been handled.
+        listing_done = True
         for link in candidates:
+            if self.out_of_time():
+                listing_done = False
+                break
             try:
                 
-                raw_href = link.get_attribute("href")
+                if self.snapshot_mode:
+                    raw_href, link_title = link
+                else:
+                    raw_href = link.get_attribute("href")
                 if not raw_href:
                     continue
                 href = self._normalize_url(url, raw_href)  
                 if href in seen_urls:
                     continue
                 seen_urls.add(href)
+                if self.already_ingested(href):
+                    logger.info(f"GenericScraper: Already ingested, skipping detail page: {href}")
+                    continue
 
                 
-                title = (link.text.strip() or link.get_attribute("title") or "Untitled").strip()
+                if self.snapshot_mode:
+                    title = (link_title or "Untitled").strip()
+                else:
+                    title = (link.text.strip() or link.get_attribute("title") or "Untitled").strip()
 
                 
                 driver.execute_script("window.open(arguments[0]);", href)
@@ -65,7 +98,10 @@ class GenericScraper(BaseScraper):
 
                 
                 try:
-                    page_text = driver.find_element(By.TAG_NAME, "body").text
+                    if self.snapshot_mode:
+                        page_text = visible_text(self.snapshot(driver).body)
+                    else:
+                        page_text = driver.find_element(By.TAG_NAME, "body").text
                 except Exception:
                     logger.warning("GenericScraper: Failed to get page text.")
                     page_text = ""
@@ -75,6 +111,10 @@ class GenericScraper(BaseScraper):
                     logger.info("GenericScraper: Skipping page due to insufficient content.")
                     continue
 
+                if self.unchanged_since_last_run(href, page_text):
+                    logger.info(f"GenericScraper: Page unchanged since last run, skipping extraction: {href}")
+                    continue
+
                 
                 paragraphs = [p.strip() for p in page_text.split("\n") if len(p.strip()) > 40]
                 description = "\n".join(paragraphs[:5]) if paragraphs else "No useful text found"
@@ -92,9 +132,11 @@ class GenericScraper(BaseScraper):
                     "deadline": deadline if deadline else "",
                     "tags": "Generic"
                 })
+                self.remember_content(href, page_text)
 
             except Exception as e:
                 logger.warning(f"GenericScraper: Failed to process candidate: {e}")
+                listing_done = False
             finally:
                 
                 try:
@@ -109,6 +151,8 @@ class GenericScraper(BaseScraper):
                     
                     pass
 
+        if listing_done:
+            self.remember_content(url, listing_text)
         logger.info(f"GenericScraper: Scraped {len(all_opportunities)} opportunities.")
         return all_opportunities
 
@@ -1,14 +1,16 @@
 import logging
-import time
 import re
+from urllib.parse import urljoin
 from datetime import datetime, timezone
 from dateutil import parser
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.base_scraper import BaseScraper, NeedsBrowser
 from app.utils.text_from_image import extract_text_from_image_advanced
 from app.utils.extractors import extract_amount, extract_emails
+from app.utils.http_fetcher import fetch_static
+from app.utils.waits import scroll_until_exhausted, wait_for_count_stable
 import spacy
 
 
@@ -17,12 +19,12 @@ nlp = spacy.load("en_core_web_sm")
 logger = logging.getLogger(__name__)
 
 class PickupTheFlowScraper(BaseScraper):
-    def scrape(self, driver):
+    def iter_scrape(self, driver):
         if driver is None:
             logger.error("PickupTheFlow: Could not obtain a webdriver instance.")
-            return []
+            return
 
-        all_opportunities = []
+        scraped = 0
         config = self.config
 
         driver.get(config["url"])
@@ -30,10 +32,11 @@ class PickupTheFlowScraper(BaseScraper):
         curr_year = datetime.now(timezone.utc).year
 
         seen_links = set()
+        skipped_past = 0
 
+        wait_for_count_stable(driver, config["article_selector"], timeout=10, stats=self.waits, baseline=2.0)
         while True:
-            time.sleep(2)
-            self.gradual_scroll(driver)
+            loaded_more = self.gradual_scroll(driver)
             articles = driver.find_elements(By.CSS_SELECTOR, config["article_selector"])
 
             logger.info(f"PickupTheFlow: Found {len(articles)} articles")
@@ -41,23 +44,43 @@ class PickupTheFlowScraper(BaseScraper):
             keep_going = True
             parent = driver.current_window_handle
             for article in articles:
+                if self.out_of_time():
+                    keep_going = False
+                    break
+                published_at = None
                 try:
                     date_elem = article.find_element(By.CSS_SELECTOR, config["date_selector"])
                     date_str = date_elem.get_attribute("datetime")
-                    article_year = parser.parse(date_str).year
+                    published_at = parser.parse(date_str)
+                    article_year = published_at.year
 
                     if article_year < curr_year:
                         logger.info("PickupTheFlow: Reached articles from a previous year. Stopping.")
+                        self._crawl_complete()
                         keep_going = False
                         break
 
                     link_elem = article.find_element(By.CSS_SELECTOR, config["link_selector"])
                     post_url = link_elem.get_attribute("href")
 
+                    if self._reached_high_water(post_url, published_at):
+                        keep_going = False
+                        break
+
                     if post_url in seen_links:
                         continue
                     seen_links.add(post_url)
 
+                    if self.already_ingested(post_url):
+                        logger.info(f"PickupTheFlow: Already ingested, skipping: {post_url}")
+                        self._observe_post(post_url, published_at)
+                        continue
+
+                    card_text = article.text
+                    if self.unchanged_since_last_run(f"card:{post_url}", card_text):
+                        logger.info(f"PickupTheFlow: Post unchanged since last run, skipping: {post_url}")
+                        self._observe_post(post_url, published_at)
+                        continue
 
                     driver.execute_script("window.open(arguments[0]);", post_url)
                     driver.switch_to.window(driver.window_handles[-1])
@@ -71,87 +94,32 @@ class PickupTheFlowScraper(BaseScraper):
                     except Exception:
                             title = ""
                     
-                    img_elem = None 
+                    img_url = img_link = None
                     try:
                         img_elem = driver.find_element(By.CSS_SELECTOR, config["image_selector"])
                         img_url = img_elem.get_attribute("src")
-                        ocr_result = extract_text_from_image_advanced(img_url)
-                        
-                        image_text   = ocr_result.get("full_text", "") or "No image text found"
-                        amount_hint  = ocr_result.get("top_right_text", "") or ""
-                        location_hint= ocr_result.get("bottom_right_text", "") or ""
-                        deadline_hint= ocr_result.get("deadline_text", "") or ""
-                        
-                        
-                    except Exception as e:
-                        logger.warning(f"No image or OCR failed for '{title}': {e}")
-                        image_text = "No image text found"
-                        amount_hint = location_hint = deadline_hint = "" 
-
-                    try:
-                        deadline = self.extract_deadline(image_text, deadline_hint)
+                        try:
+                            parent_a = img_elem.find_element(By.XPATH, "./ancestor::a[1]")
+                            img_link = parent_a.get_attribute("href")
+                        except Exception:
+                            img_link = None
                     except Exception as e:
-                        logger.warning(f"Failed to extract deadline for '{title}': {e}")
-                        deadline = None
-
-                    try:
-                        location = self.extract_location(image_text, location_hint)
-                    except Exception as e:
-                        logger.warning(f"Failed to extract location for '{title}': {e}")
-                        location = "Unknown"
-                    
-                    final_url = post_url
-                    try:
-                        apply_link = self.extract_apply_link(image_text)
-                        if apply_link and apply_link != "No link found":
-                            final_url = apply_link
-                        elif img_elem is not None:
-                            try:
-                                parent_a = img_elem.find_element(By.XPATH, "./ancestor::a[1]")
-                                final_url = parent_a.get_attribute("href") or post_url
-                            except Exception:
-                                final_url = post_url
-                    except Exception as e:
-                        logger.warning(f"Failed to extract apply link for '{title}': {e}")
-
-                    try:
-                        amount = extract_amount(image_text, amount_hint)
-                        if isinstance(amount, str):
-                            amount_list = [amount] if amount else []
-                        else:
-                            amount_list = list(amount or [])
-                    except Exception as e:
-                        logger.warning(f"Failed to extract amount for '{title}': {e}")
-                        amount_list = []
-                    
-                    try:
-                        emails_found = extract_emails(f"{title} {image_text}")
-                    except Exception as e:
-                        logger.warning(f"Failed to extract emails for '{title}': {e}")
-                        emails_found = []
-                    
-                    
-
-                    skipped_past = 0
-                    if deadline is not None and deadline < datetime.now(timezone.utc).date():
+                        logger.warning(f"No image found for '{title}': {e}")
+
+                    opp = self._build_opportunity(title, post_url, img_url, img_link)
+                    self._observe_post(post_url, published_at)
+                    # Stored under the apply/image link, so remember the post itself (past-deadline ones too).
+                    self.remember_detail(post_url)
+                    self.remember_content(f"card:{post_url}", card_text)
+                    if opp is None:
                         skipped_past += 1
                         continue
-                    
-                    if deadline is None or deadline >= datetime.now(timezone.utc).date():
-                        amount_str = ", ".join(amount_list) if amount_list else ""
-                        tag_bits = [bit for bit in [amount_str, location if location and location != "Unknown" else ""] if bit]
-                        all_opportunities.append({
-                            "title": title,
-                            "url": final_url,
-                            "description": image_text,
-                            "grant_amount": amount_str,
-                            "tags":  ", ".join(tag_bits),
-                            "deadline": deadline.strftime("%Y-%m-%d") if deadline else "",
-                                "email": ", ".join(emails_found) if emails_found else "",
-                        })
+                    scraped += 1
+                    yield opp
 
                 except Exception as e:
                     logger.warning(f"PickupTheFlow: Failed to process an article: {e}")
+                    self._post_failed(published_at)
                     continue
                 
                 finally:
@@ -167,16 +135,233 @@ class PickupTheFlowScraper(BaseScraper):
 
             if not keep_going:
                 break
+            if not loaded_more:
+                logger.info("PickupTheFlow: Infinite scroll exhausted; no more posts.")
+                self._crawl_complete()
+                break
+
+        logger.info(f"PickupTheFlow: Scraped {scraped} valid opportunities.(Skipped {skipped_past} past-deadline)")
+
+    def iter_scrape_static(self):
+        config = self.config
+        pagination_url = config.get("pagination_url")
+        if not pagination_url:
+            raise NeedsBrowser("no pagination_url configured")
+
+        scraped = 0
+        curr_year = datetime.now(timezone.utc).year
+        seen_links = set()
+        skipped_past = 0
+
+        page = 1
+        while True:
+            url = config["url"] if page == 1 else pagination_url.format(page=page)
+            listing = fetch_static(url)
+            articles = listing.soup.select(config["article_selector"]) if listing else []
+            if not articles:
+                if page == 1:
+                    logger.info("PickupTheFlow: No articles in static HTML; page needs a browser.")
+                    raise NeedsBrowser("no articles in static HTML")
+                self._crawl_complete()
+                break
+
+            logger.info(f"PickupTheFlow: Found {len(articles)} articles on page {page} (static)")
+
+            keep_going = True
+            for article in articles:
+                if self.out_of_time():
+                    keep_going = False
+                    break
+                published_at = None
+                try:
+                    date_elem = article.select_one(config["date_selector"])
+                    date_str = date_elem.get("datetime") if date_elem is not None else None
+                    if not date_str:
+                        continue
+                    published_at = parser.parse(date_str)
+                    if published_at.year < curr_year:
+                        logger.info("PickupTheFlow: Reached articles from a previous year. Stopping.")
+                        self._crawl_complete()
+                        keep_going = False
+                        break
+
+                    link_elem = article.select_one(config["link_selector"])
+                    if link_elem is None or not link_elem.get("href"):
+                        continue
+                    post_url = urljoin(url, link_elem["href"])
+
+                    if self._reached_high_water(post_url, published_at):
+                        keep_going = False
+                        break
+
+                    if post_url in seen_links:
+                        continue
+                    seen_links.add(post_url)
+
+                    if self.already_ingested(post_url):
+                        logger.info(f"PickupTheFlow: Already ingested, skipping: {post_url}")
+                        self._observe_post(post_url, published_at)
+                        continue
+
+                    card_text = article.get_text(" ", strip=True)
+                    if self.unchanged_since_last_run(f"card:{post_url}", card_text):
+                        logger.info(f"PickupTheFlow: Post unchanged since last run, skipping: {post_url}")
+                        self._observe_post(post_url, published_at)
+                        continue
+
+                    post = fetch_static(post_url, cache=self.page_cache)
+                    if post is None:
+                        self._post_failed(published_at)
+                        continue
+                    if post.not_modified:
+                        self._observe_post(post_url, published_at)
+                        continue
+
+                    title_elem = post.soup.select_one(config["title_selector"])
+                    title = title_elem.get_text(" ", strip=True) if title_elem is not None else ""
+
+                    img_url = img_link = None
+                    img_elem = post.soup.select_one(config["image_selector"])
+                    if img_elem is not None:
+                        img_url = self._static_image_src(img_elem, post_url)
+                        parent_a = img_elem.find_parent("a")
+                        if parent_a is not None and parent_a.get("href"):
+                            img_link = urljoin(post_url, parent_a["href"])
+
+                    opp = self._build_opportunity(title, post_url, img_url, img_link)
+                    self._observe_post(post_url, published_at)
+                    # Stored under the apply/image link, so remember the post itself (past-deadline ones too).
+                    self.remember_detail(post_url)
+                    self.remember_content(f"card:{post_url}", card_text)
+                    self.remember_content(post_url)
+                    if opp is None:
+                        skipped_past += 1
+                        continue
+                    scraped += 1
+                    yield opp
+
+                except Exception as e:
+                    logger.warning(f"PickupTheFlow: Failed to process an article: {e}")
+                    self._post_failed(published_at)
+                    continue
+
+            if not keep_going:
+                break
+            page += 1
+
+        logger.info(f"PickupTheFlow: Scraped {scraped} valid opportunities over HTTP.(Skipped {skipped_past} past-deadline)")
+
+    def scrape(self, driver):
+        return list(self.iter_scrape(driver))
+
+    def scrape_static(self):
+        try:
+            return list(self.iter_scrape_static())
+        except NeedsBrowser:
+            return None
 
-        logger.info(f"PickupTheFlow: Scraped {len(all_opportunities)} valid opportunities.(Skipped {skipped_past} past-deadline)")
-        return all_opportunities
+    def _reached_high_water(self, post_url: str, published_at) -> bool:
+        if self.high_water is not None and self.high_water.reached(post_url, published_at):
+            logger.info("PickupTheFlow: Reached posts ingested in a previous run. Stopping.")
+            self._crawl_complete()
+            return True
+        return False
+
+    def _crawl_complete(self):
+        if self.high_water is not None:
+            self.high_water.crawl_complete()
+
+    def _observe_post(self, post_url: str, published_at):
+        if self.high_water is not None:
+            self.high_water.observe(post_url, published_at)
+
+    def _post_failed(self, published_at):
+        if self.high_water is not None:
+            self.high_water.fail(published_at)
+
+    def _static_image_src(self, img_elem, base_url: str) -> str | None:
+        # WordPress lazy-loading keeps the real image in data-* attributes and a placeholder in src.
+        for attr in ("data-src", "data-lazy-src", "src"):
+            src = (img_elem.get(attr) or "").strip()
+            if src and not src.startswith("data:"):
+                return urljoin(base_url, src)
+        return None
+
+    def _build_opportunity(self, title: str, post_url: str, img_url: str | None, img_link: str | None) -> dict | None:
+        """OCR the post image and build the opportunity; None when its deadline has passed."""
+        try:
+            if not img_url:
+                raise ValueError("no image URL")
+            ocr_result = extract_text_from_image_advanced(img_url)
+            
+            image_text   = ocr_result.get("full_text", "") or "No image text found"
+            amount_hint  = ocr_result.get("top_right_text", "") or ""
+            location_hint= ocr_result.get("bottom_right_text", "") or ""
+            deadline_hint= ocr_result.get("deadline_text", "") or ""
+            
+        except Exception as e:
+            logger.warning(f"No image or OCR failed for '{title}': {e}")
+            image_text = "No image text found"
+            amount_hint = location_hint = deadline_hint = "" 
+
+        try:
+            deadline = self.extract_deadline(image_text, deadline_hint)
+        except Exception as e:
+            logger.warning(f"Failed to extract deadline for '{title}': {e}")
+            deadline = None
+
+        if deadline is not None and deadline < datetime.now(timezone.utc).date():
+            return None
 
-    def gradual_scroll(self, driver, steps=5, pause=1.0):
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        for i in range(steps):
-            scroll_position = (i + 1) / steps * last_height
-            driver.execute_script(f"window.scrollTo(0, {scroll_position});")
-            time.sleep(pause)
+        try:
+            location = self.extract_location(image_text, location_hint)
+        except Exception as e:
+            logger.warning(f"Failed to extract location for '{title}': {e}")
+            location = "Unknown"
+        
+        final_url = post_url
+        try:
+            apply_link = self.extract_apply_link(image_text)
+            if apply_link and apply_link != "No link found":
+                final_url = apply_link
+            elif img_link:
+                final_url = img_link
+        except Exception as e:
+            logger.warning(f"Failed to extract apply link for '{title}': {e}")
+
+        try:
+            amount = extract_amount(image_text, amount_hint)
+            if isinstance(amount, str):
+                amount_list = [amount] if amount else []
+            else:
+                amount_list = list(amount or [])
+        except Exception as e:
+            logger.warning(f"Failed to extract amount for '{title}': {e}")
+            amount_list = []
+        
+        try:
+            emails_found = extract_emails(f"{title} {image_text}")
+        except Exception as e:
+            logger.warning(f"Failed to extract emails for '{title}': {e}")
+            emails_found = []
+
+        amount_str = ", ".join(amount_list) if amount_list else ""
+        tag_bits = [bit for bit in [amount_str, location if location and location != "Unknown" else ""] if bit]
+        return {
+            "title": title,
+            "url": final_url,
+            "description": image_text,
+            "grant_amount": amount_str,
+            "tags":  ", ".join(tag_bits),
+            "deadline": deadline.strftime("%Y-%m-%d") if deadline else "",
+            "email": ", ".join(emails_found) if emails_found else "",
+        }
+
+    def gradual_scroll(self, driver, steps=5, pause=1.0) -> bool:
+        """Scroll until the feed stops loading posts (at most `steps` rounds, `pause` seconds each); True if more loaded."""
+        grew = scroll_until_exhausted(driver, self.config["article_selector"], settle=pause * 2, max_rounds=steps,
+                                      stats=self.waits, baseline=steps * pause)
+        return grew > 0
 
 
 
@@ -1,10 +1,12 @@
 import logging
-import time
+from urllib.parse import urljoin
 from app.scrapers.base_scraper import BaseScraper
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from app.utils.extractors import extract_amount, extract_emails 
+from app.utils.http_fetcher import fetch_static
+from app.utils.waits import wait_for_count_stable
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +21,8 @@ class SurdnaScraper(BaseScraper):
 
 
         page = 1
-        while True:
-            if page == 1:
-                url = config['url']
-            else:
-                url = f"{config['url'].rstrip('/')}/page/{page}/"
+        while not self.out_of_time():
+            url = self._page_url(page)
             logger.info(f"Surdna: Loading Surdna grants page {page} -> {url}")
             driver.get(url)
 
@@ -34,6 +33,23 @@ class SurdnaScraper(BaseScraper):
             except Exception as e:
                 logger.warning(f"Surdna: No table rows found on page {page}: {e}")
                 break
+            wait_for_count_stable(driver, config["row_selector"], stable_for=0.3, timeout=5, stats=self.waits, baseline=1.5)
+
+            if self.snapshot_mode:
+                soup = self.snapshot(driver)
+                rows = soup.select(config["row_selector"])
+                logger.info(f"Surdna: Found {len(rows)} rows on page {page} (snapshot)")
+                page_text = "\n".join(row.get_text(" ", strip=True) for row in rows)
+                if rows and self.unchanged_since_last_run(url, page_text):
+                    logger.info(f"Surdna: Page {page} unchanged since last run; skipping extraction.")
+                else:
+                    all_opportunities.extend(self._parse_rows(rows, url, page))
+                    self.remember_content(url, page_text)
+                if not rows or soup.select_one(config["next_button_selector"]) is None:
+                    logger.info("Surdna: No next button found. Done.")
+                    break
+                page += 1
+                continue
 
             rows = driver.find_elements(By.CSS_SELECTOR, config["row_selector"])
             logger.info(f"Surdna: Found {len(rows)} rows on page {page}")
@@ -41,6 +57,12 @@ class SurdnaScraper(BaseScraper):
             if not rows:
                 break
 
+            page_text = self.selector_text(driver, config["row_selector"])
+            page_changed = not self.unchanged_since_last_run(url, page_text)
+            if not page_changed:
+                logger.info(f"Surdna: Page {page} unchanged since last run; skipping extraction.")
+                rows = []
+
             for i, row in enumerate(rows, start=1):
                 try:
                     cols = row.find_elements(By.TAG_NAME, config["cell_tag"])
@@ -68,32 +90,18 @@ class SurdnaScraper(BaseScraper):
 
                     description_elem = org_col.find_elements(By.CSS_SELECTOR, config["description_selector"])
                     description = description_elem[0].text.strip() if description_elem else "No description provided"
-                    description += f"\n\nAmount: {amount}, Duration: {duration}, Year: {year}"
-                    
-                    full_text = f"{title} {description}"
-                    emails_found = extract_emails(full_text)
-                    amounts_found = extract_amount(full_text)
-                    
-                    deadline = ""
-
-                    opp = {
-                        "title": title,
-                        "url": link_url,
-                        "description": description,
-                        "grant_amount": ", ".join(amounts_found) if amounts_found else "",
-                        "tags": f"{amount}, {duration}, {year}",
-                        "deadline": deadline,
-                        "email": ", ".join(emails_found) if emails_found else "",
-                    }
+
+                    opp = self._build_opportunity(title, link_url, description, amount, duration, year)
                     all_opportunities.append(opp)
                 except Exception as e:
                     logger.warning(f"Surdna: Failed to parse row {i} on page {page}: {e}")
+            if page_changed:
+                self.remember_content(url, page_text)
 
             try:
                 next_btn_exists = driver.find_element(By.CSS_SELECTOR, config["next_button_selector"])
                 if next_btn_exists:
                     page += 1
-                    time.sleep(1.5)
                 else:
                     logger.info("Surdna: No next button found. Done.")
                     break
@@ -104,3 +112,95 @@ class SurdnaScraper(BaseScraper):
 
         logger.info(f"Surdna: Total scraped: {len(all_opportunities)}")
         return all_opportunities
+
+    def scrape_static(self):
+        all_opportunities = []
+        config = self.config
+
+        page = 1
+        while not self.out_of_time():
+            url = self._page_url(page)
+            logger.info(f"Surdna: Fetching Surdna grants page {page} over HTTP -> {url}")
+            static_page = fetch_static(url)
+            rows = static_page.soup.select(config["row_selector"]) if static_page else []
+
+            if not rows:
+                if page == 1:
+                    logger.info("Surdna: No table rows in static HTML; page needs a browser.")
+                    return None
+                logger.info(f"Surdna: No table rows found on page {page}. Done.")
+                break
+            logger.info(f"Surdna: Found {len(rows)} rows on page {page}")
+
+            page_text = "\n".join(row.get_text(" ", strip=True) for row in rows)
+            if self.unchanged_since_last_run(url, page_text):
+                logger.info(f"Surdna: Page {page} unchanged since last run; skipping extraction.")
+            else:
+                all_opportunities.extend(self._parse_rows(rows, url, page))
+                self.remember_content(url, page_text)
+
+            if static_page.soup.select_one(config["next_button_selector"]) is None:
+                logger.info("Surdna: No next button found. Done.")
+                break
+            page += 1
+
+        logger.info(f"Surdna: Total scraped (static): {len(all_opportunities)}")
+        return all_opportunities
+
+    def _parse_rows(self, rows, base_url: str, page: int) -> list:
+        """Parse table rows from parsed HTML (a static fetch or a page_source snapshot)."""
+        config = self.config
+        opportunities = []
+        for i, row in enumerate(rows, start=1):
+            try:
+                cols = row.find_all(config["cell_tag"], recursive=False)
+                if len(cols) < 5:
+                    continue
+
+                year = cols[0].get_text(strip=True)
+                org_col = cols[1]
+                status = cols[2].get_text(strip=True)
+                amount = cols[3].get_text(strip=True)
+                duration = cols[4].get_text(strip=True)
+
+                if status.lower() != "active":
+                    continue
+
+                org_link = org_col.select_one(config["org_link_selector"])
+                if org_link is not None:
+                    title = org_link.get_text(" ", strip=True)
+                    link_url = urljoin(base_url, org_link.get("href") or "")
+                else:
+                    title = org_col.get_text("\n", strip=True).split("\n")[0] or "No title found"
+                    link_url = "No URL found"
+                    logger.warning(f"Surdna: Missing <a> tag in row {i} on page {page}.")
+
+                description_elem = org_col.select_one(config["description_selector"])
+                description = description_elem.get_text(" ", strip=True) if description_elem else "No description provided"
+
+                opportunities.append(self._build_opportunity(title, link_url, description, amount, duration, year))
+            except Exception as e:
+                logger.warning(f"Surdna: Failed to parse row {i} on page {page}: {e}")
+        return opportunities
+
+    def _page_url(self, page: int) -> str:
+        if page == 1:
+            return self.config['url']
+        return f"{self.config['url'].rstrip('/')}/page/{page}/"
+
+    def _build_opportunity(self, title: str, link_url: str, description: str, amount: str, duration: str, year: str) -> dict:
+        description += f"\n\nAmount: {amount}, Duration: {duration}, Year: {year}"
+
+        full_text = f"{title} {description}"
+        emails_found = extract_emails(full_text)
+        amounts_found = extract_amount(full_text)
+
+        return {
+            "title": title,
+            "url": link_url,
+            "description": description,
+            "grant_amount": ", ".join(amounts_found) if amounts_found else "",
+            "tags": f"{amount}, {duration}, {year}",
+            "deadline": "",
+            "email": ", ".join(emails_found) if emails_found else "",
+        }
@@ -0,0 +1,41 @@
+from __future__ import annotations
+import logging
+
+from sqlalchemy import select, update
+
+from app.db.database import SessionLocal
+from app.db.models import Opportunity
+from app.utils.amounts import amount_columns
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def backfill_amounts(only_missing: bool = True):
+    """Parse grant_amount / llm_info.award_amount into amount_min/amount_max/amount_confidence."""
+    updated = 0
+    with SessionLocal() as db:
+        last_id = 0
+        while True:
+            stmt = select(Opportunity.id, Opportunity.grant_amount, Opportunity.llm_info) \
+                .where(Opportunity.id > last_id).order_by(Opportunity.id).limit(BATCH_SIZE)
+            if only_missing:
+                stmt = stmt.where(Opportunity.amount_confidence.is_(None))
+            rows = db.execute(stmt).all()
+            if not rows:
+                break
+
+            last_id = rows[-1].id
+            db.execute(update(Opportunity), [
+                {"id": row_id, **amount_columns(grant_amount, llm_info)}
+                for row_id, grant_amount, llm_info in rows
+            ])
+            db.commit()
+            updated += len(rows)
+
+    logger.info(f"Amount backfill: parsed {updated} rows.")
+
+
+if __name__ == "__main__":
+    backfill_amounts()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+import logging
+
+from sqlalchemy import select, update
+
+from app.db.database import SessionLocal
+from app.db.models import Opportunity
+from app.utils.deadlines import deadline_columns
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def backfill_deadlines(only_missing: bool = True):
+    """Parse deadline / llm_info.deadline into deadline_date."""
+    updated = parsed = 0
+    with SessionLocal() as db:
+        last_id = 0
+        while True:
+            stmt = select(Opportunity.id, Opportunity.deadline, Opportunity.llm_info) \
+                .where(Opportunity.id > last_id).order_by(Opportunity.id).limit(BATCH_SIZE)
+            if only_missing:
+                stmt = stmt.where(Opportunity.deadline_date.is_(None))
+            rows = db.execute(stmt).all()
+            if not rows:
+                break
+
+            last_id = rows[-1].id
+            values = [{"id": row_id, **deadline_columns(deadline, llm_info)} for row_id, deadline, llm_info in rows]
+            db.execute(update(Opportunity), values)
+            db.commit()
+            updated += len(rows)
+            parsed += sum(1 for v in values if v["deadline_date"] is not None)
+
+    logger.info(f"Deadline backfill: {parsed} of {updated} rows have a parsed deadline.")
+
+
+if __name__ == "__main__":
+    backfill_deadlines()
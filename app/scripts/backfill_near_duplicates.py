@@ -0,0 +1,52 @@
+from __future__ import annotations
+import logging
+
+from sqlalchemy import select, update
+
+from app.db.database import SessionLocal
+from app.db.deduplication import compute_minhash
+from app.db.models import Opportunity
+from app.db.near_duplicates import load_near_duplicate_index, reset_near_duplicate_index
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def backfill_near_duplicates():
+    """Fingerprint rows stored before near-duplicate detection and link them in id order (oldest = canonical)."""
+    fingerprinted = linked = 0
+    with SessionLocal() as db:
+        index = load_near_duplicate_index(db)
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(Opportunity.id, Opportunity.title, Opportunity.description)
+                .where(Opportunity.minhash.is_(None), Opportunity.id > last_id)
+                .order_by(Opportunity.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+
+            updates = []
+            for row_id, title, description in rows:
+                last_id = row_id
+                signature = compute_minhash(title, description if description != "Not Available" else "")
+                if signature is None:
+                    continue
+                canonical_id = index.link(row_id, signature)
+                updates.append({"id": row_id, "minhash": signature, "canonical_id": canonical_id})
+                linked += canonical_id is not None
+
+            if updates:
+                db.execute(update(Opportunity), updates)
+                db.commit()
+                fingerprinted += len(updates)
+
+    reset_near_duplicate_index()
+    logger.info(f"NearDup backfill: fingerprinted {fingerprinted} rows, linked {linked} near-duplicates.")
+
+
+if __name__ == "__main__":
+    backfill_near_duplicates()
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from app.db.database import SessionLocal
+from app.db.opportunity_stats import refresh_stats
+
+
+def refresh_grant_counts():
+    """Resync opportunity_stats with the table (after a TRUNCATE, restore or manual bulk fix)."""
+    with SessionLocal() as db:
+        return refresh_stats(db)
+
+
+if __name__ == "__main__":
+    refresh_grant_counts()
@@ -10,6 +10,7 @@ from sqlalchemy import or_
 
 from app.db.database import SessionLocal
 from app.db.models import Opportunity
+from app.db.llm_cache import prune_llm_cache
 from app.main import run_all_scrapers 
 from redis import Redis
 
@@ -23,11 +24,12 @@ REBUILD_STATE = os.path.join(VECTOR_STORE, "rebuild_state.json")
 ORGKB_DIR = os.path.join(HERE, "org_kb") 
 
 # ---------- Scrape job ----------
-def scrape_job() -> Dict[str, Any]:
+def scrape_job(full: bool = False) -> Dict[str, Any]:
     """
     Run all scrapers and return a summary of the scrape job.
+    full=True forces a complete recrawl (ignores high-water marks and the page cache).
     """
-    summary = run_all_scrapers()
+    summary = run_all_scrapers(full=full)
     logger.info("scrape_job done: %s", summary)
     return summary
 
@@ -50,13 +52,15 @@ def prune_old_grants_job(days: int = 366) -> int:
     return deleted
 
 # ---------- LLM job ----------
-def llm_job(max_workers: int = 4) -> None:
+def llm_job(max_workers: int = 4) -> Dict[str, Any]:
     """
     Process all new/unprocessed grants (llm_info IS NULL OR is_relevant IS NULL).
+    Returns the number processed and the LLM result cache hit rate for the run.
     """
     from app.utils.llm.llm_pipeline import process_new_grants_with_llm
-    process_new_grants_with_llm(max_workers=max_workers)
-    logger.info("llm_job: completed.")
+    stats = process_new_grants_with_llm(max_workers=max_workers) or {}
+    logger.info("llm_job: completed. %s", stats)
+    return stats
 
 # ---------- Feedback index: conditional rebuild ----------
 def _feedback_db_count(db: Session) -> int:
@@ -192,7 +196,8 @@ def weekly_pipeline() -> dict:
     try:
         sc = scrape_job()
         pruned = prune_old_grants_job(days=366)
-        llm_job()
+        prune_llm_cache()
+        llm = llm_job()
 
         rebuilt_feedback = try_feedback_index_job_rebuild()
         rebuilt_orgkb = try_orgkb_index_job_rebuild(always=False)
@@ -200,6 +205,7 @@ def weekly_pipeline() -> dict:
         summary = {
             "scrape": sc,
             "pruned": pruned,
+            "llm": llm,
             "rebuilt_feedback": rebuilt_feedback,
             "rebuilt_orgkb": rebuilt_orgkb,
             "finished_at": datetime.now(timezone.utc).isoformat(),
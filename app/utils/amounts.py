@@ -0,0 +1,111 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Confidence of a parsed award range, stored in opportunities.amount_confidence.
+CONFIDENCE_EXACT = 1.0       # one amount ("$5,000")
+CONFIDENCE_RANGE = 0.8       # explicit range ("$5k - $10k", "$5,000 to $10,000")
+CONFIDENCE_UP_TO = 0.6       # upper bound only ("up to $5,000")
+CONFIDENCE_MULTIPLE = 0.4    # several unrelated amounts; min/max span them
+
+MIN_AWARD = 100  # smaller figures are fees, ages, years, etc.
+MAX_AMOUNT = 2**63 - 1  # amount_min / amount_max are BIGINT; larger figures are noise
+
+_UNKNOWN = {"", "not available", "n/a", "none", "null", "unknown", "varies"}
+_NUMBER = r"(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?\s*(k|m|thousand|million)?\b"
+_MONEY = re.compile(r"(?:[\$€£]|usd\s*)\s*" + _NUMBER + r"|" + _NUMBER + r"\s*(?:usd|dollars)\b", re.IGNORECASE)
+_RANGE = re.compile(
+    r"([\$€£]|usd\s*)?\s*" + _NUMBER + r"\s*(?:-|–|—|to|and)\s*([\$€£]|usd\s*)?\s*" + _NUMBER,
+    re.IGNORECASE,
+)
+_UP_TO = re.compile(r"\b(?:up to|maximum of|max(?:imum)?\.?|not to exceed|no more than)\s*$", re.IGNORECASE)
+_MULTIPLIER = {"k": 1_000, "thousand": 1_000, "m": 1_000_000, "million": 1_000_000}
+
+
+@dataclass
+class AmountRange:
+    minimum: Optional[int]
+    maximum: Optional[int]
+    confidence: float
+
+    def as_columns(self) -> Dict[str, Any]:
+        return {"amount_min": self.minimum, "amount_max": self.maximum, "amount_confidence": self.confidence}
+
+
+UNKNOWN_AMOUNT = AmountRange(None, None, 0.0)
+
+
+def _to_int(whole: Optional[str], frac: Optional[str], unit: Optional[str]) -> Optional[int]:
+    if not whole:
+        return None
+    value = float(whole.replace(",", "") + (f".{frac}" if frac else "")) * _MULTIPLIER.get((unit or "").lower(), 1)
+    if value > MAX_AMOUNT:
+        return None
+    return int(value)
+
+
+def _money_values(text: str) -> List[Tuple[int, int]]:
+    """(value, start offset) for each money amount in `text`."""
+    values = []
+    for m in _MONEY.finditer(text):
+        groups = m.groups()
+        value = _to_int(*groups[0:3]) if groups[0] else _to_int(*groups[3:6])
+        if value is not None and value >= MIN_AWARD:
+            values.append((value, m.start()))
+    return values
+
+
+def parse_amount_range(text: Optional[str]) -> AmountRange:
+    """Parse a free-text award amount ("$5k-$10k", "up to $2,500", "$1,000") into a numeric range."""
+    if text is None:
+        return UNKNOWN_AMOUNT
+    text = str(text).strip()
+    if text.lower() in _UNKNOWN:
+        return UNKNOWN_AMOUNT
+
+    ranges = []
+    for m in _RANGE.finditer(text):
+        cur1, whole1, frac1, unit1, cur2, whole2, frac2, unit2 = m.groups()
+        if not (cur1 or cur2):
+            continue  # "2024-2025" is not money
+        low, high = _to_int(whole1, frac1, unit1), _to_int(whole2, frac2, unit2)
+        if low is None or high is None:
+            continue
+        # "$5-10k": the unit on the upper bound applies to both.
+        if not unit1 and unit2 and low * _MULTIPLIER[unit2.lower()] <= high:
+            low *= _MULTIPLIER[unit2.lower()]
+        if MIN_AWARD <= low <= high:
+            ranges.append((low, high, m.start(), m.end()))
+
+    values = _money_values(text)
+    if ranges:
+        # Amounts outside every range ("Grants: $500-$1,000; Fellowships $10,000") widen the span.
+        others = [v for v, start in values if not any(r_start <= start < r_end for _, _, r_start, r_end in ranges)]
+        if len(ranges) == 1 and not others:
+            return AmountRange(ranges[0][0], ranges[0][1], CONFIDENCE_RANGE)
+        bounds = [r[0] for r in ranges] + [r[1] for r in ranges] + others
+        return AmountRange(min(bounds), max(bounds), CONFIDENCE_MULTIPLE)
+
+    if not values:
+        return UNKNOWN_AMOUNT
+
+    distinct = sorted({v for v, _ in values})
+    if len(distinct) == 1:
+        value, start = values[0]
+        if _UP_TO.search(text[:start]):
+            return AmountRange(None, value, CONFIDENCE_UP_TO)
+        return AmountRange(value, value, CONFIDENCE_EXACT)
+    return AmountRange(distinct[0], distinct[-1], CONFIDENCE_MULTIPLE)
+
+
+def amount_columns(grant_amount: Optional[str], llm_info: Optional[dict] = None) -> Dict[str, Any]:
+    """
+    amount_min / amount_max / amount_confidence for a row: the more confident of the scraped
+    grant_amount and the LLM's award_amount (LLM wins ties, it read the whole posting).
+    """
+    scraped = parse_amount_range(grant_amount)
+    award = (llm_info or {}).get("award_amount") if isinstance(llm_info, dict) else None
+    llm = parse_amount_range(award if isinstance(award, str) else (str(award) if award is not None else None))
+    best = llm if llm.confidence >= scraped.confidence else scraped
+    return best.as_columns()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_NAME = "default"
+DEFAULT_PROFILE: Dict = {"name": DEFAULT_PROFILE_NAME}
+
+# Resource types a profile can block, as URL patterns for Network.setBlockedURLs.
+RESOURCE_PATTERNS: Dict[str, List[str]] = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheets": ["*.css"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg"],
+    "trackers": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*facebook.net*", "*hotjar.com*", "*connect.facebook.com*",
+    ],
+}
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+
+def resolve_browser_profile(site_config: dict, profiles: Optional[Dict[str, dict]] = None) -> dict:
+    """
+    `browser_profile` on a site is either the name of an entry under top-level
+    `browser_profiles` in sites_config.yml or an inline mapping. Missing -> default profile.
+    """
+    ref = site_config.get("browser_profile")
+    if not ref or ref == DEFAULT_PROFILE_NAME:
+        return dict(DEFAULT_PROFILE)
+    if isinstance(ref, dict):
+        return {"name": ref.get("name") or f"{site_config.get('name')}-inline", **ref}
+
+    spec = (profiles or {}).get(ref)
+    if spec is None:
+        logger.warning(f"BrowserProfile: Unknown profile '{ref}' for site '{site_config.get('name')}', using default")
+        return dict(DEFAULT_PROFILE)
+    return {**spec, "name": ref}
+
+
+def blocked_url_patterns(profile: dict) -> List[str]:
+    patterns: List[str] = []
+    for kind in profile.get("block", []) or []:
+        if kind not in RESOURCE_PATTERNS:
+            logger.warning(f"BrowserProfile: Unknown resource type '{kind}' in profile '{profile.get('name')}'")
+            continue
+        patterns.extend(RESOURCE_PATTERNS[kind])
+    patterns.extend(profile.get("block_urls", []) or [])
+    return patterns
+
+
+def apply_profile_options(options, profile: dict):
+    """Creation-time settings: page load strategy, image prefs, extra Chrome switches."""
+    strategy = profile.get("page_load_strategy")
+    if strategy:
+        if strategy in PAGE_LOAD_STRATEGIES:
+            options.page_load_strategy = strategy
+        else:
+            logger.warning(f"BrowserProfile: Unknown page_load_strategy '{strategy}' in profile '{profile.get('name')}'")
+
+    if "images" in (profile.get("block") or []):
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        options.add_argument("--blink-settings=imagesEnabled=false")
+
+    for arg in profile.get("args", []) or []:
+        options.add_argument(arg)
+
+
+def apply_profile_session(driver, profile: dict):
+    """Session-time settings: block resource URLs through the Chrome DevTools protocol (works through Grid)."""
+    patterns = blocked_url_patterns(profile)
+    if not patterns:
+        return
+    try:
+        # webdriver.Remote talks to Chrome through ChromeRemoteConnection, which knows executeCdpCommand.
+        driver.execute("executeCdpCommand", {"cmd": "Network.enable", "params": {}})
+        driver.execute("executeCdpCommand", {"cmd": "Network.setBlockedURLs", "params": {"urls": patterns}})
+        logger.info(f"BrowserProfile: '{profile.get('name')}' blocking {len(patterns)} URL patterns")
+    except Exception as e:
+        logger.warning(f"BrowserProfile: Could not apply URL blocking for '{profile.get('name')}': {e}")
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import re
+from datetime import date
+from typing import Any, Dict, Optional
+
+from dateutil import parser
+
+_UNKNOWN = {"", "not available", "n/a", "none", "null", "unknown", "rolling", "ongoing", "tbd", "tba"}
+_MONTH = (
+    r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
+    r"Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?"
+)
+_DAY = r"(?:[1-9]|[12][0-9]|3[01])(?:st|nd|rd|th)?"
+_ISO = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_US = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b")
+_MONTH_FIRST = re.compile(rf"\b{_MONTH}\s+{_DAY},?\s+\d{{4}}\b", re.IGNORECASE)
+_DAY_FIRST = re.compile(rf"\b{_DAY}\s+{_MONTH},?\s+\d{{4}}\b", re.IGNORECASE)
+
+# Years outside this window are OCR noise or copy-paste mistakes, not deadlines.
+MIN_YEAR, MAX_YEAR = 2000, 2100
+
+
+def _valid(year: int, month: int, day: int) -> Optional[date]:
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        return None
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def parse_deadline(text: Optional[str]) -> Optional[date]:
+    """
+    First full date in a free-text deadline ("2025-09-15", "September 15th, 2025", "09/15/2025",
+    "Deadline: 15 Sept 2025"). Dates without a year, "rolling" and the like are None.
+    """
+    if text is None:
+        return None
+    text = str(text).strip()
+    if text.lower() in _UNKNOWN:
+        return None
+
+    m = _ISO.search(text)
+    if m:
+        found = _valid(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        if found:
+            return found
+
+    candidates = []
+    for pattern in (_MONTH_FIRST, _DAY_FIRST):
+        candidates.extend((m.start(), m.group(0)) for m in pattern.finditer(text))
+    for _, match in sorted(candidates):
+        normalized = re.sub(r"(\d{1,2})(st|nd|rd|th)", r"\1", match, flags=re.IGNORECASE)
+        normalized = re.sub(r"\bSept\b", "Sep", normalized, flags=re.IGNORECASE)
+        try:
+            parsed = parser.parse(normalized)
+        except (ValueError, OverflowError):
+            continue
+        found = _valid(parsed.year, parsed.month, parsed.day)
+        if found:
+            return found
+
+    m = _US.search(text)
+    if m:
+        return _valid(int(m.group(3)), int(m.group(1)), int(m.group(2)))
+    return None
+
+
+def deadline_columns(deadline: Optional[str], llm_info: Optional[dict] = None) -> Dict[str, Any]:
+    """deadline_date for a row: the scraped deadline when it parses, otherwise the LLM's."""
+    parsed = parse_deadline(deadline)
+    if parsed is None and isinstance(llm_info, dict):
+        llm_deadline = llm_info.get("deadline")
+        parsed = parse_deadline(str(llm_deadline)) if llm_deadline is not None else None
+    return {"deadline_date": parsed}
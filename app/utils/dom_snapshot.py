@@ -0,0 +1,52 @@
+from __future__ import annotations
+import logging
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+from app.utils.http_fetcher import HTML_PARSER
+
+logger = logging.getLogger(__name__)
+
+# snapshot: one page_source round trip, then parse locally with BeautifulSoup (lxml when installed).
+# live: query the browser element by element through WebDriver.
+PARSE_MODES = ("snapshot", "live")
+DEFAULT_PARSE_MODE = "snapshot"
+
+_INVISIBLE_TAGS = ("script", "style", "noscript", "template", "svg")
+
+
+def parse_mode(site_config: dict) -> str:
+    mode = str(site_config.get("parse", DEFAULT_PARSE_MODE)).strip().lower()
+    if mode not in PARSE_MODES:
+        logger.warning(f"Snapshot: Unknown parse mode '{mode}' for '{site_config.get('name')}', using '{DEFAULT_PARSE_MODE}'")
+        return DEFAULT_PARSE_MODE
+    return mode
+
+
+def page_snapshot(driver) -> BeautifulSoup:
+    """Parse the current document (or the frame the driver is switched into) in one WebDriver call."""
+    return BeautifulSoup(driver.page_source, HTML_PARSER)
+
+
+def visible_text(node, separator: str = "\n") -> str:
+    """Text of `node` without script/style content, roughly what WebElement.text returns."""
+    if node is None:
+        return ""
+    for tag in node.find_all(_INVISIBLE_TAGS):
+        tag.decompose()
+    return node.get_text(separator, strip=True)
+
+
+def select_text(node, selector: str, default: str = "") -> str:
+    if node is None:
+        return default
+    found = node.select_one(selector)
+    return found.get_text(" ", strip=True) if found is not None else default
+
+
+def select_attr(node, selector: Optional[str], attr: str) -> Optional[str]:
+    if node is None:
+        return None
+    found = node.select_one(selector) if selector else node
+    return found.get(attr) if found is not None else None
@@ -4,44 +4,73 @@ import time
 import logging
 import json
 import os
-from queue import Queue
+from collections import deque
 from selenium import webdriver
 from selenium.webdriver import ChromeOptions
 from selenium.webdriver.remote.webdriver import WebDriver
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Deque, Tuple
 from selenium.webdriver.remote.remote_connection import RemoteConnection
 from contextlib import contextmanager
+from app.utils.grid_status import GridCapacityMonitor, SELENIUM_REMOTE_URL
+from app.utils.http_fetcher import USER_AGENT
+from app.utils.browser_profiles import DEFAULT_PROFILE, apply_profile_options, apply_profile_session
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_DRIVERS = 6
+# Upper bound when sizing from the grid; more nodes joining can grow the pool up to this.
+MAX_DRIVERS_CEILING = int(os.getenv("DRIVER_POOL_MAX_DRIVERS", "12"))
+
 visited_urls_lock = threading.Lock()
 
 class DriverPool:
-    def __init__(self, min_drivers: int = 2, max_drivers: int = 6):
+    def __init__(self, min_drivers: int = 2, max_drivers: int = 6, warm_in_background: bool = False):
         self.min_drivers = min_drivers
         self.max_drivers = max_drivers
         self.active_drivers = 0
+        # Slots reserved for drivers currently being created outside the lock.
+        self.pending_drivers = 0
+        # Subset of pending_drivers created by pre-warm threads (they land in the idle queue).
+        self.warming_drivers = 0
+        self._warming_by_profile: Dict[str, int] = {}
         self.lock = threading.Lock()
-        self.drivers = Queue()
-        for _ in range(self.min_drivers):
-            driver = self._create_driver()
-            if driver:
-                self.drivers.put(driver)
-                self.active_drivers += 1
+        self.cond = threading.Condition(self.lock)
+        self.capacity_monitor: Optional[GridCapacityMonitor] = None
+        # Idle drivers; each is tagged with the name of the browser profile it was created with.
+        self.drivers: Deque[WebDriver] = deque()
+        self._waiters: Deque[Tuple[object, str]] = deque()
+        self._profiles: Dict[str, dict] = {DEFAULT_PROFILE["name"]: DEFAULT_PROFILE}
+        self._stats: Dict[str, float] = {
+            "acquired": 0,
+            "timeouts": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "created": 0,
+            "create_failures": 0,
+            "create_time_total": 0.0,
+            "create_time_max": 0.0,
+        }
+        self.prewarm(self.min_drivers)
+        if warm_in_background:
+            logger.info(f"Initialized driver pool with {self.min_drivers} min, {self.max_drivers} max drivers (warming in background)")
+            return
+
+        self.wait_until_warm(min_ready=self.min_drivers)
         logger.info(f"Initialized driver pool with {self.min_drivers} min, {self.max_drivers} max drivers")
         
         if self.active_drivers == 0:
             logger.warning("No drivers could be initialized during startup.")
 
 
-    def _create_driver(self) -> Optional[WebDriver]:
+    def _create_driver(self, profile: Optional[dict] = None) -> Optional[WebDriver]:
+        profile = profile or DEFAULT_PROFILE
         max_retries = 3
         retry_delay = 2 
         RemoteConnection.set_timeout(20) 
 
         for attempt in range(1, max_retries + 1):
             try:
-                logger.info(f"Driver Pool: Attempt {attempt}/{max_retries} - Creating Remote Chrome driver")
+                logger.info(f"Driver Pool: Attempt {attempt}/{max_retries} - Creating Remote Chrome driver (profile '{profile['name']}')")
                 options = ChromeOptions()
                 options.add_argument('--headless')
                 options.add_argument('--disable-gpu')
@@ -51,11 +80,7 @@ class DriverPool:
                 options.add_argument('--disable-infobars')
 
                 # Anti-bot fingerprinting
-                user_agent = (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                )
-                options.add_argument(f'user-agent={user_agent}')
+                options.add_argument(f'user-agent={USER_AGENT}')
                 options.add_argument('--disable-blink-features=AutomationControlled')
                 options.add_experimental_option('excludeSwitches', ['enable-automation'])
                 options.add_experimental_option('useAutomationExtension', False)
@@ -65,8 +90,11 @@ class DriverPool:
                 height = random.randint(800, 1000)
                 options.add_argument(f'--window-size={width},{height}')
 
+                # Per-site resource policy (page load strategy, blocked resources, extra switches)
+                apply_profile_options(options, profile)
+
                 driver = webdriver.Remote(
-                    command_executor='http://selenium-hub:4444/wd/hub',
+                    command_executor=SELENIUM_REMOTE_URL,
                     options=options
                 )
                 driver.set_page_load_timeout(30)
@@ -76,6 +104,8 @@ class DriverPool:
                 )
 
                 if driver.session_id and self.is_driver_healthy(driver):
+                    apply_profile_session(driver, profile)
+                    driver.browser_profile = profile["name"]
                     logger.info("Driver successfully created and session started.")
                     return driver
                 else:
@@ -103,119 +133,319 @@ class DriverPool:
 
     
     
-    def get_driver(self) -> Optional[webdriver.Chrome]:
-        start_time = time.time()
-        while time.time() - start_time < 30:
-            with self.lock:
-                driver = None
-
-                if not self.drivers.empty():
-                    driver = self.drivers.get()
-                    logger.info(f"Pulled driver from pool. Active: {self.active_drivers}, Queue: {self.drivers.qsize()}")
-                    if self.is_driver_healthy(driver):
-                        logger.info("Driver passed health check")
-                        return driver
-                    else:
-                        logger.warning("Driver Pool: Driver failed health check. Discarding.")
-                        try:
-                            driver.quit()
-                        except Exception as e:
-                            logger.warning(f"Error while quitting driver: {e}")
-                        self.active_drivers -= 1
-                        driver = None
-
-                if self.active_drivers < self.max_drivers:
-                    logger.info(f"Pool not full (Active: {self.active_drivers}/{self.max_drivers}). Creating new driver...")
-                    driver = self._create_driver()
-                    if driver:
-                        self.active_drivers += 1
-                        logger.info(f"Driver Pool: New driver created. Active drivers now: {self.active_drivers}")
-                        return driver
-                    else:
-                        logger.error("Driver Pool: Failed to create new driver")
-                else:
-                    logger.info(f"Driver Pool: Pool at capacity ({self.active_drivers}/{self.max_drivers}). Waiting...")
+    def get_driver(self, timeout: float = 30.0, profile: Optional[dict] = None) -> Optional[webdriver.Chrome]:
+        profile = profile or DEFAULT_PROFILE
+        requested_at = time.monotonic()
+        deadline = requested_at + timeout
+
+        while True:
+            slot = self._acquire_slot(deadline, profile)
+            if slot is None:
+                with self.lock:
+                    self._stats["timeouts"] += 1
+                logger.warning(f"Driver Pool: No drivers available after {timeout:.0f}s wait. Active: {self.active_drivers}, Queue: {len(self.drivers)}")
+                return None
 
-            time.sleep(0.5)
+            kind, driver = slot
+            if kind == "idle":
+                self._record_wait(time.monotonic() - requested_at)
+                logger.info(f"Pulled driver from pool. Active: {self.active_drivers}, Queue: {len(self.drivers)}")
+                if self.is_driver_healthy(driver):
+                    logger.info("Driver passed health check")
+                    return driver
 
-        logger.warning(f"Driver Pool: No drivers available after 30s wait. Active: {self.active_drivers}, Queue: {self.drivers.qsize()}")
-        return None
+                logger.warning("Driver Pool: Driver failed health check. Discarding.")
+                self._quit_driver(driver)
+                with self.cond:
+                    self.active_drivers = max(0, self.active_drivers - 1)
+                    self.cond.notify_all()
+                continue
 
+            if kind == "swap":
+                # At capacity with only other-profile sessions idle: recycle one for this profile.
+                logger.info(f"Driver Pool: Recycling an idle '{self._profile_of(driver)}' driver for profile '{profile['name']}'")
+                self._quit_driver(driver, context="profile swap")
+
+            logger.info(f"Pool not full (Active: {self.active_drivers}/{self.max_drivers}, Pending: {self.pending_drivers}). Creating new driver...")
+            driver = self._create_reserved_driver(profile=profile)
+            if driver:
+                self._record_wait(time.monotonic() - requested_at)
+                logger.info(f"Driver Pool: New driver created. Active drivers now: {self.active_drivers}")
+                return driver
+
+            logger.error("Driver Pool: Failed to create new driver")
+            if time.monotonic() >= deadline:
+                with self.lock:
+                    self._stats["timeouts"] += 1
+                return None
 
-    def release_driver(self, driver: Optional[webdriver.Chrome]):
-        with self.lock:
-            if driver is None:
-                logger.warning("Driver Pool: release_driver called with None")
-                return
 
+    def _acquire_slot(self, deadline: float, profile: dict) -> Optional[Tuple[str, Optional[WebDriver]]]:
+        """
+        Wait (FIFO) until an idle driver with the requested profile can be handed out or a
+        creation slot can be reserved. Returns ("idle", driver), ("create", None),
+        ("swap", idle_driver_to_quit) or None on timeout. Driver creation happens outside the lock.
+        """
+        ticket = object()
+        name = profile["name"]
+        self._profiles[name] = profile
+        with self.cond:
+            self._waiters.append((ticket, name))
             try:
-                session_ok = bool(getattr(driver, "session_id", None))
-                if self.is_driver_healthy(driver) and session_ok:
-                    self.drivers.put(driver)
-                    logger.debug("Driver released back to pool")
+                while True:
+                    if self._waiters[0][0] is ticket:
+                        driver = self._pop_idle(name)
+                        if driver is not None:
+                            return "idle", driver
+                        # Sessions already warming will be handed to the waiters in line;
+                        # only start another one if there are more waiters than warm-ups.
+                        waiting = sum(1 for _, n in self._waiters if n == name)
+                        if self._warming_by_profile.get(name, 0) < waiting:
+                            if self.active_drivers + self.pending_drivers < self.max_drivers:
+                                self.pending_drivers += 1
+                                return "create", None
+                            if self.drivers:
+                                # Take the slot of an idle driver built for another profile.
+                                other = self.drivers.popleft()
+                                self.active_drivers = max(0, self.active_drivers - 1)
+                                self.pending_drivers += 1
+                                return "swap", other
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self.cond.wait(remaining)
+            finally:
+                self._waiters = deque(w for w in self._waiters if w[0] is not ticket)
+                # Let the next waiter in line re-check the pool state.
+                self.cond.notify_all()
+
+
+    def _pop_idle(self, profile_name: str) -> Optional[WebDriver]:
+        for driver in self.drivers:
+            if self._profile_of(driver) == profile_name:
+                self.drivers.remove(driver)
+                return driver
+        return None
+
+
+    @staticmethod
+    def _profile_of(driver: WebDriver) -> str:
+        return getattr(driver, "browser_profile", DEFAULT_PROFILE["name"])
+
+
+    def _create_reserved_driver(self, to_idle: bool = False, profile: Optional[dict] = None) -> Optional[WebDriver]:
+        profile = profile or DEFAULT_PROFILE
+        started = time.monotonic()
+        driver = None
+        try:
+            driver = self._create_driver(profile)
+        finally:
+            elapsed = time.monotonic() - started
+            with self.cond:
+                self.pending_drivers = max(0, self.pending_drivers - 1)
+                if to_idle:
+                    self.warming_drivers = max(0, self.warming_drivers - 1)
+                    name = profile["name"]
+                    self._warming_by_profile[name] = max(0, self._warming_by_profile.get(name, 0) - 1)
+                if driver:
+                    self.active_drivers += 1
+                    if to_idle:
+                        self.drivers.append(driver)
+                    self._stats["created"] += 1
+                    self._stats["create_time_total"] += elapsed
+                    self._stats["create_time_max"] = max(self._stats["create_time_max"], elapsed)
                 else:
-                    logger.warning("Driver unhealthy on release. Discarding...")
-                    try:
-                        driver.quit()
-                    except Exception as e:
-                        if "session with ID" in str(e) or "invalid session id" in str(e).lower():
-                            logger.debug(f"Driver already invalidated during release: {e}")
-                        else:
-                            logger.warning(f"Error while quitting driver during release: {e}")
-                    finally:
-                        self.active_drivers = max(0, self.active_drivers - 1)
+                    self._stats["create_failures"] += 1
+                self.cond.notify_all()
+        return driver
+
+
+    def prewarm(self, target: int, profile: Optional[dict] = None) -> int:
+        """
+        Start creating sessions for `profile` in the background until its idle + warming
+        drivers reach `target` (capped by max_drivers). Returns the number of sessions started.
+        """
+        profile = profile or DEFAULT_PROFILE
+        name = profile["name"]
+        with self.cond:
+            self._profiles[name] = profile
+            target = min(target, self.max_drivers)
+            idle = sum(1 for d in self.drivers if self._profile_of(d) == name)
+            ready = idle + self._warming_by_profile.get(name, 0)
+            headroom = self.max_drivers - self.active_drivers - self.pending_drivers
+            to_start = max(0, min(target - ready, headroom))
+            self.pending_drivers += to_start
+            self.warming_drivers += to_start
+            self._warming_by_profile[name] = self._warming_by_profile.get(name, 0) + to_start
+
+        for _ in range(to_start):
+            threading.Thread(target=self._create_reserved_driver, kwargs={"to_idle": True, "profile": profile},
+                             name="driver-prewarm", daemon=True).start()
+        if to_start:
+            logger.info(f"Driver Pool: Pre-warming {to_start} '{name}' driver(s) (target {target}, Active: {self.active_drivers}, Idle: {len(self.drivers)})")
+        return to_start
+
+
+    def resize(self, max_drivers: int):
+        """Adjust max_drivers (e.g. to the grid's capacity). Busy drivers above a lower limit retire on release."""
+        max_drivers = max(1, int(max_drivers))
+        with self.cond:
+            if max_drivers == self.max_drivers:
+                return
+            logger.info(f"Driver Pool: Resizing max drivers {self.max_drivers} -> {max_drivers}")
+            self.max_drivers = max_drivers
+            self.min_drivers = min(self.min_drivers, max_drivers)
+            self.cond.notify_all()
 
-            except Exception as e:
-                logger.error(f"Error in release_driver: {e}")
 
-    
-    def reset_driver(self, old_driver: Optional[webdriver.Chrome]) -> Optional[webdriver.Chrome]:
+    def wait_until_warm(self, min_ready: int = 1, timeout: float = 120.0) -> bool:
+        """Block until `min_ready` idle drivers exist or no warm-ups remain in flight."""
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            while len(self.drivers) < min_ready and self.warming_drivers > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+            return len(self.drivers) >= min_ready
+
+
+    def _record_wait(self, waited: float):
         with self.lock:
-            if old_driver:
-                try:
-                    old_driver.quit()
-                except Exception as e:
-                    logger.warning(f"Failed to quit old driver: {e}")
-                finally:
-                    self.active_drivers = max(0, self.active_drivers - 1)
+            self._stats["acquired"] += 1
+            self._stats["wait_time_total"] += waited
+            self._stats["wait_time_max"] = max(self._stats["wait_time_max"], waited)
 
-            driver = self._create_driver()
-            if driver:
-                self.active_drivers += 1
-                logger.info(f"Driver successfully reset. Active: {self.active_drivers}")
-                return driver
+
+    def _quit_driver(self, driver: WebDriver, context: str = "release"):
+        try:
+            driver.quit()
+        except Exception as e:
+            if "session with ID" in str(e) or "invalid session id" in str(e).lower():
+                logger.debug(f"Driver already invalidated during {context}: {e}")
             else:
-                logger.warning("Failed to reset driver")
+                logger.warning(f"Error while quitting driver during {context}: {e}")
+
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            s = dict(self._stats)
+            s["active"] = self.active_drivers
+            s["pending"] = self.pending_drivers
+            s["warming"] = self.warming_drivers
+            s["idle"] = len(self.drivers)
+            s["waiting"] = len(self._waiters)
+        s["wait_time_avg"] = s["wait_time_total"] / s["acquired"] if s["acquired"] else 0.0
+        s["create_time_avg"] = s["create_time_total"] / s["created"] if s["created"] else 0.0
+        return s
+
+
+    def release_driver(self, driver: Optional[webdriver.Chrome]):
+        if driver is None:
+            logger.warning("Driver Pool: release_driver called with None")
+            return
+
+        try:
+            session_ok = bool(getattr(driver, "session_id", None))
+            healthy = session_ok and self.is_driver_healthy(driver)
+        except Exception as e:
+            logger.error(f"Error in release_driver: {e}")
+            healthy = False
+
+        if healthy:
+            with self.cond:
+                retire = self.active_drivers + self.pending_drivers > self.max_drivers
+                if retire:
+                    # The grid shrank below our pool size; give this slot back instead of queueing it.
+                    self.active_drivers = max(0, self.active_drivers - 1)
+                else:
+                    self.drivers.append(driver)
+                self.cond.notify_all()
+            if not retire:
+                logger.debug("Driver released back to pool")
+                return
+            logger.info("Driver Pool: Pool above grid capacity. Retiring released driver...")
+            self._quit_driver(driver)
+            return
+
+        logger.warning("Driver unhealthy on release. Discarding...")
+        try:
+            self._quit_driver(driver)
+        finally:
+            with self.cond:
+                self.active_drivers = max(0, self.active_drivers - 1)
+                self.cond.notify_all()
+
+    
+    def reset_driver(self, old_driver: Optional[webdriver.Chrome], profile: Optional[dict] = None) -> Optional[webdriver.Chrome]:
+        if profile is None and old_driver is not None:
+            profile = self._profiles.get(self._profile_of(old_driver))
+        if old_driver:
+            try:
+                old_driver.quit()
+            except Exception as e:
+                logger.warning(f"Failed to quit old driver: {e}")
+
+        with self.cond:
+            if old_driver:
+                # Hand the old driver's slot straight to its replacement.
+                self.active_drivers = max(0, self.active_drivers - 1)
+            elif self.active_drivers + self.pending_drivers >= self.max_drivers:
+                logger.warning("Failed to reset driver: pool at capacity")
                 return None
+            self.pending_drivers += 1
+
+        driver = self._create_reserved_driver(profile=profile)
+        if driver:
+            logger.info(f"Driver successfully reset. Active: {self.active_drivers}")
+            return driver
+        else:
+            logger.warning("Failed to reset driver")
+            return None
 
 
 
     def close(self):
-        with self.lock:
-            while not self.drivers.empty():
-                driver = self.drivers.get()
-                try:
-                    driver.quit()
-                except Exception as e:
-                    if "session with ID" in str(e) or "invalid session id" in str(e).lower():
-                        logger.debug(f"Driver Pool: Driver already invalidated during shutdown: {e}")
-                    else:
-                        logger.warning(f"Driver Pool: Error quitting driver during pool shutdown: {e}")
-                finally:
-                    self.active_drivers = max(0, self.active_drivers - 1)
+        if self.capacity_monitor is not None:
+            self.capacity_monitor.stop()
+            self.capacity_monitor = None
+
+        with self.cond:
+            drivers = list(self.drivers)
+            self.drivers.clear()
+            self.active_drivers = max(0, self.active_drivers - len(drivers))
+            self.cond.notify_all()
+
+        for driver in drivers:
+            self._quit_driver(driver, context="pool shutdown")
 
-            logger.info("Driver Pool: All drivers closed and pool cleared.")
+        logger.info(f"Driver Pool: All drivers closed and pool cleared. Stats: {self.stats()}")
 
 
 
 
 _driver_pool: Optional[DriverPool] = None
 
-def init_driver_pool(min_drivers: int = 2, max_drivers: int = 6):
+def init_driver_pool(min_drivers: int = 2, max_drivers: Optional[int] = None, warm_in_background: bool = False):
+    """
+    Create the global pool. When max_drivers is not given, it is sized from the Selenium
+    Grid's /status (falling back to DEFAULT_MAX_DRIVERS) and kept in sync while the pool lives.
+    """
     global _driver_pool
     if _driver_pool is None:
-        _driver_pool = DriverPool(min_drivers, max_drivers)
-        logger.info("Global driver_pool initialized")
+        monitor = None
+        if max_drivers is None:
+            monitor = GridCapacityMonitor(ceiling=MAX_DRIVERS_CEILING)
+            max_drivers = monitor.poll() or DEFAULT_MAX_DRIVERS
+
+        min_drivers = min(min_drivers, max_drivers)
+        _driver_pool = DriverPool(min_drivers, max_drivers, warm_in_background=warm_in_background)
+        if monitor is not None:
+            monitor.add_listener(_driver_pool.resize)
+            monitor.start()
+            _driver_pool.capacity_monitor = monitor
+        logger.info(f"Global driver_pool initialized (max drivers: {max_drivers})")
 
 
 def get_driver_pool() -> DriverPool:
@@ -224,23 +454,31 @@ def get_driver_pool() -> DriverPool:
     return _driver_pool
 
 
+def close_driver_pool():
+    global _driver_pool
+    if _driver_pool is not None:
+        _driver_pool.close()
+        _driver_pool = None
+
+
 @contextmanager
-def borrow_driver(max_attempts: int = 3, backoff: float = 1.0):
+def borrow_driver(max_attempts: int = 3, backoff: float = 1.0, profile: Optional[dict] = None):
     pool = get_driver_pool()
     driver = None
     try:
         for attempt in range(1, max_attempts + 1):
-            driver = pool.get_driver()
+            driver = pool.get_driver(profile=profile)
             if driver is None:
                 logger.warning("borrow_driver: no driver available; retrying...")
                 time.sleep(backoff * attempt)
+                continue
 
             if pool.is_driver_healthy(driver):
                 break
 
             logger.warning("borrow_driver: got an unhealthy driver; recycling and retrying...")
             try:
-                pool.reset_driver(driver)
+                pool.reset_driver(driver, profile=profile)
             except Exception:
                 logger.exception("borrow_driver: failed to reset driver")
             driver = None
@@ -259,17 +497,17 @@ def borrow_driver(max_attempts: int = 3, backoff: float = 1.0):
 
 def check_driver_pool_integrity(pool: DriverPool):
     with pool.lock:
-        queue_size = pool.drivers.qsize()
+        queue_size = len(pool.drivers)
         active = pool.active_drivers
         total_estimated = queue_size 
 
-        all_queued = list(pool.drivers.queue)
+        all_queued = list(pool.drivers)
 
         for i, driver in enumerate(all_queued):
             if not pool.is_driver_healthy(driver):
                 logger.warning(f"Driver #{i} in queue is unhealthy!")
 
-        logger.info(f"Integrity check → Active: {active}, Queue Size: {queue_size}")
+        logger.info(f"Integrity check → Active: {active}, Queue Size: {queue_size}, Pending: {pool.pending_drivers}")
 
         if active < 0:
             logger.error("Driver Pool: ERROR: active_drivers is negative!")
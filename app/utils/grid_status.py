@@ -0,0 +1,118 @@
+from __future__ import annotations
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+SELENIUM_REMOTE_URL = os.getenv("SELENIUM_REMOTE_URL", "http://selenium-hub:4444/wd/hub")
+GRID_STATUS_POLL_SECONDS = float(os.getenv("GRID_STATUS_POLL_SECONDS", "30"))
+
+
+@dataclass
+class GridCapacity:
+    ready: bool
+    nodes: int
+    total_slots: int
+    free_slots: int
+
+
+def status_url_for(remote_url: str = SELENIUM_REMOTE_URL) -> str:
+    """http://selenium-hub:4444/wd/hub -> http://selenium-hub:4444/status"""
+    parts = urlsplit(remote_url)
+    path = parts.path.rstrip("/")
+    if path.endswith("/wd/hub"):
+        path = path[: -len("/wd/hub")]
+    return urlunsplit((parts.scheme, parts.netloc, f"{path}/status", "", ""))
+
+
+def parse_grid_status(payload: dict) -> GridCapacity:
+    value = (payload or {}).get("value", {}) or {}
+    nodes = [n for n in (value.get("nodes") or []) if str(n.get("availability", "UP")).upper() == "UP"]
+
+    total = 0
+    free = 0
+    for node in nodes:
+        slots = node.get("slots") or []
+        max_sessions = int(node.get("maxSessions", 0) or 0)
+        # A node advertises one slot per browser stereotype, but runs at most maxSessions at once.
+        node_total = min(len(slots), max_sessions) if slots and max_sessions else (len(slots) or max_sessions)
+        busy = sum(1 for slot in slots if slot.get("session"))
+        total += node_total
+        free += max(0, node_total - busy)
+
+    return GridCapacity(ready=bool(value.get("ready", False)), nodes=len(nodes), total_slots=total, free_slots=free)
+
+
+def fetch_grid_capacity(status_url: Optional[str] = None, timeout: float = 5.0) -> Optional[GridCapacity]:
+    url = status_url or status_url_for()
+    try:
+        resp = requests.get(url, timeout=timeout)
+        resp.raise_for_status()
+        capacity = parse_grid_status(resp.json())
+        logger.info(f"Grid: {capacity.nodes} node(s), {capacity.free_slots}/{capacity.total_slots} free slots (ready={capacity.ready})")
+        return capacity
+    except Exception as e:
+        logger.warning(f"Grid: Could not read capacity from {url}: {e}")
+        return None
+
+
+class GridCapacityMonitor:
+    """
+    Polls the hub's /status and reports the usable session capacity (bounded by `ceiling`)
+    to its listeners whenever it changes, e.g. when nodes join or leave mid-run.
+    """
+
+    def __init__(self, status_url: Optional[str] = None, interval: float = GRID_STATUS_POLL_SECONDS, ceiling: Optional[int] = None):
+        self.status_url = status_url or status_url_for()
+        self.interval = interval
+        self.ceiling = ceiling
+        self.capacity: Optional[int] = None
+        self._listeners: List[Callable[[int], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: Callable[[int], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[int], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def poll(self) -> Optional[int]:
+        status = fetch_grid_capacity(self.status_url)
+        if status is None or status.total_slots <= 0:
+            return self.capacity
+
+        capacity = status.total_slots if self.ceiling is None else min(status.total_slots, self.ceiling)
+        if capacity != self.capacity:
+            logger.info(f"Grid: Session capacity changed {self.capacity} -> {capacity}")
+            self.capacity = capacity
+            for listener in list(self._listeners):
+                try:
+                    listener(capacity)
+                except Exception:
+                    logger.exception("Grid: capacity listener failed")
+        return self.capacity
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="grid-capacity", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+from dateutil import parser
+
+from app.utils.run_state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+HIGH_WATER_STATE = "high_water_marks"
+_marks_lock = threading.Lock()
+
+
+class HighWaterMark:
+    """
+    Newest post (URL + publish time) a site has fully ingested. Feeds that list posts
+    newest-first can stop as soon as they reach it. With `full=True` the stored mark is
+    ignored for this run (complete recrawl) but a new one is still recorded. A post that
+    failed holds the mark below it, so the next run crawls back to it and retries.
+    """
+
+    def __init__(self, site_name: str, full: bool = False):
+        self.site_name = site_name
+        stored = (load_state(HIGH_WATER_STATE, {}) or {}).get(site_name)
+        self.mark: Optional[dict] = None if full else stored
+        self._mark_at = self._parse(self.mark.get("published_at")) if self.mark else None
+        self._observed: list[tuple[datetime, dict]] = []
+        self._oldest_failed_at: Optional[datetime] = None
+        self._failed_unplaced = False
+        # Only a crawl that got all the way back to the old mark (or the feed's end) may move it.
+        self.completed = False
+        if self.mark:
+            logger.info(f"HighWaterMark: '{site_name}' resumes after {self.mark.get('url')} ({self.mark.get('published_at')})")
+
+    def reached(self, url: str, published_at: datetime) -> bool:
+        if not self.mark:
+            return False
+        if url == self.mark.get("url"):
+            return True
+        return self._mark_at is not None and self._comparable(published_at) < self._comparable(self._mark_at)
+
+    def observe(self, url: str, published_at: datetime):
+        """Record a post as handled; the newest one older than any failure becomes the next mark on commit()."""
+        self._observed.append((published_at, {"url": url, "published_at": published_at.isoformat()}))
+
+    def fail(self, published_at: Optional[datetime] = None):
+        """Record a post that was not handled. Without a publish time the mark cannot move at all."""
+        if published_at is None:
+            self._failed_unplaced = True
+        elif self._oldest_failed_at is None or self._comparable(published_at) < self._comparable(self._oldest_failed_at):
+            self._oldest_failed_at = published_at
+
+    def _next_mark(self) -> Optional[tuple[datetime, dict]]:
+        if self._failed_unplaced:
+            return None
+        candidates = [
+            (at, mark) for at, mark in self._observed
+            if self._oldest_failed_at is None or self._comparable(at) < self._comparable(self._oldest_failed_at)
+        ]
+        return max(candidates, key=lambda c: self._comparable(c[0]), default=None)
+
+    def crawl_complete(self):
+        self.completed = True
+
+    def commit(self):
+        if not self._observed:
+            return
+        if not self.completed:
+            logger.info(f"HighWaterMark: '{self.site_name}' crawl stopped early; keeping the previous mark.")
+            return
+        nxt = self._next_mark()
+        if nxt is None:
+            logger.info(f"HighWaterMark: '{self.site_name}' has failed posts; keeping the previous mark.")
+            return
+        newest_at, newest = nxt
+        if self._mark_at is not None and self._comparable(newest_at) <= self._comparable(self._mark_at):
+            return
+        with _marks_lock:
+            marks = load_state(HIGH_WATER_STATE, {}) or {}
+            marks[self.site_name] = newest
+            save_state(HIGH_WATER_STATE, marks)
+        logger.info(f"HighWaterMark: '{self.site_name}' advanced to {newest['url']} ({newest['published_at']})")
+
+    @staticmethod
+    def _parse(value: Optional[str]) -> Optional[datetime]:
+        try:
+            return parser.parse(value) if value else None
+        except (ValueError, OverflowError):
+            return None
+
+    @staticmethod
+    def _comparable(dt: datetime) -> datetime:
+        # Compare naive and aware timestamps on the same footing.
+        return dt.replace(tzinfo=None)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+import importlib.util
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RENDER_MODES = ("static", "browser", "auto")
+DEFAULT_RENDER_MODE = "browser"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# lxml is much faster but optional; html.parser ships with Python.
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+@dataclass
+class StaticPage:
+    url: str
+    status: int
+    html: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    _soup: Optional[BeautifulSoup] = field(default=None, repr=False)
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, HTML_PARSER)
+        return self._soup
+
+
+def get_http_session() -> requests.Session:
+    """Shared keep-alive session; safe to use from the scraper threads."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=("GET", "HEAD"))
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            })
+            _session = session
+        return _session
+
+
+def fetch_static(url: str, timeout: float = 15.0, cache=None) -> Optional[StaticPage]:
+    """
+    GET a page over the shared session. With a PageCache, the request is conditional
+    (ETag / Last-Modified) and a 304 comes back as a StaticPage with not_modified=True.
+    """
+    headers = cache.conditional_headers(url) if cache is not None else None
+    try:
+        resp = get_http_session().get(url, timeout=timeout, headers=headers)
+    except requests.RequestException as e:
+        logger.warning(f"Fetcher: GET {url} failed: {e}")
+        return None
+
+    if cache is not None and resp.status_code < 400:
+        cache.record_response(url, resp.status_code, resp.headers)
+
+    if resp.status_code >= 400:
+        logger.warning(f"Fetcher: GET {url} returned HTTP {resp.status_code}")
+        return None
+
+    return StaticPage(url=resp.url, status=resp.status_code, html=resp.text, headers=dict(resp.headers))
+
+
+def render_mode(site_config: dict) -> str:
+    mode = str(site_config.get("render", DEFAULT_RENDER_MODE)).strip().lower()
+    if mode not in RENDER_MODES:
+        logger.warning(f"Fetcher: Unknown render mode '{mode}' for '{site_config.get('name')}', using '{DEFAULT_RENDER_MODE}'")
+        return DEFAULT_RENDER_MODE
+    return mode
@@ -0,0 +1,103 @@
+from __future__ import annotations
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Set
+from urllib.parse import urlsplit, urlunsplit
+
+from sqlalchemy import select
+
+from app.db.database import SessionLocal
+from app.db.models import Opportunity
+from app.utils.run_state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+# Detail URLs whose result was stored under a different URL (apply link, image link) are
+# remembered in scraper state; entries not seen again for this long are dropped.
+KNOWN_URL_RETENTION_DAYS = 365
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit((url or "").strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+class KnownUrls:
+    """
+    URLs a source has already produced, so scrapers can skip detail pages ingested in earlier
+    runs. Built once per site run from `opportunities.url` for the source plus the detail URLs
+    recorded by previous runs. New detail URLs are staged and persisted by commit(), which the
+    runner calls after the site's results have been saved.
+    """
+
+    def __init__(self, site_name: str, urls: Iterable[str], detail_urls: Optional[Dict[str, str]] = None):
+        self.site_name = site_name
+        self._state_name = f"known_urls_{site_name}"
+        self._detail_urls: Dict[str, str] = dict(detail_urls or {})
+        self._urls: Set[str] = {normalize_url(u) for u in urls if u}
+        self._urls.update(self._detail_urls)
+        self._staged: Set[str] = set()
+        self._lock = threading.Lock()
+        self.skipped = 0
+
+    @classmethod
+    def load(cls, site_name: str, source: str) -> "KnownUrls":
+        with SessionLocal() as db:
+            urls = db.execute(select(Opportunity.url).where(Opportunity.source == source)).scalars().all()
+        detail_urls = load_state(f"known_urls_{site_name}", {}) or {}
+        known = cls(site_name, urls, detail_urls)
+        logger.info(f"KnownUrls: '{site_name}' starts with {len(known)} known URLs ({len(urls)} stored, {len(detail_urls)} detail pages)")
+        return known
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __contains__(self, url: str) -> bool:
+        return normalize_url(url) in self._urls
+
+    def seen(self, url: str) -> bool:
+        """True (and counted as a skip) when `url` was already ingested."""
+        key = normalize_url(url) if url else ""
+        if key and key in self._urls:
+            with self._lock:
+                self.skipped += 1
+                if key in self._detail_urls:
+                    # Keep remembered detail pages alive while the listing still shows them.
+                    self._staged.add(key)
+            return True
+        return False
+
+    def add(self, url: str):
+        """Record a visited detail URL; persisted on commit()."""
+        if not url:
+            return
+        key = normalize_url(url)
+        with self._lock:
+            self._urls.add(key)
+            self._staged.add(key)
+
+    def commit(self):
+        now = datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=KNOWN_URL_RETENTION_DAYS)).isoformat()
+        with self._lock:
+            for key in self._staged:
+                self._detail_urls[key] = now.isoformat()
+            self._staged.clear()
+            self._detail_urls = {k: v for k, v in self._detail_urls.items() if v >= cutoff}
+            entries = dict(self._detail_urls)
+        try:
+            save_state(self._state_name, entries)
+        except Exception as e:
+            logger.warning(f"KnownUrls: Failed to save detail URLs for '{self.site_name}': {e}")
+
+
+def get_known_urls(site_name: str, site_config: dict) -> Optional[KnownUrls]:
+    if not site_config.get("known_url_filter", True) or site_config.get("full"):
+        return None
+    try:
+        return KnownUrls.load(site_name, site_config["url"])
+    except Exception as e:
+        logger.warning(f"KnownUrls: Could not load known URLs for '{site_name}'; visiting every page: {e}")
+        return None
@@ -0,0 +1,100 @@
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", "2"))
+# A request slower than this multiple of the best recent latency means the server is queueing.
+LLM_LATENCY_TOLERANCE = float(os.getenv("LLM_LATENCY_TOLERANCE", "2.0"))
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for calls to one server. Each fast success grows the limit by 1/limit
+    (about +1 per window of requests); a slow success (latency above tolerance x baseline) or an
+    overload signal (429/5xx/timeout) multiplies it down, at most once per window so one burst of
+    failures does not collapse it to the minimum.
+    """
+
+    def __init__(self, minimum: int = LLM_MIN_CONCURRENCY, maximum: int = LLM_MAX_CONCURRENCY,
+                 initial: int = LLM_INITIAL_CONCURRENCY, tolerance: float = LLM_LATENCY_TOLERANCE,
+                 backoff: float = 0.7, overload_backoff: float = 0.5):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.overload_backoff = overload_backoff
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self._last_decrease = 0.0
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def _condition(self) -> asyncio.Condition:
+        # Bound to the running loop: each asyncio.run() (one per LLM job) gets a fresh condition, and
+        # slots held on a previous, finished loop are dropped. The learned limit and baseline carry over.
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._cond
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
+    def on_success(self, latency: float):
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            # Drift the baseline up slowly so a permanently slower model/prompt mix is not read as overload forever.
+            self.baseline = 0.95 * self.baseline + 0.05 * latency
+
+        if latency > self.baseline * self.tolerance:
+            self._decrease(self.backoff, f"latency {latency:.1f}s > {self.tolerance}x baseline {self.baseline:.1f}s")
+        elif self.in_flight >= int(self.limit):
+            # Only grow when the current limit is actually in use (the caller still holds its slot;
+            # release() afterwards wakes any waiter a higher limit lets in).
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_overload(self, reason: str):
+        self._decrease(self.overload_backoff, reason)
+
+    def _decrease(self, factor: float, reason: str):
+        now = time.monotonic()
+        window = (self.baseline or 1.0) * self.tolerance
+        if now - self._last_decrease < window:
+            return
+        self._last_decrease = now
+        before = self.limit
+        self.limit = max(float(self.minimum), self.limit * factor)
+        logger.info(f"LLM Limiter: Concurrency {before:.1f} -> {self.limit:.1f} ({reason})")
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "baseline_s": round(self.baseline, 2) if self.baseline else None,
+        }
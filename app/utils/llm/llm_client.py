@@ -1,25 +1,126 @@
+import asyncio
 import logging
 import re
 import textwrap
 import time
 from typing import List, Optional
-import requests
+import httpx
 import json
 import os
 from datetime import date
+from functools import lru_cache
 
-from app.utils.rag.config import get_caps
+from app.db.llm_cache import LLMCache, prompt_fingerprint
+from app.utils.llm.adaptive_limit import AdaptiveLimiter
+from app.utils.llm.structured import GRANT_ANALYSIS_SCHEMA, GenerateStreamCollector
+from app.utils.rag.config import get_caps, get_prompt_version
 
 
 
 logger = logging.getLogger(__name__)
 
+# Constrain generation to GRANT_ANALYSIS_SCHEMA via Ollama's `format`, and stream so reading stops at the closing brace.
+LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() in {"1", "true", "yes"}
+LLM_STREAM = os.getenv("LLM_STREAM", "true").lower() in {"1", "true", "yes"}
+# How long Ollama keeps the model (and its evaluated system prefix) loaded after the last request.
+LLM_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "30m")
+
+
+@lru_cache(maxsize=4)
+def _system_prompt(mission: str) -> str:
+    """Fixed instructions shared by every grant-analysis request; byte-identical across calls (and clients) for a given mission."""
+    system = textwrap.dedent(f"""
+                    You are analyzing a grant opportunity for two organizations. The following detail is important to determine if the grant is relevant for either of the organizations and to extract the funding amount.
+                    Use the following organizational contexts for SAFAC and Riyaaz Qawwali to inform your decision:
+                    Mission for SAFAC and Riyaaz Qawwali:
+                        \"\"\"
+                        {mission.strip()}
+                        \"\"\"
+                    Each request gives the matched keywords, org policy context, retrieved feedback examples, today's date and the Grant Text.
+
+                    Your tasks:
+                     1. Determine if the grant is relevant for any of the two organizations (SAFAC or Riyaaz Qawwali or both). Please pay close attention to the title of the grant that can also reveal the details or location.
+                     Also, pay close attention to the description and deadline. 
+
+                    Important exclusions:
+                    - If the opportunity is a residency (e.g., artist residency), set is_relevant to false and explain that it is a residency and strictly do not mark it relevant.
+                    - If the opportunity is a course, class, or workshop, set is_relevant to false and explain that it is a course.
+                    - If the opportunity is related to emergency assistance or relief (e.g., emergency grants), set is_relevant to false and explain that it is emergency-related.
+                    - If the grant is age-restricted to under 35 (example 18–24 age group), set is_relevant to false and explain the age restriction. Age limits above 35 are acceptable.
+                    - Visual arts are not relevant unless explicitly include filmmaking/video and photography grants are never relevant.
+
+                    If the grant is not relevant, do not attempt to extract award_amount, deadline, or priority_score. Just set is_relevant to false and include the reason in the explanation field.
+
+
+                    2.  Extract every amount of funding from the Grant Text. The amount may appear in any of these formats:
+                        With a dollar sign (e.g., $1,000, $1000, $10,000)
+
+                        With the word "dollars" or "USD" after the number (e.g., 1000 dollars, 1200 USD)
+
+                        As a plain number clearly describing a funding limit or amount (e.g., up to 1000, maximum 2500)
+
+                        As written out words describing an amount (e.g., "five hundred dollars", "ten thousand USD")
+
+                    3. Evaluate and return a JSON with the following fields:
+                    - is_relevant: true or false only strictly cannot be none or anything else
+                    - location_applicable: true or false
+                    - award_amount: string or null
+                    - deadline: string or null
+                    - explanation: short justification
+
+                    4. Additionally, return:
+                    - priority_score: integer from 0 to 100 based on:
+                        - Deadline proximity (closer is higher priority)
+                        - Larger funding amounts increase priority
+                        - More number of awards increases priority
+                        - Relevance based on:
+                            - General relevance (adds points)
+                            - If it targets music or visual arts with filmmaking: +points
+                            - If it targets civic engagement or community building: +points
+                            - If it targets Texas: +points
+                            - If it targets Houston: +more points
+                            - If it in any way targets South-East Asian or Indian artists/art forms or music: +more points
+
+                    - possibility: one of ["Poor", "Decent", "Fair", "Excellent"] based on:
+                        - Relevance to mission
+                        - Number of awards
+                        - Specific targeting (see above list)
+                        - If there is only one award and it targets unrelated demographics/geography, mark as "Poor"
+                        - More awards + highly targeted grants = "Excellent"
+                        - If it is generic such as "general operating support" or "general music grants", mark as "Decent" or "Fair" based on funding amount and deadline proximity
+
+                    Only respond with valid JSON like this:
+                    {{
+                    "is_relevant": true,
+                    "location_applicable": true,
+                    "award_amount": "$5000",
+                    "deadline": "2025-09-15",
+                    "explanation": "The grant is not relevant as it focuses on Photography, which does not align with Riyaaz Qawwali's or SAFAC's mission. ",
+                    "priority_score": 87,
+                    "possibility": "Fair"
+                    }}
+
+                    Respond only with valid JSON and make sure to return all JSON values cleanly. Do not double-quote or single-quote inside string values. Also strictly NO COMMENTS (like // or /* ... */) inside the JSON.
+                    Also make sure you make very sincere attempt to extract the funding amount, deadline, and relevance of the grant based on the provided context. Leave fields null if data is unavailable. 
+                    Be especially careful to strictly avoid misinterpreting residencies or courses as grants. Photography grants are not relevant. Visual arts grants are not relevant unless they specifically mention filmmaking or video production. Film making grants are relevant and even more relevant if targeted towards artists or musicians or Asians/Southeast Asians.
+                    Civic engagement and community-building grants are relevant.
+                """.strip())
+    return system
+
+
 class LLMClient:
     
-    def __init__(self, base_url=None, model="mistral", max_retries=3):
+    def __init__(self, base_url=None, model="mistral", max_retries=3, timeout=300,
+                 structured=LLM_STRUCTURED_OUTPUT, stream=LLM_STREAM):
         self.base_url = base_url or os.getenv("LLM_BASE_URL", "http://host.docker.internal:11434") 
         self.model = model
         self.max_retries = max_retries
+        self.timeout = timeout
+        self.structured = structured
+        self.stream = stream
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self.limiter = AdaptiveLimiter()
+        self.cache = LLMCache()
     
 
     def _strip_json_comments_and_crop(self, s: str) -> str:
@@ -134,39 +235,134 @@ class LLMClient:
 
 
 
-    def analyze_grant(self, grant_text: str, mission: str, matched_keywords: list[str], feedback_examples: list[dict] | None = None,  org_context: list[dict] | None = None) -> dict:
+    def _generate_payload(self, prompt: str, system: str) -> dict:
+        payload = {
+            "model": self.model,
+            "system": system,
+            "prompt": prompt,
+            "stream": self.stream,
+            "keep_alive": LLM_KEEP_ALIVE,
+        }
+        if self.structured:
+            payload["format"] = GRANT_ANALYSIS_SCHEMA
+        return payload
+
+    def _retry_wait(self, attempt: int, error: Exception) -> int:
+        # A malformed answer is not a sign of an overloaded server: regenerate right away.
+        return 0 if isinstance(error, ValueError) else 2 ** attempt
+
+    def _cache_key(self, prompt: str, system: str) -> str:
+        return prompt_fingerprint(self.model, get_prompt_version(), f"{system}\0{prompt}")
+
+    def _generate_stats(self, raw: dict) -> dict:
+        """Token counts and wall time Ollama reports with a /api/generate response."""
+        total_ns = raw.get("total_duration")
+        return {
+            "prompt_tokens": raw.get("prompt_eval_count"),
+            "completion_tokens": raw.get("eval_count"),
+            "duration_ms": int(total_ns / 1_000_000) if total_ns else None,
+        }
+
+    def _parse_generate_response(self, raw: dict) -> dict:
+        try:
+            clean_json = self._strip_json_comments_and_crop(raw.get("response", ""))
+            return json.loads(clean_json)
+        except (json.JSONDecodeError, KeyError) as parse_err:
+            raise ValueError(f"Invalid or malformed JSON from LLM:\n{raw.get('response', '')}") from parse_err
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=self.limiter.maximum,
+                    max_keepalive_connections=self.limiter.maximum,
+                    keepalive_expiry=120,
+                ),
+            )
+        return self._async_client
+
+    async def warm_up_async(self, mission: str) -> bool:
+        """
+        Load the model with keep_alive and evaluate the shared system prompt once (one output token),
+        so the first grants of a job do not pay for model load and prefix evaluation.
+        """
+        started = time.monotonic()
+        try:
+            response = await self._get_async_client().post("/api/generate", json={
+                "model": self.model,
+                "system": _system_prompt(mission),
+                "prompt": "Reply with {}.",
+                "stream": False,
+                "keep_alive": LLM_KEEP_ALIVE,
+                "options": {"num_predict": 1},
+            })
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"LLM warm-up failed, continuing cold: {e}")
+            return False
+        stats = self._generate_stats(response.json())
+        logger.info(f"LLM warm-up: {self.model} ready in {time.monotonic() - started:.1f}s (system prefix {stats['prompt_tokens']} tokens)")
+        return True
+
+    async def aclose(self):
+        """Close the pooled async connections; call before the event loop that used them ends."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    async def analyze_grant_async(self, grant_text: str, mission: str, matched_keywords: list[str], feedback_examples: list[dict] | None = None, org_context: list[dict] | None = None) -> dict:
+        """
+        Analyze one grant over pooled keep-alive connections. Each call holds a slot of the adaptive
+        limiter while the request is in flight and reports latency / overload back to it.
+        """
+        system = _system_prompt(mission)
         prompt = self._build_prompt(grant_text, mission, matched_keywords, feedback_examples, org_context)
+        key = self._cache_key(prompt, system)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return cached
+        client = self._get_async_client()
         attempt = 0
 
-        while attempt < self.max_retries:
-            try:
-                response = requests.post(
-                    f"{self.base_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False
-                    },
-                    timeout=300
-                )
-                response.raise_for_status()
-
-               
-                raw = response.json()
+        while True:
+            error: Optional[Exception] = None
+            async with self.limiter:
+                started = time.monotonic()
                 try:
-                    clean_json = self._strip_json_comments_and_crop(raw.get("response", ""))
-                    return json.loads(clean_json)
-                except (json.JSONDecodeError, KeyError) as parse_err:
-                    raise ValueError(f"Invalid or malformed JSON from LLM:\n{raw.get('response', '')}") from parse_err
+                    async with client.stream("POST", "/api/generate", json=self._generate_payload(prompt, system)) as response:
+                        if response.status_code == 429 or response.status_code >= 500:
+                            self.limiter.on_overload(f"HTTP {response.status_code}")
+                        response.raise_for_status()
+                        if self.stream:
+                            collector = GenerateStreamCollector()
+                            async for line in response.aiter_lines():
+                                if collector.add_line(line):
+                                    break
+                            raw = collector.raw()
+                        else:
+                            raw = json.loads(await response.aread())
+                    self.limiter.on_success(time.monotonic() - started)
+                    result = self._parse_generate_response(raw)
+                except httpx.TimeoutException as e:
+                    self.limiter.on_overload("timeout")
+                    error = e
+                except (httpx.HTTPError, ValueError) as e:
+                    error = e
+            if error is None:
+                break
+
+            attempt += 1
+            if attempt >= self.max_retries:
+                logger.error(f" Failed to get valid response from LLM after {self.max_retries} attempts.")
+                raise RuntimeError(f"LLM request failed: {error}")
+            wait_time = self._retry_wait(attempt, error)
+            logger.warning(f"Retry {attempt}/{self.max_retries} after error: {error}. Waiting {wait_time}s...")
+            await asyncio.sleep(wait_time)
 
-            except (requests.RequestException, ValueError) as e:
-                attempt += 1
-                if attempt >= self.max_retries:
-                    logger.error(f" Failed to get valid response from LLM after {self.max_retries} attempts.")  
-                    raise RuntimeError(f"LLM request failed: {e}")
-                wait_time = 2 ** attempt
-                logger.warning(f"Retry {attempt}/{self.max_retries} after error: {e}. Waiting {wait_time}s...")  
-                time.sleep(wait_time)
+        await asyncio.to_thread(self.cache.put, key, self.model, get_prompt_version(), result, self._generate_stats(raw))
+        return result
 
 
     def _build_prompt(self, grant_text: str, mission: str, matched_keywords: List[str], feedback_examples: Optional[List[dict]] = None, org_context: Optional[List[dict]] = None) -> str:
@@ -226,13 +422,9 @@ class LLMClient:
        
 
 
+        # Per-grant suffix only; the fixed instructions go in the system prompt (see _system_prompt)
+        # so the server can reuse their evaluated prefix across grants instead of re-reading ~1k tokens each time.
         prompt = textwrap.dedent(f"""
-                    You are analyzing a grant opportunity for two organizations. The following detail is important to determine if the grant is relevant for either of the organizations and to extract the funding amount.
-                    Use the following organizational contexts for SAFAC and Riyaaz Qawwali to inform your decision:
-                    Mission for SAFAC and Riyaaz Qawwali:
-                        \"\"\"
-                        {mission.strip()}
-                        \"\"\"
                     {kw_line}
                     {org_section if org_section else ""}
                     {examples_section if examples_section else ""}
@@ -244,71 +436,6 @@ class LLMClient:
                         {grant_text}
                         \"\"\"
 
-                    Your tasks:
-                     1. Determine if the grant is relevant for any of the two organizations (SAFAC or Riyaaz Qawwali or both). Please pay close attention to the title of the grant that can also reveal the details or location.
-                     Also, pay close attention to the description and deadline. 
-
-                    Important exclusions:
-                    - If the opportunity is a residency (e.g., artist residency), set is_relevant to false and explain that it is a residency and strictly do not mark it relevant.
-                    - If the opportunity is a course, class, or workshop, set is_relevant to false and explain that it is a course.
-                    - If the opportunity is related to emergency assistance or relief (e.g., emergency grants), set is_relevant to false and explain that it is emergency-related.
-                    - If the grant is age-restricted to under 35 (example 18–24 age group), set is_relevant to false and explain the age restriction. Age limits above 35 are acceptable.
-                    - Visual arts are not relevant unless explicitly include filmmaking/video and photography grants are never relevant.
-
-                    If the grant is not relevant, do not attempt to extract award_amount, deadline, or priority_score. Just set is_relevant to false and include the reason in the explanation field.
-
-
-                    2.  Extract every amount of funding from the Grant Text. The amount may appear in any of these formats:
-                        With a dollar sign (e.g., $1,000, $1000, $10,000)
-
-                        With the word "dollars" or "USD" after the number (e.g., 1000 dollars, 1200 USD)
-
-                        As a plain number clearly describing a funding limit or amount (e.g., up to 1000, maximum 2500)
-
-                        As written out words describing an amount (e.g., "five hundred dollars", "ten thousand USD")
-
-                    3. Evaluate and return a JSON with the following fields:
-                    - is_relevant: true or false only strictly cannot be none or anything else
-                    - location_applicable: true or false
-                    - award_amount: string or null
-                    - deadline: string or null
-                    - explanation: short justification
-
-                    4. Additionally, return:
-                    - priority_score: integer from 0 to 100 based on:
-                        - Deadline proximity (closer is higher priority)
-                        - Larger funding amounts increase priority
-                        - More number of awards increases priority
-                        - Relevance based on:
-                            - General relevance (adds points)
-                            - If it targets music or visual arts with filmmaking: +points
-                            - If it targets civic engagement or community building: +points
-                            - If it targets Texas: +points
-                            - If it targets Houston: +more points
-                            - If it in any way targets South-East Asian or Indian artists/art forms or music: +more points
-
-                    - possibility: one of ["Poor", "Decent", "Fair", "Excellent"] based on:
-                        - Relevance to mission
-                        - Number of awards
-                        - Specific targeting (see above list)
-                        - If there is only one award and it targets unrelated demographics/geography, mark as "Poor"
-                        - More awards + highly targeted grants = "Excellent"
-                        - If it is generic such as "general operating support" or "general music grants", mark as "Decent" or "Fair" based on funding amount and deadline proximity
-
-                    Only respond with valid JSON like this:
-                    {{
-                    "is_relevant": true,
-                    "location_applicable": true,
-                    "award_amount": "$5000",
-                    "deadline": "2025-09-15",
-                    "explanation": "The grant is not relevant as it focuses on Photography, which does not align with Riyaaz Qawwali's or SAFAC's mission. ",
-                    "priority_score": 87,
-                    "possibility": "Fair"
-                    }}
-
-                    Respond only with valid JSON and make sure to return all JSON values cleanly. Do not double-quote or single-quote inside string values. Also strictly NO COMMENTS (like // or /* ... */) inside the JSON.
-                    Also make sure you make very sincere attempt to extract the funding amount, deadline, and relevance of the grant based on the provided context. Leave fields null if data is unavailable. 
-                    Be especially careful to strictly avoid misinterpreting residencies or courses as grants. Photography grants are not relevant. Visual arts grants are not relevant unless they specifically mention filmmaking or video production. Film making grants are relevant and even more relevant if targeted towards artists or musicians or Asians/Southeast Asians.
-                    Civic engagement and community-building grants are relevant.
+                    Analyze the Grant Text above as instructed and respond only with the JSON object.
                     """.strip())
         return prompt
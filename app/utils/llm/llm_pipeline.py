@@ -1,4 +1,6 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from app.db.update_opportunity import update_opportunity
@@ -10,6 +12,9 @@ import logging
 from app.utils.rag.config import get_prompt_text, get_retrieval_knobs
 from app.utils.rag.keyword_matcher import match_keywords
 from app.org_kb.retrieval import retrieve_org_context
+from app.utils.amounts import amount_columns
+from app.utils.deadlines import deadline_columns
+from app.utils.llm.relevance_gate import GateDecision, RelevanceGate, gate_llm_info, load_relevance_gate, score_opportunities
 
 
 logger = logging.getLogger(__name__)
@@ -33,41 +38,80 @@ def build_grant_text(opportunity: Opportunity) -> str:
 
 
 
-def process_single_grant(opportunity: Opportunity) -> tuple | None:
-    try:
-        text = build_grant_text(opportunity)
-        
-        mission = get_prompt_text()
-        knobs = get_retrieval_knobs()
-        feedback_k = int(knobs.get("feedback_k", 3))
-        matched_keywords = match_keywords(text, max_terms=4)
-        org_context = retrieve_org_context(text) 
-        
-        with SessionLocal() as db:
-            examples = retrieve_feedback_examples(db, text, k=feedback_k)
-        
-        llm_info = llm_client.analyze_grant(
-            grant_text=text,
-            mission=mission,
-            matched_keywords=matched_keywords,
-            feedback_examples=examples,
-            org_context=org_context,   
-        )
-        
-        with SessionLocal() as db, db.begin():
-            ok = update_opportunity(db, opportunity.unique_key, {
-                    "llm_info": llm_info,
-                    "is_relevant": llm_info.get("is_relevant"),
-                })
-            if not ok:
-                raise RuntimeError("DB update failed")
+def prepare_grant_request(opportunity: Opportunity) -> dict:
+    """Everything analyze_grant_async needs (keyword match, org KB and feedback retrieval): CPU and DB work, no LLM."""
+    text = build_grant_text(opportunity)
+
+    mission = get_prompt_text()
+    knobs = get_retrieval_knobs()
+    feedback_k = int(knobs.get("feedback_k", 3))
+    matched_keywords = match_keywords(text, max_terms=4)
+    org_context = retrieve_org_context(text) 
+
+    with SessionLocal() as db:
+        examples = retrieve_feedback_examples(db, text, k=feedback_k)
+
+    return dict(
+        grant_text=text,
+        mission=mission,
+        matched_keywords=matched_keywords,
+        feedback_examples=examples,
+        org_context=org_context,
+    )
+
+
+def save_llm_result(opportunity: Opportunity, llm_info: dict):
+    with SessionLocal() as db, db.begin():
+        ok = update_opportunity(db, opportunity.unique_key, {
+                "llm_info": llm_info,
+                "is_relevant": llm_info.get("is_relevant"),
+                **amount_columns(opportunity.grant_amount, llm_info),
+                **deadline_columns(opportunity.deadline, llm_info),
+            })
+        if not ok:
+            raise RuntimeError("DB update failed")
+
 
+async def process_single_grant_async(opportunity: Opportunity, gate: RelevanceGate | None = None,
+                                     decision: GateDecision | None = None) -> tuple | None:
+    """Retrieval and the DB write run in worker threads; the LLM call is awaited under the adaptive limit."""
+    try:
+        request = await asyncio.to_thread(prepare_grant_request, opportunity)
+        llm_info = await llm_client.analyze_grant_async(**request)
+        if gate is not None and decision is not None:
+            # Shadow mode: keep the gate's call next to the LLM's for later comparison.
+            llm_info = {**llm_info, "relevance_gate": decision.as_dict()}
+            gate.record_llm_verdict(decision, llm_info.get("is_relevant"))
+        await asyncio.to_thread(save_llm_result, opportunity, llm_info)
         return (opportunity.unique_key, True)
     except Exception as e:
         logger.error(f"Error processing grant {opportunity.unique_key}: {e}")
         return None
 
 
+def reuse_canonical_analysis(opportunity: Opportunity) -> bool:
+    """Copy llm_info from the canonical row of a near-duplicate instead of calling the LLM again."""
+    if not opportunity.canonical_id:
+        return False
+    try:
+        with SessionLocal() as db, db.begin():
+            canonical = db.get(Opportunity, opportunity.canonical_id)
+            if canonical is None or not canonical.llm_info:
+                return False
+            ok = update_opportunity(db, opportunity.unique_key, {
+                    "llm_info": canonical.llm_info,
+                    "is_relevant": canonical.is_relevant,
+                    **amount_columns(opportunity.grant_amount, canonical.llm_info),
+                    **deadline_columns(opportunity.deadline, canonical.llm_info),
+                })
+        if ok:
+            logger.info(f"Reused LLM analysis of canonical grant {opportunity.canonical_id} for near-duplicate {opportunity.unique_key}")
+        return ok
+    except Exception as e:
+        logger.error(f"Error reusing canonical analysis for {opportunity.unique_key}: {e}")
+        return False
+
+
 def process_new_grants_with_llm(max_workers: int = 4):
     db: Session = SessionLocal()
     try:
@@ -84,7 +128,98 @@ def process_new_grants_with_llm(max_workers: int = 4):
     if not opportunities:
         return
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(process_single_grant, opp) for opp in opportunities]
-        for future in as_completed(futures):
-            _ = future.result()
\ No newline at end of file
+    # Canonical rows first, so their near-duplicates can reuse the analysis afterwards.
+    originals = [opp for opp in opportunities if not opp.canonical_id]
+    linked = [opp for opp in opportunities if opp.canonical_id]
+
+    llm_client.cache.reset_stats()
+    gate = asyncio.run(_process_with_llm(originals, linked, max_workers))
+    return {
+        "processed": len(opportunities),
+        "cache": llm_client.cache.stats(),
+        "relevance_gate": gate.stats.as_dict() if gate else None,
+    }
+
+
+def apply_relevance_gate(gate: RelevanceGate, originals: list[Opportunity]) -> tuple[list[Opportunity], dict]:
+    """
+    Score grants with the gate. In enforce mode confident rejects are saved as not relevant right away and
+    dropped from the LLM queue; in shadow mode every grant still goes to the LLM. Returns (to_analyze, decisions).
+    """
+    decisions = score_opportunities(gate, originals, build_grant_text)
+    if gate.mode != "enforce":
+        return originals, decisions
+
+    to_analyze = []
+    for opp in originals:
+        decision = decisions.get(opp.unique_key)
+        if decision is None or not decision.reject:
+            to_analyze.append(opp)
+            continue
+        try:
+            save_llm_result(opp, gate_llm_info(decision))
+            gate.record_rejection()
+        except Exception as e:
+            logger.error(f"Relevance gate: Could not save rejection for {opp.unique_key}, sending to LLM: {e}")
+            to_analyze.append(opp)
+    logger.info(f"Relevance gate: Rejected {gate.stats.rejected}/{len(originals)} grants without an LLM call.")
+    return to_analyze, {}
+
+
+async def _drain(opportunities: list[Opportunity], gate: RelevanceGate | None = None, decisions: dict | None = None) -> int:
+    """
+    Run process_single_grant_async over a queue with one worker per possible LLM slot. The limiter,
+    not the worker count, decides how many requests are in flight; extra workers just have the next
+    prompt ready when the limit grows.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for opp in opportunities:
+        queue.put_nowait(opp)
+    done = 0
+
+    async def worker():
+        nonlocal done
+        while True:
+            try:
+                opp = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            decision = (decisions or {}).get(opp.unique_key)
+            if await process_single_grant_async(opp, gate, decision):
+                done += 1
+
+    workers = min(len(opportunities), llm_client.limiter.maximum + 1)
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return done
+
+
+async def _process_with_llm(originals: list[Opportunity], linked: list[Opportunity], max_workers: int):
+    # max_workers sizes the thread pool for retrieval and DB writes; LLM concurrency adapts on its own.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max_workers))
+    started = time.monotonic()
+    gate, decisions = None, {}
+    try:
+        try:
+            gate = await asyncio.to_thread(load_relevance_gate, build_grant_text)
+            if gate is not None:
+                originals, decisions = await asyncio.to_thread(apply_relevance_gate, gate, originals)
+        except Exception as e:
+            logger.error(f"Relevance gate: Failed, sending every grant to the LLM: {e}")
+            gate, decisions = None, {}
+
+        await llm_client.warm_up_async(get_prompt_text())
+        done = await _drain(originals, gate, decisions)
+
+        remaining = [opp for opp in linked if not await asyncio.to_thread(reuse_canonical_analysis, opp)]
+        if linked:
+            logger.info(f"Reused canonical analysis for {len(linked) - len(remaining)}/{len(linked)} near-duplicate grants.")
+        done += await _drain(remaining)
+    finally:
+        await llm_client.aclose()
+
+    logger.info(
+        f"LLM stage: {done}/{len(originals) + len(remaining)} grants analyzed in {time.monotonic() - started:.1f}s "
+        f"(limiter {llm_client.limiter.stats()}, cache {llm_client.cache.stats()}, "
+        f"gate {gate.stats.as_dict() if gate else 'off'})"
+    )
+    return gate
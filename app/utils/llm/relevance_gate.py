@@ -0,0 +1,189 @@
+from __future__ import annotations
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from app.db.database import SessionLocal
+from app.db.models import Opportunity
+from app.utils.rag.config import get_relevance_gate_config
+
+logger = logging.getLogger(__name__)
+
+GATE_MODES = ("off", "shadow", "enforce")
+GATE_SOURCE = "relevance_gate"
+# Reviewed grants named in a rejection's explanation.
+NEAREST_TITLES = 2
+
+
+@dataclass
+class GateDecision:
+    p_not_relevant: float
+    neighbors: int
+    reject: bool
+    nearest_titles: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "p_not_relevant": round(self.p_not_relevant, 3),
+            "neighbors": self.neighbors,
+            "would_reject": self.reject,
+        }
+
+    def explanation(self) -> str:
+        # Only what the kNN actually knows: the neighbours' labels and which reviewed grants they were.
+        closest = ", ".join(f"'{t}'" for t in self.nearest_titles)
+        example = f" Closest reviewed grants: {closest}." if closest else ""
+        return (
+            f"Auto-rejected without LLM analysis: {self.p_not_relevant:.0%} (similarity-weighted) of the "
+            f"{self.neighbors} most similar reviewed grants were marked not relevant by reviewers.{example}"
+        )
+
+
+@dataclass
+class ShadowStats:
+    scored: int = 0
+    would_reject: int = 0
+    rejected: int = 0
+    # LLM verdicts on the grants the gate scored (shadow mode): agreement on would-reject and overall.
+    compared: int = 0
+    agreed: int = 0
+    reject_compared: int = 0
+    reject_agreed: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "scored": self.scored,
+                "would_reject": self.would_reject,
+                "rejected": self.rejected,
+                "agreement": round(self.agreed / self.compared, 3) if self.compared else None,
+                "reject_precision": round(self.reject_agreed / self.reject_compared, 3) if self.reject_compared else None,
+            }
+
+
+class RelevanceGate:
+    """
+    Distance-weighted kNN over MiniLM embeddings of reviewed grants (label: user_feedback_info.user_is_relevant).
+    A grant is rejected when the weighted share of "not relevant" neighbours reaches the threshold and
+    enough neighbours are actually similar. In shadow mode nothing is rejected; decisions are recorded
+    next to the LLM's verdict instead.
+    """
+
+    def __init__(self, vectors: np.ndarray, labels: np.ndarray, titles: List[str], mode: str = "shadow",
+                 threshold: float = 0.9, k: int = 7, min_similarity: float = 0.5):
+        self.vectors = vectors
+        self.labels = labels  # 1 = relevant, 0 = not relevant
+        self.titles = titles
+        self.mode = mode
+        self.threshold = threshold
+        self.k = k
+        self.min_similarity = min_similarity
+        self.stats = ShadowStats()
+
+    def score(self, query_vectors: np.ndarray) -> List[GateDecision]:
+        decisions = []
+        sims = query_vectors @ self.vectors.T
+        k = min(self.k, self.vectors.shape[0])
+        for row in sims:
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[row[top] >= self.min_similarity]
+            if len(top) < k:
+                # Too few close reviewed grants to say anything confident.
+                decisions.append(GateDecision(0.0, int(len(top)), False))
+                continue
+            weights = row[top]
+            p_not = float(weights[self.labels[top] == 0].sum() / weights.sum())
+            nearest = top[np.argsort(-row[top])[:NEAREST_TITLES]]
+            decisions.append(GateDecision(p_not, int(len(top)), p_not >= self.threshold, [self.titles[int(i)] for i in nearest]))
+
+        with self.stats._lock:
+            self.stats.scored += len(decisions)
+            self.stats.would_reject += sum(d.reject for d in decisions)
+        return decisions
+
+    def record_rejection(self):
+        with self.stats._lock:
+            self.stats.rejected += 1
+
+    def record_llm_verdict(self, decision: GateDecision, llm_is_relevant):
+        if not isinstance(llm_is_relevant, bool):
+            return
+        if decision.neighbors < self.k:
+            # Undecided (too few similar reviewed grants): not a prediction either way.
+            return
+        with self.stats._lock:
+            self.stats.compared += 1
+            self.stats.agreed += int((decision.p_not_relevant < 0.5) == llm_is_relevant)
+            if decision.reject:
+                self.stats.reject_compared += 1
+                self.stats.reject_agreed += int(not llm_is_relevant)
+
+
+def load_relevance_gate(text_fn: Callable[[Opportunity], str]) -> Optional[RelevanceGate]:
+    """Build the gate from reviewed grants; None when disabled or when there are too few labels of each kind."""
+    cfg = get_relevance_gate_config()
+    mode = str(cfg.get("mode", "shadow")).lower()
+    if mode not in GATE_MODES:
+        logger.warning(f"Relevance gate: Unknown mode '{mode}', using shadow")
+        mode = "shadow"
+    if mode == "off":
+        return None
+
+    with SessionLocal() as db:
+        reviewed = db.execute(
+            select(Opportunity).where(Opportunity.user_feedback.is_(True))
+        ).scalars().all()
+
+    texts, labels, titles = [], [], []
+    for opp in reviewed:
+        label = (opp.user_feedback_info or {}).get("user_is_relevant")
+        if isinstance(label, bool):
+            texts.append(text_fn(opp))
+            labels.append(int(label))
+            titles.append(opp.title)
+
+    min_labels = int(cfg.get("min_labels", 30))
+    negatives = labels.count(0)
+    if len(labels) < min_labels or negatives == 0 or negatives == len(labels):
+        logger.info(f"Relevance gate: Disabled, {len(labels)} reviewed grants ({negatives} not relevant); need {min_labels} of both kinds")
+        return None
+
+    from app.utils.rag.embed import embed
+    gate = RelevanceGate(
+        embed(texts), np.array(labels), titles,
+        mode=mode,
+        threshold=float(cfg.get("threshold", 0.9)),
+        k=int(cfg.get("k", 7)),
+        min_similarity=float(cfg.get("min_similarity", 0.5)),
+    )
+    logger.info(f"Relevance gate: {mode} mode, {len(labels)} reviewed grants ({negatives} not relevant), threshold {gate.threshold}")
+    return gate
+
+
+def score_opportunities(gate: RelevanceGate, opportunities: List[Opportunity],
+                        text_fn: Callable[[Opportunity], str]) -> Dict[str, GateDecision]:
+    if not opportunities:
+        return {}
+    from app.utils.rag.embed import embed
+    decisions = gate.score(embed([text_fn(opp) for opp in opportunities]))
+    return {opp.unique_key: d for opp, d in zip(opportunities, decisions)}
+
+
+def gate_llm_info(decision: GateDecision) -> dict:
+    """llm_info stored for a grant the gate rejected; same fields as an LLM analysis."""
+    return {
+        "is_relevant": False,
+        "location_applicable": None,
+        "award_amount": None,
+        "deadline": None,
+        "explanation": decision.explanation(),
+        "priority_score": 0,
+        "possibility": "Poor",
+        "source": GATE_SOURCE,
+        GATE_SOURCE: decision.as_dict(),
+    }
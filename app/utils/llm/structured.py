@@ -0,0 +1,105 @@
+from __future__ import annotations
+import json
+import time
+
+# Ollama structured output (`format`): generation is constrained to JSON matching this schema.
+GRANT_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "is_relevant": {"type": "boolean"},
+        "location_applicable": {"type": "boolean"},
+        "award_amount": {"type": ["string", "null"]},
+        "deadline": {"type": ["string", "null"]},
+        "explanation": {"type": "string"},
+        "priority_score": {"type": ["integer", "null"]},
+        "possibility": {"enum": ["Poor", "Decent", "Fair", "Excellent", None]},
+    },
+    "required": ["is_relevant", "location_applicable", "award_amount", "deadline", "explanation"],
+}
+
+
+class JsonObjectScanner:
+    """
+    Incremental, string-aware brace matcher over streamed text. feed() returns True once the first
+    top-level JSON object has closed; text() is everything up to and including its closing brace.
+    """
+
+    def __init__(self):
+        self._parts: list[str] = []
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self.complete = False
+
+    def feed(self, chunk: str) -> bool:
+        if self.complete:
+            return True
+        for i, ch in enumerate(chunk):
+            if self._escape:
+                self._escape = False
+            elif self._in_string:
+                if ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = self._started
+            elif ch == "{":
+                self._started = True
+                self._depth += 1
+            elif ch == "}" and self._started:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[:i + 1])
+                    self.complete = True
+                    return True
+        self._parts.append(chunk)
+        return False
+
+    def text(self) -> str:
+        return "".join(self._parts)
+
+
+
+class GenerateStreamCollector:
+    """
+    Collects a streamed Ollama /api/generate response (NDJSON chunks). add_line() returns True when
+    reading can stop: the server finished, or the top-level JSON object is complete (anything after it
+    would be discarded by the parser anyway).
+    """
+
+    def __init__(self):
+        self.scanner = JsonObjectScanner()
+        self.chunks = 0
+        self.final: dict = {}
+        self.stopped_early = False
+        self._started = time.monotonic()
+
+    def add_line(self, line) -> bool:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line or not line.strip():
+            return False
+        data = json.loads(line)
+        if data.get("error"):
+            raise ValueError(f"LLM stream error: {data['error']}")
+        self.chunks += 1
+        closed = self.scanner.feed(data.get("response", ""))
+        if data.get("done"):
+            self.final = data
+            return True
+        if closed:
+            self.stopped_early = True
+            return True
+        return False
+
+    def raw(self) -> dict:
+        """Same shape as a non-streamed response: the text plus whatever stats the server sent."""
+        raw = dict(self.final)
+        raw["response"] = self.scanner.text()
+        if not self.final:
+            # Stopped before the final chunk: one chunk per generated token, wall time for duration.
+            raw["eval_count"] = self.chunks
+            raw["total_duration"] = int((time.monotonic() - self._started) * 1e9)
+        return raw
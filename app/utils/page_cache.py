@@ -0,0 +1,112 @@
+from __future__ import annotations
+import hashlib
+import logging
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from app.utils.run_state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+# Entries not seen for this long are dropped when the cache is saved.
+PAGE_CACHE_RETENTION_DAYS = 120
+
+_WS = re.compile(r"\s+")
+
+
+def content_fingerprint(text: str) -> str:
+    normalized = _WS.sub(" ", (text or "")).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """
+    Per-site cache keyed by URL (or any stable key) holding the last content fingerprint
+    and HTTP validators (ETag / Last-Modified). Nothing is staged for new content until the
+    scraper calls mark_seen() after handling it; staged updates are only persisted by
+    commit(), which the runner calls after the site's results have been saved.
+    """
+
+    def __init__(self, site_name: str):
+        self.site_name = site_name
+        self._state_name = f"page_cache_{site_name}"
+        self._entries: Dict[str, dict] = load_state(self._state_name, {}) or {}
+        self._staged: Dict[str, dict] = {}
+        # Validators from 200 responses, staged by mark_seen() once the page has been handled.
+        self._pending: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def is_unchanged(self, key: str, content: str) -> bool:
+        """
+        True when `content` matches what was seen for `key` last run. Changed content is not
+        staged here; call mark_seen() once it has been handled so a failure retries next run.
+        """
+        fp = content_fingerprint(content)
+        with self._lock:
+            prev = self._staged.get(key) or self._entries.get(key) or {}
+            unchanged = prev.get("hash") == fp
+            if unchanged:
+                self.hits += 1
+                self._stage(key, hash=fp)
+            else:
+                self.misses += 1
+        return unchanged
+
+    def mark_seen(self, key: str, content: Optional[str] = None):
+        """Stage the fingerprint of `content` and any validators fetched for `key`; persisted by commit()."""
+        with self._lock:
+            fields = self._pending.pop(key, {})
+            if content is not None:
+                fields["hash"] = content_fingerprint(content)
+            self._stage(key, **fields)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            entry = self._entries.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record_response(self, url: str, status: int, headers: Dict[str, str]):
+        with self._lock:
+            if status == 304:
+                self.hits += 1
+                self._stage(url)
+                return
+            self._pending[url] = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def commit(self):
+        with self._lock:
+            for key, staged in self._staged.items():
+                self._entries[key] = {**self._entries.get(key, {}), **staged}
+            self._staged.clear()
+
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=PAGE_CACHE_RETENTION_DAYS)).isoformat()
+            self._entries = {k: v for k, v in self._entries.items() if v.get("seen_at", "") >= cutoff}
+            entries = dict(self._entries)
+
+        try:
+            save_state(self._state_name, entries)
+        except Exception as e:
+            logger.warning(f"PageCache: Failed to save cache for '{self.site_name}': {e}")
+
+    def _stage(self, key: str, **fields):
+        staged = self._staged.setdefault(key, {})
+        staged.update({k: v for k, v in fields.items() if v is not None})
+        staged["seen_at"] = datetime.now(timezone.utc).isoformat()
+
+
+def get_page_cache(site_name: str, site_config: dict) -> Optional[PageCache]:
+    if not site_config.get("page_cache", True) or site_config.get("full"):
+        return None
+    return PageCache(site_name)
@@ -21,12 +21,18 @@ def load_system_prompt(path: str | None = None) -> dict:
 def get_prompt_text() -> str:
     return load_system_prompt()["prompt"].strip()
 
+def get_prompt_version() -> str:
+    return str(load_system_prompt().get("version", 1))
+
 def get_caps() -> dict:
     return load_system_prompt().get("caps", {})
 
 def get_retrieval_knobs() -> dict:
     return load_system_prompt().get("retrieval", {})
 
+def get_relevance_gate_config() -> dict:
+    return load_system_prompt().get("relevance_gate", {}) or {}
+
 def get_keywords() -> dict:
     data = load_system_prompt()
     kw = data.get("keywords", {}) or {}
@@ -0,0 +1,41 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import threading
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Small JSON files that carry scraper state from one weekly run to the next.
+STATE_DIR = os.getenv("SCRAPER_STATE_DIR", "scraper_state")
+
+_state_lock = threading.Lock()
+
+
+def _state_path(name: str) -> str:
+    return os.path.join(STATE_DIR, f"{name}.json")
+
+
+def load_state(name: str, default: Any = None) -> Any:
+    path = _state_path(name)
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"RunState: Could not read {path}: {e}")
+        return default
+
+
+def save_state(name: str, data: Any) -> None:
+    path = _state_path(name)
+    with _state_lock:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from app.utils.run_state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+DURATIONS_STATE = "site_durations"
+# Estimate for sites we have never timed; high so unknown sites are started early.
+DEFAULT_SITE_ESTIMATE_SECONDS = float(os.getenv("SCRAPER_DEFAULT_SITE_ESTIMATE_SECONDS", "600"))
+DEFAULT_SITE_BUDGET_SECONDS = float(os.getenv("SCRAPER_SITE_BUDGET_SECONDS", "3600"))
+# Weight of the latest run in the moving average of a site's duration.
+DURATION_EWMA_ALPHA = 0.5
+
+RunSite = Callable[[str, dict, Optional[float]], Optional[dict]]
+OnDispatch = Callable[[str, dict, int], None]
+
+
+def load_site_durations() -> Dict[str, float]:
+    data = load_state(DURATIONS_STATE, {}) or {}
+    return {k: float(v) for k, v in data.items() if isinstance(v, (int, float))}
+
+
+def save_site_durations(durations: Dict[str, float]) -> None:
+    save_state(DURATIONS_STATE, {k: round(v, 1) for k, v in durations.items()})
+
+
+def estimate_seconds(site_name: str, site_config: dict, durations: Dict[str, float]) -> float:
+    if site_name in durations:
+        return durations[site_name]
+    return float(site_config.get("expected_seconds", DEFAULT_SITE_ESTIMATE_SECONDS))
+
+
+def order_longest_first(config_map: Dict[str, dict], durations: Dict[str, float]) -> List[Tuple[str, dict]]:
+    return sorted(
+        config_map.items(),
+        key=lambda item: estimate_seconds(item[0], item[1], durations),
+        reverse=True,
+    )
+
+
+class SiteScheduler:
+    """
+    Runs sites longest-first (by historical duration) on a bounded set of worker threads.
+    Each site gets a time budget (`time_budget_seconds` in sites_config.yml, else
+    SCRAPER_SITE_BUDGET_SECONDS) passed to `run_site` as an absolute monotonic deadline.
+    """
+
+    def __init__(self, config_map: Dict[str, dict], run_site: RunSite, max_workers: int, on_dispatch: Optional[OnDispatch] = None):
+        self.durations = load_site_durations()
+        self.run_site = run_site
+        self.on_dispatch = on_dispatch
+        self.max_workers = max(1, max_workers)
+        self.total = len(config_map)
+
+        self._queue: Deque[Tuple[str, dict]] = deque(order_longest_first(config_map, self.durations))
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._results: Dict[str, dict] = {}
+        self._started_at: Optional[float] = None
+
+    def run(self) -> Dict[str, dict]:
+        self._started_at = time.monotonic()
+        plan = ", ".join(f"{name}(~{estimate_seconds(name, cfg, self.durations):.0f}s)" for name, cfg in self._queue)
+        logger.info(f"Scheduler: {self.total} sites on {self.max_workers} workers, longest first: {plan}")
+
+        self.add_workers(self.max_workers)
+        # Workers may be added while we wait (grid capacity grew), so join until none are left.
+        while True:
+            with self._lock:
+                alive = [t for t in self._workers if t.is_alive()]
+            if not alive:
+                break
+            for t in alive:
+                t.join()
+
+        save_site_durations(self.durations)
+        logger.info(f"Scheduler: All {self.total} sites finished in {time.monotonic() - self._started_at:.1f}s")
+        return dict(self._results)
+
+    def add_workers(self, target: int):
+        with self._lock:
+            self.max_workers = max(self.max_workers, target)
+            alive = sum(1 for t in self._workers if t.is_alive())
+            to_start = min(self.max_workers - alive, len(self._queue))
+            for _ in range(max(0, to_start)):
+                t = threading.Thread(target=self._worker, name=f"site-worker-{len(self._workers) + 1}", daemon=True)
+                self._workers.append(t)
+                t.start()
+
+    def _next_site(self) -> Optional[Tuple[str, dict, int]]:
+        with self._lock:
+            if not self._queue:
+                return None
+            site_name, site_config = self._queue.popleft()
+            return site_name, site_config, len(self._queue) + 1
+
+    def _worker(self):
+        while True:
+            nxt = self._next_site()
+            if nxt is None:
+                return
+            site_name, site_config, remaining = nxt
+
+            if self.on_dispatch is not None:
+                try:
+                    self.on_dispatch(site_name, site_config, remaining)
+                except Exception:
+                    logger.exception(f"Scheduler: dispatch hook failed for '{site_name}'")
+
+            budget = float(site_config.get("time_budget_seconds", DEFAULT_SITE_BUDGET_SECONDS))
+            started = time.monotonic()
+            result = None
+            try:
+                result = self.run_site(site_name, site_config, started + budget)
+            except Exception:
+                logger.exception(f"Scheduler: '{site_name}' raised")
+            elapsed = time.monotonic() - started
+
+            self._record(site_name, result or {"ok": False}, elapsed, budget)
+
+    def _record(self, site_name: str, result: dict, elapsed: float, budget: float):
+        with self._lock:
+            result = dict(result, seconds=round(elapsed, 1), over_budget=elapsed > budget)
+            self._results[site_name] = result
+            if result.get("ok"):
+                prev = self.durations.get(site_name)
+                self.durations[site_name] = elapsed if prev is None else (
+                    DURATION_EWMA_ALPHA * elapsed + (1 - DURATION_EWMA_ALPHA) * prev
+                )
+            done = len(self._results)
+            queued = len(self._queue)
+            running = self.total - done - queued
+
+        run_elapsed = time.monotonic() - self._started_at
+        logger.info(
+            f"Scheduler: Progress {done}/{self.total} sites done ('{site_name}' took {elapsed:.1f}s, "
+            f"ok={result.get('ok')}), {running} running, {queued} queued, elapsed {run_elapsed:.1f}s"
+        )
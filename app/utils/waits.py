@@ -0,0 +1,170 @@
+from __future__ import annotations
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# How often conditions are re-checked. Each check is one WebDriver round trip.
+POLL_INTERVAL = 0.1
+
+# Installed once per document; records the time of the latest DOM mutation.
+_OBSERVE_MUTATIONS_JS = """
+if (!window.__gsMutationObserver) {
+    window.__gsLastMutation = performance.now();
+    window.__gsMutationObserver = new MutationObserver(() => { window.__gsLastMutation = performance.now(); });
+    window.__gsMutationObserver.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return performance.now() - window.__gsLastMutation;
+"""
+
+_NETWORK_STATE_JS = """
+return [document.readyState, performance.getEntriesByType('resource').length];
+"""
+
+_COUNT_JS = "return document.querySelectorAll(arguments[0]).length;"
+
+_SCROLL_STATE_JS = """
+return [document.body.scrollHeight, arguments[0] ? document.querySelectorAll(arguments[0]).length : 0];
+"""
+
+
+class WaitStats:
+    """
+    Per-scraper record of time spent in waits, next to the fixed sleep each wait replaced
+    (`baseline`), so a run shows how much time condition-based waiting saved.
+    """
+
+    def __init__(self, owner: str):
+        self.owner = owner
+        self.waited = 0.0
+        self.baseline = 0.0
+        self.calls = 0
+        self.timeouts = 0
+        self.by_kind: Dict[str, float] = {}
+
+    def record(self, kind: str, waited: float, baseline: float = 0.0, timed_out: bool = False):
+        self.waited += waited
+        self.baseline += baseline
+        self.calls += 1
+        self.timeouts += int(timed_out)
+        self.by_kind[kind] = self.by_kind.get(kind, 0.0) + waited
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "waited": round(self.waited, 2),
+            "baseline": round(self.baseline, 2),
+            "saved": round(max(0.0, self.baseline - self.waited), 2),
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+        }
+
+
+def poll_until(condition: Callable[[], bool], timeout: float, interval: float = POLL_INTERVAL) -> bool:
+    """Re-check `condition` every `interval` seconds; True as soon as it holds, False on timeout."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if condition():
+                return True
+        except Exception as e:
+            logger.debug(f"Waits: condition raised {e}; retrying")
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def _timed(kind: str, stats: Optional[WaitStats], baseline: float, fn: Callable[[], bool]) -> bool:
+    started = time.monotonic()
+    ok = fn()
+    if stats is not None:
+        stats.record(kind, time.monotonic() - started, baseline, timed_out=not ok)
+    if not ok:
+        logger.debug(f"Waits: '{kind}' timed out")
+    return ok
+
+
+def wait_for_dom_quiescence(driver, quiet: float = 0.3, timeout: float = 5.0,
+                            stats: Optional[WaitStats] = None, baseline: float = 0.0) -> bool:
+    """Return once the DOM has gone `quiet` seconds without a mutation."""
+    def settled() -> bool:
+        since_ms = driver.execute_script(_OBSERVE_MUTATIONS_JS)
+        return since_ms is not None and since_ms >= quiet * 1000
+
+    return _timed("dom_quiescence", stats, baseline, lambda: poll_until(settled, timeout))
+
+
+def wait_for_count_stable(driver, selector: str, stable_for: float = 0.5, timeout: float = 10.0, min_count: int = 1,
+                          stats: Optional[WaitStats] = None, baseline: float = 0.0) -> bool:
+    """Return once at least `min_count` elements match `selector` and the count has not changed for `stable_for` seconds."""
+    last = {"count": -1, "since": time.monotonic()}
+
+    def stable() -> bool:
+        count = driver.execute_script(_COUNT_JS, selector) or 0
+        now = time.monotonic()
+        if count != last["count"]:
+            last["count"], last["since"] = count, now
+            return False
+        return count >= min_count and now - last["since"] >= stable_for
+
+    return _timed("count_stable", stats, baseline, lambda: poll_until(stable, timeout))
+
+
+def wait_for_network_idle(driver, idle: float = 0.5, timeout: float = 10.0,
+                          stats: Optional[WaitStats] = None, baseline: float = 0.0) -> bool:
+    """
+    Return once the document has loaded and no new resource has been fetched for `idle` seconds
+    (Resource Timing entries only grow when a request completes, so a flat count means idle).
+    """
+    last = {"entries": -1, "since": time.monotonic()}
+
+    def quiet() -> bool:
+        ready_state, entries = driver.execute_script(_NETWORK_STATE_JS)
+        now = time.monotonic()
+        if entries != last["entries"]:
+            last["entries"], last["since"] = entries, now
+            return False
+        return ready_state == "complete" and now - last["since"] >= idle
+
+    return _timed("network_idle", stats, baseline, lambda: poll_until(quiet, timeout))
+
+
+def wait_for_content_change(driver, selector: str, before: str, timeout: float = 10.0,
+                            stats: Optional[WaitStats] = None, baseline: float = 0.0) -> bool:
+    """Return once the text under `selector` differs from `before` (e.g. after an AJAX pagination click)."""
+    def changed() -> bool:
+        now = driver.execute_script(
+            "return Array.from(document.querySelectorAll(arguments[0])).map(e => e.innerText).join('\\n');",
+            selector,
+        ) or ""
+        return bool(now) and now != before
+
+    return _timed("content_change", stats, baseline, lambda: poll_until(changed, timeout))
+
+
+def scroll_until_exhausted(driver, selector: Optional[str] = None, settle: float = 1.5, max_rounds: int = 20,
+                           stats: Optional[WaitStats] = None, baseline: float = 0.0) -> int:
+    """
+    Scroll to the bottom until the page stops growing: each round waits up to `settle` seconds
+    for the scroll height (or the number of `selector` matches) to increase, and stops when it
+    does not. Returns the number of rounds that loaded more content.
+    """
+    started = time.monotonic()
+    height, count = driver.execute_script(_SCROLL_STATE_JS, selector)
+    grew = 0
+    for _ in range(max_rounds):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        state = {}
+
+        def more() -> bool:
+            state["height"], state["count"] = driver.execute_script(_SCROLL_STATE_JS, selector)
+            return state["height"] > height or state["count"] > count
+
+        if not poll_until(more, settle):
+            break
+        height, count = state["height"], state["count"]
+        grew += 1
+
+    if stats is not None:
+        stats.record("scroll_exhausted", time.monotonic() - started, baseline)
+    return grew
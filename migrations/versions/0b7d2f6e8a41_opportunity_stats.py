@@ -0,0 +1,95 @@
+"""opportunity_stats review counters maintained by triggers
+
+Revision ID: 0b7d2f6e8a41
+Revises: f1a3c5e7b902
+Create Date: 2026-10-16 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7d2f6e8a41'
+down_revision: Union[str, Sequence[str], None] = 'f1a3c5e7b902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in sync with app.db.opportunity_stats.REVIEW_COUNTERS.
+COUNTERS = {
+    "total": "TRUE",
+    "unviewed": "is_viewed IS FALSE",
+    "with_feedback": "user_feedback IS TRUE",
+    "relevant": "is_relevant IS TRUE",
+    "not_relevant": "is_relevant IS FALSE",
+    "unscored": "is_relevant IS NULL",
+    "relevant_unviewed": "is_relevant IS TRUE AND is_viewed IS FALSE",
+}
+
+
+def _counts(table: str) -> str:
+    return ", ".join(f"count(*) FILTER (WHERE {pred}) AS {name}" for name, pred in COUNTERS.items()) + f" FROM {table}"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'opportunity_stats',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        *[sa.Column(name, sa.BigInteger(), nullable=False, server_default='0') for name in COUNTERS],
+    )
+    op.execute(f"INSERT INTO opportunity_stats (id, {', '.join(COUNTERS)}) SELECT 1, {_counts('opportunities')}")
+
+    # Statement-level triggers with transition tables: one stats UPDATE per INSERT/UPDATE/DELETE statement
+    # (a bulk ingest batch is one statement), and none at all when the statement changes no counter.
+    deltas = ", ".join(f"coalesce(n.{name}, 0) - coalesce(o.{name}, 0)" for name in COUNTERS)
+    assignments = ", ".join(f"{name} = s.{name} + d[{i}]" for i, name in enumerate(COUNTERS, start=1))
+    op.execute(f"""
+        CREATE FUNCTION opportunity_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE
+            d bigint[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT ARRAY[{deltas}] INTO d
+                FROM (SELECT {_counts('new_rows')}) n, (SELECT {', '.join(f'0 AS {name}' for name in COUNTERS)}) o;
+            ELSIF TG_OP = 'UPDATE' THEN
+                SELECT ARRAY[{deltas}] INTO d
+                FROM (SELECT {_counts('new_rows')}) n, (SELECT {_counts('old_rows')}) o;
+            ELSE
+                SELECT ARRAY[{deltas}] INTO d
+                FROM (SELECT {', '.join(f'0 AS {name}' for name in COUNTERS)}) n, (SELECT {_counts('old_rows')}) o;
+            END IF;
+
+            IF d <> array_fill(0::bigint, ARRAY[{len(COUNTERS)}]) THEN
+                UPDATE opportunity_stats s SET {assignments} WHERE s.id = 1;
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER opportunity_stats_insert AFTER INSERT ON opportunities
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION opportunity_stats_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER opportunity_stats_update AFTER UPDATE ON opportunities
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION opportunity_stats_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER opportunity_stats_delete AFTER DELETE ON opportunities
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION opportunity_stats_apply()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS opportunity_stats_delete ON opportunities")
+    op.execute("DROP TRIGGER IF EXISTS opportunity_stats_update ON opportunities")
+    op.execute("DROP TRIGGER IF EXISTS opportunity_stats_insert ON opportunities")
+    op.execute("DROP FUNCTION IF EXISTS opportunity_stats_apply()")
+    op.drop_table('opportunity_stats')
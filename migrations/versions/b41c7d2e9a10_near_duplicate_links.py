@@ -0,0 +1,37 @@
+"""near-duplicate links (minhash, canonical_id)
+
+Revision ID: b41c7d2e9a10
+Revises: 6ebbf292889b
+Create Date: 2026-10-16 10:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41c7d2e9a10'
+down_revision: Union[str, Sequence[str], None] = '6ebbf292889b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('opportunities', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.add_column('opportunities', sa.Column('canonical_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_opportunities_canonical_id', 'opportunities', 'opportunities',
+        ['canonical_id'], ['id'], ondelete='SET NULL',
+    )
+    op.create_index('ix_opportunities_canonical_id', 'opportunities', ['canonical_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_opportunities_canonical_id', table_name='opportunities')
+    op.drop_constraint('fk_opportunities_canonical_id', 'opportunities', type_='foreignkey')
+    op.drop_column('opportunities', 'canonical_id')
+    op.drop_column('opportunities', 'minhash')
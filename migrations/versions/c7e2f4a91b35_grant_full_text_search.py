@@ -0,0 +1,48 @@
+"""grant full-text search (tsvector + pg_trgm)
+
+Revision ID: c7e2f4a91b35
+Revises: b41c7d2e9a10
+Create Date: 2026-10-16 11:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2f4a91b35'
+down_revision: Union[str, Sequence[str], None] = 'b41c7d2e9a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in sync with app.db.models.SEARCH_VECTOR_SQL (not imported: migrations must not change with the model).
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(tags, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(source, '')), 'D')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        'opportunities',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True),
+    )
+    op.create_index('ix_opportunities_search_vector', 'opportunities', ['search_vector'], postgresql_using='gin')
+    op.create_index(
+        'ix_opportunities_title_trgm', 'opportunities', ['title'],
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_opportunities_title_trgm', table_name='opportunities')
+    op.drop_index('ix_opportunities_search_vector', table_name='opportunities')
+    op.drop_column('opportunities', 'search_vector')
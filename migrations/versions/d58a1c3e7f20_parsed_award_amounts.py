@@ -0,0 +1,36 @@
+"""parsed award amount range columns
+
+Revision ID: d58a1c3e7f20
+Revises: c7e2f4a91b35
+Create Date: 2026-10-16 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58a1c3e7f20'
+down_revision: Union[str, Sequence[str], None] = 'c7e2f4a91b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema. Existing rows are filled by app/scripts/backfill_amounts.py."""
+    op.add_column('opportunities', sa.Column('amount_min', sa.BigInteger(), nullable=True))
+    op.add_column('opportunities', sa.Column('amount_max', sa.BigInteger(), nullable=True))
+    op.add_column('opportunities', sa.Column('amount_confidence', sa.Float(), nullable=True))
+    op.create_index('ix_opportunities_amount_min', 'opportunities', ['amount_min'])
+    op.create_index('ix_opportunities_amount_max', 'opportunities', ['amount_max'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_opportunities_amount_max', table_name='opportunities')
+    op.drop_index('ix_opportunities_amount_min', table_name='opportunities')
+    op.drop_column('opportunities', 'amount_confidence')
+    op.drop_column('opportunities', 'amount_max')
+    op.drop_column('opportunities', 'amount_min')
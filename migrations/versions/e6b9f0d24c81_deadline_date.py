@@ -0,0 +1,30 @@
+"""parsed deadline date column
+
+Revision ID: e6b9f0d24c81
+Revises: d58a1c3e7f20
+Create Date: 2026-10-16 13:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b9f0d24c81'
+down_revision: Union[str, Sequence[str], None] = 'd58a1c3e7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema. Existing rows are filled by app/scripts/backfill_deadlines.py."""
+    op.add_column('opportunities', sa.Column('deadline_date', sa.Date(), nullable=True))
+    op.create_index('ix_opportunities_deadline_date', 'opportunities', ['deadline_date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_opportunities_deadline_date', table_name='opportunities')
+    op.drop_column('opportunities', 'deadline_date')
@@ -0,0 +1,28 @@
+"""keyset pagination index (scraped_at, id)
+
+Revision ID: f1a3c5e7b902
+Revises: e6b9f0d24c81
+Create Date: 2026-10-16 13:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a3c5e7b902'
+down_revision: Union[str, Sequence[str], None] = 'e6b9f0d24c81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_opportunities_scraped_at_id', 'opportunities', ['scraped_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_opportunities_scraped_at_id', table_name='opportunities')
@@ -0,0 +1,90 @@
+import asyncio
+
+from app.utils.llm.adaptive_limit import AdaptiveLimiter
+
+
+def test_grows_while_saturated_and_fast():
+    limiter = AdaptiveLimiter(minimum=1, maximum=4, initial=1)
+
+    async def call():
+        async with limiter:
+            await asyncio.sleep(0.001)
+            limiter.on_success(1.0)
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(40)))
+
+    asyncio.run(run())
+    assert limiter.limit == 4
+
+
+def test_does_not_grow_when_idle():
+    limiter = AdaptiveLimiter(minimum=1, maximum=4, initial=2)
+
+    async def run():
+        for _ in range(20):
+            async with limiter:
+                limiter.on_success(1.0)
+
+    asyncio.run(run())
+    assert limiter.limit == 2
+
+
+def test_backs_off_on_overload_and_slow_responses():
+    limiter = AdaptiveLimiter(minimum=1, maximum=8, initial=8)
+    limiter.on_overload("HTTP 503")
+    assert limiter.limit == 4
+    # Decreases are rate limited to one per window.
+    limiter.on_overload("HTTP 503")
+    assert limiter.limit == 4
+
+    limiter = AdaptiveLimiter(minimum=1, maximum=8, initial=8)
+    limiter.on_success(1.0)
+    limiter.on_success(5.0)
+    assert limiter.limit < 8
+
+
+def test_never_exceeds_limit():
+    limiter = AdaptiveLimiter(minimum=1, maximum=2, initial=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(10)))
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+def test_client_survives_successive_event_loops():
+    import httpx
+    from unittest import mock
+    import app.utils.llm.llm_client as llm_client_module
+
+    client = llm_client_module.LLMClient(base_url="http://llm", stream=False)
+    client.cache.enabled = False
+
+    async def handler(request):
+        await asyncio.sleep(0.01)  # keep requests in flight so callers queue on the limiter
+        return httpx.Response(200, json={"response": '{"is_relevant": true}', "done": True})
+
+    async def run():
+        client._async_client = httpx.AsyncClient(base_url="http://llm", transport=httpx.MockTransport(handler))
+        try:
+            results = await asyncio.gather(*(client.analyze_grant_async("text", "mission", []) for _ in range(6)))
+        finally:
+            await client.aclose()
+        return results
+
+    with mock.patch.object(llm_client_module, "get_caps", return_value={}), \
+         mock.patch.object(llm_client_module, "get_prompt_version", return_value="1"):
+        first = asyncio.run(run())
+        second = asyncio.run(run())
+
+    assert first == second == [{"is_relevant": True}] * 6
+    assert client.limiter.in_flight == 0
@@ -0,0 +1,62 @@
+from app.utils.amounts import (
+    CONFIDENCE_EXACT,
+    CONFIDENCE_MULTIPLE,
+    CONFIDENCE_RANGE,
+    CONFIDENCE_UP_TO,
+    amount_columns,
+    parse_amount_range,
+)
+
+
+def test_exact_amount():
+    r = parse_amount_range("$5,000")
+    assert (r.minimum, r.maximum, r.confidence) == (5000, 5000, CONFIDENCE_EXACT)
+
+
+def test_ranges():
+    assert parse_amount_range("$5k - $10k").as_columns() == {
+        "amount_min": 5000, "amount_max": 10000, "amount_confidence": CONFIDENCE_RANGE,
+    }
+    r = parse_amount_range("Awards from $5-10k")
+    assert (r.minimum, r.maximum) == (5000, 10000)
+    r = parse_amount_range("between $2,500 and $7,500")
+    assert (r.minimum, r.maximum) == (2500, 7500)
+
+
+def test_up_to():
+    r = parse_amount_range("Up to $2,500 per artist")
+    assert (r.minimum, r.maximum, r.confidence) == (None, 2500, CONFIDENCE_UP_TO)
+
+
+def test_multiple_amounts_span():
+    r = parse_amount_range("Fellows receive $50,000; project grants of $15,000")
+    assert (r.minimum, r.maximum, r.confidence) == (15000, 50000, CONFIDENCE_MULTIPLE)
+
+
+def test_several_ranges_span_all_amounts():
+    r = parse_amount_range("Grants: $500-$1,000; Fellowships $10,000")
+    assert (r.minimum, r.maximum, r.confidence) == (500, 10000, CONFIDENCE_MULTIPLE)
+    r = parse_amount_range("$1k-$2k for individuals, $5k-$20k for organizations")
+    assert (r.minimum, r.maximum, r.confidence) == (1000, 20000, CONFIDENCE_MULTIPLE)
+
+
+def test_amounts_beyond_bigint_are_discarded():
+    assert parse_amount_range("$12345678901234567890").confidence == 0.0
+    r = parse_amount_range("$5,000 (ref $12345678901234567890)")
+    assert (r.minimum, r.maximum, r.confidence) == (5000, 5000, CONFIDENCE_EXACT)
+    r = parse_amount_range("$1,000 - $12345678901234567890")
+    assert (r.minimum, r.maximum) == (1000, 1000)
+
+
+def test_unknown_and_non_money():
+    assert parse_amount_range("Not Available").confidence == 0.0
+    assert parse_amount_range(None).confidence == 0.0
+    assert parse_amount_range("2024-2025 cycle").confidence == 0.0
+    assert parse_amount_range("$25 application fee").confidence == 0.0
+
+
+def test_amount_columns_prefers_confident_source():
+    cols = amount_columns("Up to $10,000", {"award_amount": "$7,500"})
+    assert (cols["amount_min"], cols["amount_max"]) == (7500, 7500)
+    cols = amount_columns("$7,500", {"award_amount": "Not Available"})
+    assert cols["amount_confidence"] == CONFIDENCE_EXACT
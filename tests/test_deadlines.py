@@ -0,0 +1,23 @@
+from datetime import date
+
+from app.utils.deadlines import deadline_columns, parse_deadline
+
+
+def test_formats():
+    assert parse_deadline("2025-09-15") == date(2025, 9, 15)
+    assert parse_deadline("Deadline: September 15th, 2025 at 11:59pm") == date(2025, 9, 15)
+    assert parse_deadline("Apply by 15 Sept 2025") == date(2025, 9, 15)
+    assert parse_deadline("09/15/2025") == date(2025, 9, 15)
+
+
+def test_unknown_and_noise():
+    assert parse_deadline("Not Available") is None
+    assert parse_deadline("Rolling") is None
+    assert parse_deadline("March 15") is None
+    assert parse_deadline("2025-13-40") is None
+    assert parse_deadline(None) is None
+
+
+def test_columns_fall_back_to_llm():
+    assert deadline_columns("Not Available", {"deadline": "2026-01-31"}) == {"deadline_date": date(2026, 1, 31)}
+    assert deadline_columns("2025-09-15", {"deadline": "2026-01-31"}) == {"deadline_date": date(2025, 9, 15)}
@@ -0,0 +1,96 @@
+import threading
+import time
+
+from app.utils.driver_pool import DriverPool
+from app.utils.browser_profiles import DEFAULT_PROFILE
+
+
+class FakeDriver:
+    def __init__(self, n):
+        self.n = n
+        self.session_id = f"s{n}"
+        self.title = ""
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakePool(DriverPool):
+    """DriverPool whose sessions are FakeDrivers; creation waits for `gate` when one is set."""
+
+    def __init__(self, *args, gate=None, **kwargs):
+        self.gate = gate
+        self.created = 0
+        super().__init__(*args, **kwargs)
+
+    def _create_driver(self, profile=None):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.created += 1
+        driver = FakeDriver(self.created)
+        driver.browser_profile = (profile or DEFAULT_PROFILE)["name"]
+        return driver
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_waiters_are_served_in_arrival_order():
+    pool = FakePool(min_drivers=0, max_drivers=1)
+    driver = pool.get_driver(timeout=1)
+    served = []
+
+    def borrow(name):
+        d = pool.get_driver(timeout=2)
+        served.append(name)
+        pool.release_driver(d)
+
+    threads = []
+    for i, name in enumerate(["first", "second", "third"]):
+        t = threading.Thread(target=borrow, args=(name,))
+        t.start()
+        threads.append(t)
+        _wait_for(lambda: len(pool._waiters) == i + 1)
+
+    pool.release_driver(driver)
+    for t in threads:
+        t.join(3)
+    assert served == ["first", "second", "third"]
+    assert pool.created == 1
+
+
+def test_slot_is_reserved_while_a_driver_is_created():
+    gate = threading.Event()
+    pool = FakePool(min_drivers=0, max_drivers=1, gate=gate)
+    got = []
+    t = threading.Thread(target=lambda: got.append(pool.get_driver(timeout=2)))
+    t.start()
+    _wait_for(lambda: pool.pending_drivers == 1)
+
+    # The only slot is taken by the creation in flight, so no second session is started.
+    assert pool.get_driver(timeout=0.1) is None
+    assert pool.created == 0
+
+    gate.set()
+    t.join(3)
+    assert got[0] is not None
+    assert (pool.active_drivers, pool.pending_drivers) == (1, 0)
+
+
+def test_borrow_times_out_when_pool_is_exhausted():
+    pool = FakePool(min_drivers=0, max_drivers=1)
+    held = pool.get_driver(timeout=1)
+
+    started = time.monotonic()
+    assert pool.get_driver(timeout=0.2) is None
+    assert time.monotonic() - started >= 0.2
+    stats = pool.stats()
+    assert stats["timeouts"] == 1 and stats["waiting"] == 0
+
+    pool.release_driver(held)
+    assert pool.get_driver(timeout=0.2) is held
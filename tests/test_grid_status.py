@@ -0,0 +1,77 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from app.utils.grid_status import GridCapacityMonitor, fetch_grid_capacity, status_url_for
+
+
+def _node(max_sessions, busy=0, availability="UP"):
+    slots = [{"id": {"id": str(i)}, "session": {"sessionId": "s"} if i < busy else None} for i in range(max_sessions)]
+    return {"availability": availability, "maxSessions": max_sessions, "slots": slots}
+
+
+@pytest.fixture
+def fake_hub():
+    state = {"nodes": [_node(4)]}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/status":
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = json.dumps({"value": {"ready": True, "message": "ok", "nodes": state["nodes"]}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/status", state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_status_url_for_strips_wd_hub():
+    assert status_url_for("http://selenium-hub:4444/wd/hub") == "http://selenium-hub:4444/status"
+    assert status_url_for("http://grid:4444/") == "http://grid:4444/status"
+
+
+def test_fetch_grid_capacity_counts_free_slots(fake_hub):
+    url, state = fake_hub
+    state["nodes"] = [_node(4, busy=1), _node(2), _node(3, availability="DOWN")]
+
+    capacity = fetch_grid_capacity(url)
+
+    assert capacity.ready is True
+    assert capacity.nodes == 2
+    assert capacity.total_slots == 6
+    assert capacity.free_slots == 5
+
+
+def test_fetch_grid_capacity_unreachable_returns_none():
+    assert fetch_grid_capacity("http://127.0.0.1:9/status", timeout=0.5) is None
+
+
+def test_monitor_scales_listeners_when_nodes_join(fake_hub):
+    url, state = fake_hub
+    seen = []
+    monitor = GridCapacityMonitor(status_url=url, ceiling=6)
+    monitor.add_listener(seen.append)
+
+    assert monitor.poll() == 4
+    state["nodes"].append(_node(4))
+    assert monitor.poll() == 6
+    assert monitor.poll() == 6
+
+    assert seen == [4, 6]
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from app.utils import run_state
+from app.utils.high_water_mark import HIGH_WATER_STATE, HighWaterMark
+
+
+def _stored(site):
+    return (run_state.load_state(HIGH_WATER_STATE, {}) or {}).get(site)
+
+
+def _crawl(site, posts, failed=()):
+    mark = HighWaterMark(site)
+    for url, day in posts:
+        if mark.reached(url, datetime(2025, 5, day)):
+            break
+        if url in failed:
+            mark.fail(datetime(2025, 5, day))
+        else:
+            mark.observe(url, datetime(2025, 5, day))
+    mark.crawl_complete()
+    mark.commit()
+    return mark
+
+
+def test_mark_advances_to_newest_post(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_state, "STATE_DIR", str(tmp_path))
+
+    _crawl("site", [("c", 3), ("b", 2), ("a", 1)])
+    assert _stored("site")["url"] == "c"
+
+
+def test_failed_post_holds_mark_below_it_until_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_state, "STATE_DIR", str(tmp_path))
+    _crawl("site", [("a", 1)])
+
+    _crawl("site", [("d", 4), ("c", 3), ("b", 2), ("a", 1)], failed={"c"})
+    assert _stored("site")["url"] == "b"
+
+    # The next run reaches the failed post again before stopping.
+    _crawl("site", [("d", 4), ("c", 3), ("b", 2)])
+    assert _stored("site")["url"] == "d"
+
+
+def test_failure_without_publish_time_keeps_previous_mark(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_state, "STATE_DIR", str(tmp_path))
+    _crawl("site", [("a", 1)])
+
+    mark = HighWaterMark("site")
+    mark.observe("c", datetime(2025, 5, 3))
+    mark.fail()
+    mark.crawl_complete()
+    mark.commit()
+    assert _stored("site")["url"] == "a"
@@ -0,0 +1,17 @@
+from app.utils import run_state
+from app.utils.known_urls import KnownUrls
+
+
+def test_known_urls_match_normalized_and_persist_details(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_state, "STATE_DIR", str(tmp_path))
+
+    known = KnownUrls("site", ["https://Example.org/grants/a/"])
+    assert known.seen("https://example.org/grants/a#apply")
+    assert not known.seen("https://example.org/grants/b")
+    assert known.skipped == 1
+
+    known.add("https://example.org/grants/b/")
+    known.commit()
+
+    reloaded = KnownUrls("site", [], run_state.load_state("known_urls_site", {}))
+    assert "https://example.org/grants/b" in reloaded
@@ -0,0 +1,19 @@
+from app.db.llm_cache import LLMCache, prompt_fingerprint
+
+
+def test_fingerprint_covers_model_version_and_prompt():
+    base = prompt_fingerprint("mistral", "1", "prompt")
+    assert base == prompt_fingerprint("mistral", "1", "prompt")
+    assert len(base) == 64
+    assert base != prompt_fingerprint("llama3", "1", "prompt")
+    assert base != prompt_fingerprint("mistral", "2", "prompt")
+    assert base != prompt_fingerprint("mistral", "1", "prompt ")
+    # Parts are delimited, so shifting text between them changes the key.
+    assert prompt_fingerprint("ab", "1", "c") != prompt_fingerprint("a", "1", "bc")
+
+
+def test_disabled_cache_is_a_miss_and_reports_stats():
+    cache = LLMCache(enabled=False)
+    assert cache.get("k") is None
+    cache.put("k", "mistral", "1", {"is_relevant": True})
+    assert cache.stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0, "saved_s": 0.0}
@@ -0,0 +1,29 @@
+from app.db.deduplication import compute_minhash, minhash_similarity
+from app.db.near_duplicates import NearDuplicateIndex
+
+TITLE = "Community Arts Fund 2026"
+DESCRIPTION = (
+    "The Community Arts Fund awards grants of up to $5,000 to Texas-based artists working on "
+    "public projects. Applications are due March 1 and must include a budget and work samples."
+)
+OTHER = (
+    "Community Music Fund 2026",
+    "The Community Music Fund awards grants of up to $3,000 to Texas-based musicians working on "
+    "community concerts. Applications are due June 1.",
+)
+
+
+def test_minhash_scores_reposts_high_and_related_grants_low():
+    original = compute_minhash(TITLE, DESCRIPTION)
+    repost = compute_minhash(TITLE, DESCRIPTION + " Contact info@fund.org for questions.")
+    assert minhash_similarity(original, repost) >= 0.6
+    assert minhash_similarity(original, compute_minhash(*OTHER)) < 0.4
+    assert compute_minhash("Short", "too few words") is None
+
+
+def test_index_links_near_duplicates_to_the_earliest_row():
+    index = NearDuplicateIndex()
+    assert index.link(1, compute_minhash(TITLE, DESCRIPTION)) is None
+    assert index.link(2, compute_minhash(*OTHER)) is None
+    assert index.link(3, compute_minhash(TITLE + " - apply now", DESCRIPTION)) == 1
+    assert index.link(4, compute_minhash(TITLE, DESCRIPTION.replace("must include", "should include"))) == 1
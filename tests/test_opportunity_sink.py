@@ -0,0 +1,70 @@
+import json
+from contextlib import nullcontext
+
+import pytest
+
+from app.db import opportunity_sink
+from app.db.opportunity_sink import OpportunitySink
+from app.db.save_opportunities import IngestResult
+
+
+@pytest.fixture
+def batches(tmp_path, monkeypatch):
+    """Batches handed to the database, in order; backups go to a temp dir."""
+    ingested = []
+
+    def fake_ingest(batch, db, source):
+        ingested.append([o["title"] for o in batch])
+        return IngestResult(inserted=len(batch))
+
+    monkeypatch.setattr(opportunity_sink, "BACKUP_DIR", str(tmp_path))
+    monkeypatch.setattr(opportunity_sink, "SessionLocal", lambda: nullcontext(None))
+    monkeypatch.setattr(opportunity_sink, "bulk_ingest_opportunities", fake_ingest)
+    return ingested
+
+
+def _opps(n):
+    return ({"title": f"grant {i}"} for i in range(n))
+
+
+def test_flushes_every_batch_size_items(batches):
+    sink = OpportunitySink("site", source="https://x.org", batch_size=2, flush_seconds=60)
+    sink.consume(_opps(5))
+    assert batches == [["grant 0", "grant 1"], ["grant 2", "grant 3"]]
+
+    sink.close()
+    assert batches[-1] == ["grant 4"]
+    assert sink.stats() == {"scraped": 5, "saved": 5, "duplicates": 0, "batches": 3}
+    with open(sink.backup_path, encoding="utf-8") as f:
+        assert [json.loads(line)["title"] for line in f] == [f"grant {i}" for i in range(5)]
+
+
+def test_flushes_when_batch_has_been_open_too_long(batches, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(opportunity_sink.time, "monotonic", lambda: now[0])
+    sink = OpportunitySink("site", source="https://x.org", batch_size=10, flush_seconds=30)
+
+    sink.add({"title": "a"})
+    now[0] += 29
+    sink.add({"title": "b"})
+    assert batches == []
+    now[0] += 1
+    sink.add({"title": "c"})
+    assert batches == [["a", "b", "c"]]
+
+
+def test_close_persists_the_tail_when_the_scraper_fails(batches):
+    def failing_scraper():
+        yield {"title": "kept"}
+        raise RuntimeError("page crashed")
+
+    sink = OpportunitySink("site", source="https://x.org", batch_size=10, flush_seconds=60)
+    with pytest.raises(RuntimeError):
+        try:
+            sink.consume(failing_scraper())
+        finally:
+            sink.close()
+    assert batches == [["kept"]]
+
+    sink.close()
+    assert sink.batches == 1
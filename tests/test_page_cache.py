@@ -0,0 +1,32 @@
+from app.utils import run_state
+from app.utils.page_cache import PageCache
+
+
+def test_check_does_not_stage_until_marked(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_state, "STATE_DIR", str(tmp_path))
+
+    cache = PageCache("site")
+    assert not cache.is_unchanged("card:a", "Grant A, due May 1")
+    assert not cache.is_unchanged("card:b", "Grant B, due June 1")
+    # Only "a" was handled; "b" failed after the check.
+    cache.mark_seen("card:a", "Grant A, due May 1")
+    cache.commit()
+
+    rerun = PageCache("site")
+    assert rerun.is_unchanged("card:a", "grant a,  due may 1")
+    assert not rerun.is_unchanged("card:b", "Grant B, due June 1")
+    assert rerun.stats() == {"hits": 1, "misses": 1}
+
+
+def test_validators_are_kept_only_for_handled_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_state, "STATE_DIR", str(tmp_path))
+
+    cache = PageCache("site")
+    cache.record_response("https://x.org/a", 200, {"ETag": '"a1"'})
+    cache.record_response("https://x.org/b", 200, {"ETag": '"b1"'})
+    cache.mark_seen("https://x.org/a")
+    cache.commit()
+
+    rerun = PageCache("site")
+    assert rerun.conditional_headers("https://x.org/a") == {"If-None-Match": '"a1"'}
+    assert rerun.conditional_headers("https://x.org/b") == {}
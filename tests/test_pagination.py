@@ -0,0 +1,17 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("deadline", ["2025-09-15", 42])
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "deadline") == ["2025-09-15", 42]
+
+
+def test_cursor_rejects_garbage_and_other_sort():
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor!", "newest")
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor("rank", [0.5, 1]), "newest")
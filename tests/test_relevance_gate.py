@@ -0,0 +1,34 @@
+import numpy as np
+
+from app.utils.llm.relevance_gate import RelevanceGate
+
+
+def _gate(**kwargs):
+    # Three "not relevant" neighbours along x, one "relevant" along y.
+    vectors = np.array([[1.0, 0.0], [0.99, 0.14], [0.98, 0.2], [0.0, 1.0]])
+    labels = np.array([0, 0, 0, 1])
+    return RelevanceGate(vectors, labels, ["a", "b", "c", "d"], k=3, min_similarity=0.5, **kwargs)
+
+
+def test_rejects_when_neighbours_are_not_relevant():
+    gate = _gate()
+    [decision] = gate.score(np.array([[1.0, 0.0]]))
+    assert decision.neighbors == 3
+    assert decision.reject
+    assert decision.nearest_titles == ["a", "b"]
+    assert "'a', 'b'" in decision.explanation()
+    assert "residency" not in decision.explanation()
+
+
+def test_undecided_scores_are_left_out_of_agreement():
+    gate = _gate()
+    decided, undecided = gate.score(np.array([[1.0, 0.0], [0.0, 1.0]]))
+    assert undecided.neighbors < gate.k and not undecided.reject
+
+    gate.record_llm_verdict(undecided, True)
+    gate.record_llm_verdict(undecided, False)
+    assert gate.stats.as_dict()["agreement"] is None
+
+    gate.record_llm_verdict(decided, False)
+    stats = gate.stats.as_dict()
+    assert (stats["agreement"], stats["reject_precision"]) == (1.0, 1.0)
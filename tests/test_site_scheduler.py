@@ -0,0 +1,68 @@
+import pytest
+
+from app.utils import run_state
+from app.utils.site_scheduler import (
+    DEFAULT_SITE_ESTIMATE_SECONDS,
+    DURATIONS_STATE,
+    SiteScheduler,
+    load_site_durations,
+    order_longest_first,
+)
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_state, "STATE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_longest_first_uses_history_then_config_then_default():
+    config_map = {
+        "timed": {},
+        "configured": {"expected_seconds": DEFAULT_SITE_ESTIMATE_SECONDS + 300},
+        "unknown": {},
+        "quick": {},
+    }
+    durations = {"timed": DEFAULT_SITE_ESTIMATE_SECONDS + 600, "quick": 5.0}
+    order = [name for name, _ in order_longest_first(config_map, durations)]
+    assert order == ["timed", "configured", "unknown", "quick"]
+
+
+def test_scheduler_runs_longest_first_and_updates_ewma(state_dir):
+    run_state.save_state(DURATIONS_STATE, {"slow": 100.0, "fast": 10.0, "broken": 50.0})
+    config_map = {"fast": {}, "slow": {}, "broken": {}}
+    dispatched = []
+
+    def run_site(name, cfg, deadline):
+        dispatched.append(name)
+        return {"ok": name != "broken"}
+
+    results = SiteScheduler(config_map, run_site=run_site, max_workers=1).run()
+
+    assert dispatched == ["slow", "broken", "fast"]
+    assert results["broken"]["ok"] is False
+    durations = load_site_durations()
+    # Half of the (near-zero) latest run plus half of the previous estimate.
+    assert durations["slow"] == pytest.approx(50.0, abs=0.1)
+    assert durations["fast"] == pytest.approx(5.0, abs=0.1)
+    # Failed runs do not move the estimate.
+    assert durations["broken"] == 50.0
+
+
+def test_missing_or_corrupt_state_falls_back_to_defaults(state_dir):
+    assert run_state.load_state(DURATIONS_STATE, {}) == {}
+    assert load_site_durations() == {}
+
+    (state_dir / f"{DURATIONS_STATE}.json").write_text("{not json", encoding="utf-8")
+    assert run_state.load_state(DURATIONS_STATE, {"x": 1}) == {"x": 1}
+    assert load_site_durations() == {}
+
+    (state_dir / f"{DURATIONS_STATE}.json").write_text('{"a": 12.5, "b": "soon", "c": null}', encoding="utf-8")
+    assert load_site_durations() == {"a": 12.5}
+
+
+def test_save_state_replaces_file_atomically(state_dir):
+    run_state.save_state("example", {"a": 1})
+    run_state.save_state("example", {"a": 2})
+    assert run_state.load_state("example") == {"a": 2}
+    assert sorted(p.name for p in state_dir.iterdir()) == ["example.json"]
@@ -0,0 +1,25 @@
+import json
+
+from app.utils.llm.structured import GenerateStreamCollector, JsonObjectScanner
+
+
+def test_scanner_stops_at_top_level_close():
+    scanner = JsonObjectScanner()
+    assert not scanner.feed('Sure! {"a": {"b": "x}y"}, ')
+    assert scanner.feed('"c": "q\\"}"} and then more text')
+    assert json.loads(scanner.text()[scanner.text().index("{"):]) == {"a": {"b": "x}y"}, "c": 'q"}'}
+
+
+def test_collector_early_stop_and_final_stats():
+    lines = [json.dumps({"response": chunk, "done": False}) for chunk in ['{"is_relevant": ', "false}", " extra"]]
+    collector = GenerateStreamCollector()
+    stopped = [collector.add_line(line) for line in lines[:2]]
+    assert stopped == [False, True]
+    assert collector.stopped_early
+    raw = collector.raw()
+    assert json.loads(raw["response"]) == {"is_relevant": False}
+    assert raw["eval_count"] == 2
+
+    collector = GenerateStreamCollector()
+    collector.add_line(json.dumps({"response": "{}", "done": True, "eval_count": 7}))
+    assert collector.raw()["eval_count"] == 7
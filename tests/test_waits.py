@@ -0,0 +1,34 @@
+from app.utils.waits import WaitStats, scroll_until_exhausted, wait_for_count_stable
+
+
+class FakeDriver:
+    """Answers the waits' JS with a list of element counts, one per call, repeating the last."""
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+
+    def execute_script(self, script, *args):
+        if script.startswith("window.scrollTo"):
+            return None
+        count = self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+        if "scrollHeight" in script:
+            return [count * 100, count]
+        return count
+
+
+def test_count_stable_returns_once_count_settles():
+    stats = WaitStats("test")
+    assert wait_for_count_stable(FakeDriver([0, 3, 5, 5]), "li", stable_for=0.05, timeout=2, stats=stats, baseline=2.0)
+    summary = stats.summary()
+    assert summary["calls"] == 1 and summary["timeouts"] == 0
+    assert summary["saved"] > 1.0
+
+
+def test_count_stable_times_out_without_elements():
+    stats = WaitStats("test")
+    assert not wait_for_count_stable(FakeDriver([0]), "li", stable_for=0.05, timeout=0.3, stats=stats)
+    assert stats.timeouts == 1
+
+
+def test_scroll_stops_when_feed_is_exhausted():
+    assert scroll_until_exhausted(FakeDriver([1, 2, 3, 3]), "article", settle=0.2) == 2